@@ -0,0 +1,239 @@
+"""
+Work Well - Enriquecimento Assíncrono de Sentimento
+O registro é confirmado imediatamente; o sentimento do comentário é calculado
+em background e gravado no banco com UPDATEs em lote
+"""
+import logging
+import threading
+from config import Config
+from cache import TTLCache
+from ai.micro_batching import MicroBatchScheduler
+from ai.sentiment_analyzer import analyzer
+from database.db_connection import db
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class EnriquecimentoSentimento:
+    """
+    Fila de enriquecimento de sentimento dos registros emocionais
+    
+    Os comentários enfileirados são agrupados em lotes (MicroBatchScheduler),
+    analisados com uma única chamada a analisar_lote() e gravados com um
+    único UPDATE em lote (executemany + commit) por lote. O andamento de cada
+    registro fica em memória para a rota de status.
+    
+    A fila também fica só em memória: uma varredura periódica (e na
+    inicialização) reenfileira os registros com comentário que continuam sem
+    sentimento no banco, como os confirmados antes de um reinício ou queda.
+    Cada registro reenfileirado é antes reservado no banco, então com vários
+    processos só um deles o analisa.
+    
+    Os lotes só são analisados depois que o modelo termina de carregar: o
+    resultado gravado é definitivo, e o fallback por palavras-chave usado
+    durante o carregamento não seria substituído depois.
+    """
+    
+    def __init__(self, analisador, banco, workers=2, max_batch=32, max_espera_ms=200, usar_gpt=True):
+        """
+        Args:
+            analisador: SentimentAnalyzer usado na análise
+            banco: OracleDB onde o resultado é gravado
+            workers (int): Threads consumindo a fila
+            max_batch (int): Máximo de comentários por lote
+            max_espera_ms (float): Tempo que o primeiro comentário espera por companhia
+            usar_gpt (bool): Se a análise inclui o GPT (fora do caminho da requisição)
+        """
+        self.analisador = analisador
+        self.banco = banco
+        self.usar_gpt = usar_gpt
+        self.scheduler = MicroBatchScheduler(
+            self._processar_lote,
+            max_batch=max_batch,
+            max_espera_ms=max_espera_ms,
+            nome='enriquecimento-sentimento',
+            workers=workers
+        )
+        # registro_id -> {'status': 'pendente' | 'concluido' | 'erro', ...}
+        self.status = TTLCache(max_entradas=50000, max_bytes=16 * 1024 * 1024, ttl_segundos=3600, nome='status-enriquecimento')
+        
+        # Varredura de registros sem sentimento
+        self._varredura = None
+        self._parar_varredura = threading.Event()
+        
+        # Métricas
+        self._lock_metricas = threading.Lock()
+        self.total_concluidos = 0
+        self.total_erros = 0
+        self.total_reprocessados = 0
+    
+    def enfileirar(self, registro_id, comentario):
+        """
+        Agenda a análise de sentimento de um registro já gravado
+        
+        Args:
+            registro_id: ID do registro emocional
+            comentario (str): Comentário a ser analisado
+        
+        Returns:
+            Future: Resolvido com o resultado da análise quando o lote for gravado
+        """
+        self.status.definir(registro_id, {'status': 'pendente'})
+        return self.scheduler.enfileirar((registro_id, comentario))
+    
+    def _processar_lote(self, itens):
+        """Analisa um lote de comentários e grava os resultados com um UPDATE em lote"""
+        registro_ids = [registro_id for registro_id, _ in itens]
+        
+        # Durante o carregamento do BERT a análise cairia no fallback (e ficaria gravada)
+        self.analisador.aguardar_pronto()
+        
+        try:
+            resultados = self.analisador.analisar_lote([comentario for _, comentario in itens], usar_gpt=self.usar_gpt)
+            
+            atualizacoes = [
+                (registro_id, resultado['sentimento'], resultado['score'])
+                for registro_id, resultado in zip(registro_ids, resultados)
+                if resultado and resultado.get('sentimento') != 'erro'
+            ]
+            self.banco.atualizar_sentimentos_lote(atualizacoes)
+        except Exception as e:
+            logger.error(f"❌ Erro no enriquecimento de {len(itens)} registros: {e}")
+            for registro_id in registro_ids:
+                self.status.definir(registro_id, {'status': 'erro', 'erro': str(e)})
+            with self._lock_metricas:
+                self.total_erros += len(itens)
+            raise
+        
+        for registro_id, resultado in zip(registro_ids, resultados):
+            self.status.definir(registro_id, {'status': 'concluido', 'analise_sentimento': resultado})
+        with self._lock_metricas:
+            self.total_concluidos += len(itens)
+        
+        return resultados
+    
+    def obter_status(self, registro_id):
+        """
+        Retorna o andamento da análise de um registro
+        
+        Registros que já saíram da memória (ou foram gravados por outro
+        processo) são consultados no banco.
+        
+        Returns:
+            dict: {'status': ..., 'analise_sentimento'?: ...} ou None se o registro não existir
+        """
+        status = self.status.obter(registro_id)
+        if status is not None:
+            return status
+        
+        registro = self.banco.obter_sentimento_registro(registro_id)
+        if registro is None:
+            return None
+        if registro.get('SENTIMENTO_TEXTO') is None:
+            # Com comentário e sem sentimento: na fila ou aguardando a próxima varredura
+            return {'status': 'pendente' if registro.get('TEM_COMENTARIO') == 'S' else 'desconhecido'}
+        return {
+            'status': 'concluido',
+            'analise_sentimento': {
+                'sentimento': registro['SENTIMENTO_TEXTO'],
+                'score': registro['SCORE_SENTIMENTO']
+            }
+        }
+    
+    def reprocessar_pendentes(self, dias=None, espera_segundos=None, limite=None, reserva_segundos=None):
+        """
+        Reserva e reenfileira os registros com comentário que continuam sem sentimento no banco
+        
+        Args:
+            dias (int): Janela verificada (default: Config.ENRIQUECIMENTO_VARREDURA_DIAS)
+            espera_segundos (int): Idade mínima do registro (default: Config.ENRIQUECIMENTO_VARREDURA_ESPERA)
+            limite (int): Registros por varredura (default: Config.ENRIQUECIMENTO_VARREDURA_LIMITE)
+            reserva_segundos (int): Validade da reserva no banco (default: Config.ENRIQUECIMENTO_VARREDURA_RESERVA)
+        
+        Returns:
+            int: Quantidade de registros reenfileirados
+        """
+        reserva_segundos = Config.ENRIQUECIMENTO_VARREDURA_RESERVA if reserva_segundos is None else reserva_segundos
+        registros = self.banco.obter_registros_sem_sentimento(
+            Config.ENRIQUECIMENTO_VARREDURA_DIAS if dias is None else dias,
+            Config.ENRIQUECIMENTO_VARREDURA_ESPERA if espera_segundos is None else espera_segundos,
+            Config.ENRIQUECIMENTO_VARREDURA_LIMITE if limite is None else limite,
+            reserva_segundos
+        )
+        
+        # Os que ainda estão na fila deste processo ficam de fora
+        comentarios = {}
+        for registro in registros:
+            status = self.status.obter(registro['ID'])
+            if status is None or status.get('status') != 'pendente':
+                comentarios[registro['ID']] = registro['COMENTARIO']
+        
+        # Só os reservados por este processo (outro processo pode ter pego o restante)
+        reservados = self.banco.reservar_registros_sentimento(list(comentarios), reserva_segundos)
+        for registro_id in reservados:
+            self.enfileirar(registro_id, comentarios[registro_id])
+        total = len(reservados)
+        
+        if total:
+            with self._lock_metricas:
+                self.total_reprocessados += total
+            logger.info(f"🔄 {total} registros sem sentimento reenfileirados")
+        return total
+    
+    def iniciar_varredura(self, intervalo=None):
+        """
+        Inicia a varredura periódica de registros sem sentimento em background
+        
+        Só faz sentido com o enriquecimento assíncrono em uso: o app.py a inicia
+        com Config.ENRIQUECIMENTO_ASSINCRONO ou no primeiro registro assíncrono.
+        Chamadas com a varredura já ativa não fazem nada.
+        
+        Args:
+            intervalo (float): Segundos entre varreduras (default: Config.ENRIQUECIMENTO_VARREDURA_INTERVALO)
+        """
+        intervalo = Config.ENRIQUECIMENTO_VARREDURA_INTERVALO if intervalo is None else intervalo
+        if intervalo <= 0:
+            return
+        
+        with self._lock_metricas:
+            if self._varredura and self._varredura.is_alive():
+                return
+            self._parar_varredura.clear()
+            self._varredura = threading.Thread(target=lambda: self._loop_varredura(intervalo),
+                                               name='varredura-enriquecimento', daemon=True)
+            self._varredura.start()
+    
+    def _loop_varredura(self, intervalo):
+        """Varre agora e depois a cada `intervalo` segundos, até encerrar_varredura()"""
+        while True:
+            try:
+                self.reprocessar_pendentes()
+            except Exception as e:
+                logger.warning(f"⚠️ Varredura de registros sem sentimento falhou (nova tentativa em {intervalo}s): {e}")
+            if self._parar_varredura.wait(intervalo):
+                return
+    
+    def encerrar_varredura(self):
+        """Interrompe a varredura periódica"""
+        self._parar_varredura.set()
+    
+    def estatisticas(self):
+        """Retorna métricas da fila de enriquecimento"""
+        return {
+            **self.scheduler.estatisticas(),
+            'concluidos': self.total_concluidos,
+            'erros': self.total_erros,
+            'reprocessados': self.total_reprocessados
+        }
+
+
+# Instância global
+enriquecedor = EnriquecimentoSentimento(
+    analyzer,
+    db,
+    workers=Config.ENRIQUECIMENTO_WORKERS,
+    max_batch=Config.ENRIQUECIMENTO_MAX_BATCH,
+    max_espera_ms=Config.ENRIQUECIMENTO_MAX_ESPERA_MS,
+    usar_gpt=Config.ENRIQUECIMENTO_USAR_GPT
+)
@@ -0,0 +1,26 @@
+"""
+Work Well - Verificação de Threads antes do Fork
+Usada pelos pools de processos (inferência e renderização) criados por fork
+"""
+import threading
+
+
+def threads_impedindo_fork():
+    """
+    Lista as threads vivas (além da atual) que tornam o fork inseguro
+    
+    O processo filho herda só a thread que chamou o fork; um lock que outra
+    thread segurava nesse momento (logging, pool do banco, PyTorch) fica preso
+    para sempre no filho. As threads auxiliares de um multiprocessing.Pool são
+    exceção: o próprio Pool cria workers por fork com elas ativas, e o filho
+    nunca usa as filas de outro pool.
+    
+    Returns:
+        list: Nomes das threads
+    """
+    atual = threading.current_thread()
+    return [
+        thread.name for thread in threading.enumerate()
+        if thread is not atual
+        and getattr(getattr(thread, '_target', None), '__module__', None) != 'multiprocessing.pool'
+    ]
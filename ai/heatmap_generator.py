@@ -7,8 +7,11 @@ import seaborn as sns
 import numpy as np
 import pandas as pd
 from io import BytesIO
+import os
 import base64
 import logging
+from config import Config
+from cache import TTLCache, chave_hash
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,11 +19,86 @@ logger = logging.getLogger(__name__)
 # Configuração do matplotlib para não usar interface gráfica
 plt.switch_backend('Agg')
 
+# Incrementar quando o desenho dos gráficos mudar (invalida as imagens salvas em disco)
+VERSAO_RENDER = 1
+
+# Colunas dos dados dos setores que entram nos gráficos (e na chave do cache)
+COLUNAS_GRAFICOS = ['SETOR_NOME', 'MEDIA_ESTRESSE', 'MEDIA_FELICIDADE', 'MEDIA_ANSIEDADE', 'MEDIA_MOTIVACAO', 'TOTAL_REGISTROS']
+
+# Métrica -> coluna dos dados dos setores
+COLUNAS_METRICAS = {
+    'estresse': 'MEDIA_ESTRESSE',
+    'felicidade': 'MEDIA_FELICIDADE',
+    'ansiedade': 'MEDIA_ANSIEDADE',
+    'motivacao': 'MEDIA_MOTIVACAO'
+}
+
+# Paletas das imagens como paradas de cor (do menor para o maior valor), para renderização no cliente
+ESCALA_YLORRD = ['#ffffcc', '#fed976', '#fd8d3c', '#e31a1c', '#800026']
+ESCALA_RDYLGN = ['#a50026', '#f46d43', '#ffffbf', '#66bd63', '#006837']
+ESCALA_COOLWARM = ['#3b4cc0', '#8db0fe', '#dddddd', '#f49a7b', '#b40426']
+
 
 class HeatmapGenerator:
-    """Gerador de mapas de calor e visualizações"""
+    """
+    Gerador de mapas de calor e visualizações
+    
+    As imagens geradas ficam em um cache LRU (limitado em bytes) com chave
+    derivada dos dados dos setores, do tipo de gráfico, da métrica e do dpi:
+    enquanto os agregados não mudam, o gráfico não é desenhado de novo.
+    Opcionalmente as imagens também são gravadas em disco
+    (Config.CACHE_IMAGENS_DIR) e sobrevivem a despejos e reinícios.
+    """
     
-    def __init__(self):
+    # Método que desenha cada tipo de gráfico (retorna PNG em bytes)
+    RENDERIZADORES = {
+        'mapa_calor': '_renderizar_mapa_calor_setores',
+        'comparativo': '_renderizar_comparativo_metricas',
+        'barras': '_renderizar_grafico_barras_comparativo'
+    }
+    
+    # Gráficos servidos como imagem (ver /api/graficos): nome -> (tipo, métrica)
+    GRAFICOS = {
+        'mapa_estresse': ('mapa_calor', 'estresse'),
+        'mapa_felicidade': ('mapa_calor', 'felicidade'),
+        'mapa_ansiedade': ('mapa_calor', 'ansiedade'),
+        'mapa_motivacao': ('mapa_calor', 'motivacao'),
+        'comparativo': ('comparativo', None),
+        'barras': ('barras', None)
+    }
+    
+    # Gráficos do dashboard completo: nome -> (tipo, métrica)
+    GRAFICOS_DASHBOARD = {
+        'mapa_estresse': ('mapa_calor', 'estresse'),
+        'mapa_felicidade': ('mapa_calor', 'felicidade'),
+        'comparativo': ('comparativo', None),
+        'barras': ('barras', None)
+    }
+    
+    def __init__(self, dpi=150, usar_cache=True, render_rapido=True):
+        """
+        Args:
+            dpi (int): Resolução das imagens
+            usar_cache (bool): Manter cache de imagens (False nos workers do pool de renderização)
+            render_rapido (bool): Reaproveitar figuras já montadas (ver ai/render_rapido.py)
+        """
+        self.dpi = dpi
+        self.pool = None  # Pool de processos de renderização, se ativado em Config
+        self.render_rapido = render_rapido
+        self.rapido = None  # RenderizadorRapido, criado na primeira renderização
+        
+        # Cache de imagens (PNG) já renderizadas
+        self.cache = None
+        if usar_cache and Config.CACHE_IMAGENS_ATIVO:
+            self.cache = TTLCache(
+                max_entradas=Config.CACHE_IMAGENS_MAX_ENTRADAS,
+                max_bytes=Config.CACHE_IMAGENS_MAX_MB * 1024 * 1024,
+                nome='imagens'
+            )
+        self.cache_dir = (Config.CACHE_IMAGENS_DIR or None) if usar_cache else None
+        self.acertos_disco = 0
+        self.renderizacoes = 0
+        
         # Paletas de cores personalizadas
         self.paleta_estresse = sns.color_palette("YlOrRd", as_cmap=True)
         self.paleta_felicidade = sns.color_palette("RdYlGn", as_cmap=True)
@@ -36,16 +114,20 @@ class HeatmapGenerator:
         Gera mapa de calor por setor
         
         Args:
-            dados (list): Lista de dicionários com dados dos setores
+            dados (list | pd.DataFrame): Lista de dicionários (ou DataFrame) com dados dos setores
             metrica (str): 'estresse', 'felicidade', 'ansiedade', 'motivacao'
-            
+        
         Returns:
             str: Imagem em base64
         """
-        if not dados:
+        if dados is None or len(dados) == 0:
             logger.warning("⚠️ Sem dados para gerar mapa de calor")
             return None
         
+        return self._renderizar_em_cache('mapa_calor', dados, metrica)
+    
+    def _renderizar_mapa_calor_setores(self, dados, metrica):
+        """Desenha o mapa de calor por setor e retorna o PNG"""
         try:
             # Preparar dados
             df = pd.DataFrame(dados)
@@ -69,15 +151,8 @@ class HeatmapGenerator:
             matriz = np.array(valores).reshape(-1, 1)
             
             # Escolher paleta
-            if metrica == 'estresse' or metrica == 'ansiedade':
-                cmap = self.paleta_estresse
-                vmin, vmax = 1, 10
-            elif metrica == 'felicidade' or metrica == 'motivacao':
-                cmap = self.paleta_felicidade.reversed()
-                vmin, vmax = 1, 10
-            else:
-                cmap = self.paleta_geral
-                vmin, vmax = 1, 10
+            cmap = self._paleta_metrica(metrica)
+            vmin, vmax = 1, 10
             
             # Criar heatmap
             sns.heatmap(
@@ -118,25 +193,37 @@ class HeatmapGenerator:
             plt.tight_layout()
             
             # Converter para base64
-            return self._fig_to_base64(fig)
-            
+            return self._fig_to_png(fig)
+        
         except Exception as e:
             logger.error(f"❌ Erro ao gerar mapa de calor: {e}")
             return None
     
+    def _paleta_metrica(self, metrica):
+        """Colormap do mapa de calor de cada métrica"""
+        if metrica == 'estresse' or metrica == 'ansiedade':
+            return self.paleta_estresse
+        if metrica == 'felicidade' or metrica == 'motivacao':
+            return self.paleta_felicidade.reversed()
+        return self.paleta_geral
+    
     def gerar_comparativo_metricas(self, dados):
         """
         Gera visualização comparativa de todas as métricas
         
         Args:
-            dados (list): Lista de dicionários com dados dos setores
-            
+            dados (list | pd.DataFrame): Lista de dicionários (ou DataFrame) com dados dos setores
+        
         Returns:
             str: Imagem em base64
         """
-        if not dados:
+        if dados is None or len(dados) == 0:
             return None
         
+        return self._renderizar_em_cache('comparativo', dados, None)
+    
+    def _renderizar_comparativo_metricas(self, dados, metrica=None):
+        """Desenha o comparativo de métricas e retorna o PNG"""
         try:
             df = pd.DataFrame(dados)
             setores = df['SETOR_NOME'].tolist()  # Corrigido: SETOR_NOME ao invés de NOME_SETOR
@@ -175,8 +262,8 @@ class HeatmapGenerator:
             
             plt.tight_layout()
             
-            return self._fig_to_base64(fig)
-            
+            return self._fig_to_png(fig)
+        
         except Exception as e:
             logger.error(f"❌ Erro ao gerar comparativo: {e}")
             return None
@@ -186,14 +273,18 @@ class HeatmapGenerator:
         Gera gráfico de barras comparativo
         
         Args:
-            dados (list): Lista de dicionários com dados dos setores
-            
+            dados (list | pd.DataFrame): Lista de dicionários (ou DataFrame) com dados dos setores
+        
         Returns:
             str: Imagem em base64
         """
-        if not dados:
+        if dados is None or len(dados) == 0:
             return None
         
+        return self._renderizar_em_cache('barras', dados, None)
+    
+    def _renderizar_grafico_barras_comparativo(self, dados, metrica=None):
+        """Desenha o gráfico de barras comparativo e retorna o PNG"""
         try:
             df = pd.DataFrame(dados)
             
@@ -239,8 +330,8 @@ class HeatmapGenerator:
                         fontsize=16, fontweight='bold', y=0.98)
             plt.tight_layout()
             
-            return self._fig_to_base64(fig)
-            
+            return self._fig_to_png(fig)
+        
         except Exception as e:
             logger.error(f"❌ Erro ao gerar gráfico de barras: {e}")
             return None
@@ -250,29 +341,397 @@ class HeatmapGenerator:
         Gera dashboard completo com múltiplas visualizações
         
         Args:
-            dados (list): Lista de dicionários com dados dos setores
-            
+            dados (list | pd.DataFrame): Lista de dicionários (ou DataFrame) com dados dos setores
+        
         Returns:
             dict: Múltiplas imagens em base64
         """
+        imagens = dict(self.gerar_visualizacoes(dados))
+        return {nome: imagens.get(nome) for nome in self.GRAFICOS_DASHBOARD}
+    
+    def gerar_visualizacoes(self, dados):
+        """
+        Gera as imagens do dashboard, devolvendo cada uma assim que fica pronta
+        
+        As imagens em cache saem imediatamente; as demais são desenhadas em
+        paralelo no pool de renderização (se ativo) ou uma após a outra no
+        processo atual.
+        
+        Args:
+            dados (list | pd.DataFrame): Lista de dicionários (ou DataFrame) com dados dos setores
+        
+        Yields:
+            tuple: (nome do gráfico, imagem em base64 ou None)
+        """
+        if dados is None or len(dados) == 0:
+            for nome in self.GRAFICOS_DASHBOARD:
+                yield nome, None
+            return
+        
+        # Primeiro o que já está em cache
+        faltando = []
+        for nome, (tipo, metrica) in self.GRAFICOS_DASHBOARD.items():
+            chave = self._chave_render(tipo, dados, metrica) if self.cache is not None else None
+            png = self._obter_em_cache(chave)
+            if png is not None:
+                yield nome, self._png_to_base64(png)
+            else:
+                faltando.append((nome, tipo, metrica, chave))
+        
+        # Depois os gráficos que precisam ser desenhados
+        if self.pool is not None and len(faltando) > 1:
+            entregues = set()
+            tarefas = [(tipo, dados, metrica) for _, tipo, metrica, _ in faltando]
+            for indice, png in self.pool.renderizar(tarefas):
+                entregues.add(indice)
+                nome, _, _, chave = faltando[indice]
+                self.renderizacoes += 1
+                yield nome, self._finalizar_render(chave, png)
+            faltando = [item for indice, item in enumerate(faltando) if indice not in entregues]
+        
+        for nome, tipo, metrica, chave in faltando:
+            png = self.renderizar(tipo, dados, metrica)
+            self.renderizacoes += 1
+            yield nome, self._finalizar_render(chave, png)
+    
+    def renderizar(self, tipo, dados, metrica=None):
+        """
+        Desenha um gráfico sem passar pelo cache
+        
+        Args:
+            tipo (str): 'mapa_calor', 'comparativo' ou 'barras'
+            dados: Dados dos setores
+            metrica (str): Métrica (usada pelo mapa de calor)
+        
+        Returns:
+            bytes: PNG ou None se a renderização falhar
+        """
+        if self.render_rapido:
+            png = self._renderizar_rapido(tipo, dados, metrica)
+            if png:
+                return png
+        return getattr(self, self.RENDERIZADORES[tipo])(dados, metrica)
+    
+    def _renderizar_rapido(self, tipo, dados, metrica):
+        """Desenha reaproveitando uma figura montada (None = usar o desenho completo)"""
+        try:
+            if self.rapido is None:
+                from ai.render_rapido import RenderizadorRapido
+                self.rapido = RenderizadorRapido(self, max_templates=Config.GRAFICOS_TEMPLATES_MAX)
+            return self.rapido.renderizar(tipo, self._registros(dados), metrica)
+        except Exception as e:
+            logger.warning(f"⚠️ Renderização rápida falhou ({tipo}), usando o desenho completo: {e}")
+            return None
+    
+    def iniciar_pool(self, num_workers=None):
+        """
+        Inicia o pool de processos de renderização (ver ai/render_pool.py)
+        
+        Args:
+            num_workers (int): Quantidade de processos (default: até 4)
+        """
+        from ai.render_pool import RenderPool
+        
+        try:
+            self.pool = RenderPool(dpi=self.dpi, num_workers=num_workers, timeout=Config.RENDER_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao iniciar pool de renderização (continuando no processo atual): {e}")
+            self.pool = None
+    
+    def encerrar_pool(self):
+        """Finaliza o pool de renderização, se ativo"""
+        if self.pool is not None:
+            self.pool.encerrar()
+            self.pool = None
+    
+    # ==================== ESPECIFICAÇÕES (RENDERIZAÇÃO NO CLIENTE) ====================
+    # Mesmos gráficos das imagens, descritos como dados (valores, rótulos, escalas
+    # de cor e linhas críticas) para o frontend desenhar: sem custo de renderização
+    # no servidor e com respostas de poucos KB.
+    
+    @staticmethod
+    def _registros(dados):
+        """Dados dos setores como lista de dicts (aceita DataFrame)"""
+        return dados.to_dict('records') if isinstance(dados, pd.DataFrame) else list(dados)
+    
+    @staticmethod
+    def _numero(valor):
+        """Converte Decimal/numpy para float (None para nulos)"""
+        if valor is None:
+            return None
+        valor = float(valor)
+        return None if valor != valor else round(valor, 1)
+    
+    def especificacao_mapa_calor(self, dados, metrica='estresse'):
+        """
+        Especificação do mapa de calor por setor (equivalente a gerar_mapa_calor_setores)
+        
+        Returns:
+            dict: Spec do gráfico ou None se não houver dados
+        """
+        if dados is None or len(dados) == 0:
+            return None
+        
+        registros = self._registros(dados)
+        coluna = COLUNAS_METRICAS.get(metrica, 'MEDIA_ESTRESSE')
+        
+        if metrica in ('felicidade', 'motivacao'):
+            cores = ESCALA_RDYLGN[::-1]  # Mesma paleta (invertida) da imagem
+        elif metrica in ('estresse', 'ansiedade'):
+            cores = ESCALA_YLORRD
+        else:
+            cores = ESCALA_COOLWARM
+        
+        return {
+            'tipo': 'mapa_calor',
+            'titulo': f'Mapa de Calor - {metrica.capitalize()} por Setor',
+            'metrica': metrica,
+            'linhas': [r['SETOR_NOME'] for r in registros],
+            'colunas': [metrica.capitalize()],
+            'valores': [[self._numero(r.get(coluna))] for r in registros],
+            'escala': {'min': 1, 'max': 10, 'cores': cores},
+            'total_registros': int(sum(self._numero(r.get('TOTAL_REGISTROS')) or 0 for r in registros)),
+            'total_setores': len(registros)
+        }
+    
+    def especificacao_comparativo(self, dados):
+        """Especificação do comparativo de métricas (equivalente a gerar_comparativo_metricas)"""
+        if dados is None or len(dados) == 0:
+            return None
+        
+        registros = self._registros(dados)
+        colunas = list(COLUNAS_METRICAS.values())
+        
+        return {
+            'tipo': 'mapa_calor',
+            'titulo': 'Comparativo de Métricas Emocionais por Setor',
+            'linhas': [r['SETOR_NOME'] for r in registros],
+            'colunas': ['Estresse', 'Felicidade', 'Ansiedade', 'Motivação'],
+            'valores': [[self._numero(r.get(c)) for c in colunas] for r in registros],
+            'escala': {'min': 1, 'max': 10, 'cores': ESCALA_COOLWARM}
+        }
+    
+    def especificacao_barras(self, dados):
+        """Especificação do gráfico de barras comparativo (equivalente a gerar_grafico_barras_comparativo)"""
+        if dados is None or len(dados) == 0:
+            return None
+        
+        registros = self._registros(dados)
+        setores = [r['SETOR_NOME'] for r in registros]
+        estresse = [self._numero(r.get('MEDIA_ESTRESSE')) for r in registros]
+        felicidade = [self._numero(r.get('MEDIA_FELICIDADE')) for r in registros]
+        
+        def cor_estresse(v):
+            return '#d62728' if (v or 0) >= 7 else '#ff7f0e' if (v or 0) >= 5 else '#2ca02c'
+        
+        def cor_felicidade(v):
+            return '#2ca02c' if (v or 0) >= 7 else '#ff7f0e' if (v or 0) >= 5 else '#d62728'
+        
+        return {
+            'tipo': 'barras',
+            'titulo': 'Análise Emocional Corporativa - Work Well',
+            'categorias': setores,
+            'eixo': {'min': 0, 'max': 10},
+            'series': [
+                {
+                    'nome': 'Estresse por Setor',
+                    'rotulo': 'Nível Médio de Estresse',
+                    'valores': estresse,
+                    'cores': [cor_estresse(v) for v in estresse],
+                    'linha_critica': 7
+                },
+                {
+                    'nome': 'Felicidade por Setor',
+                    'rotulo': 'Nível Médio de Felicidade',
+                    'valores': felicidade,
+                    'cores': [cor_felicidade(v) for v in felicidade],
+                    'linha_critica': 3
+                }
+            ]
+        }
+    
+    def especificacoes_dashboard(self, dados):
+        """
+        Especificações dos gráficos do dashboard (mesmos nomes de gerar_dashboard_completo)
+        
+        Returns:
+            dict: nome -> spec (ou None se não houver dados)
+        """
+        especificacoes = {}
+        for nome, (tipo, metrica) in self.GRAFICOS_DASHBOARD.items():
+            if tipo == 'mapa_calor':
+                especificacoes[nome] = self.especificacao_mapa_calor(dados, metrica)
+            elif tipo == 'comparativo':
+                especificacoes[nome] = self.especificacao_comparativo(dados)
+            else:
+                especificacoes[nome] = self.especificacao_barras(dados)
+        return especificacoes
+    
+    # ==================== CACHE DE IMAGENS ====================
+    
+    def versao_grafico(self, tipo, dados, metrica=None):
+        """
+        Identificador do conteúdo do gráfico (mesma chave do cache), usado como ETag
+        
+        Muda quando mudam os dados usados no gráfico, o dpi ou VERSAO_RENDER;
+        calculá-lo não desenha nada.
+        
+        Returns:
+            str: Hash hexadecimal
+        """
+        return self._chave_render(tipo, dados, metrica)
+    
+    def obter_png(self, tipo, dados, metrica=None):
+        """
+        Retorna o gráfico como PNG (bytes), do cache (memória ou disco) ou renderizado
+        
+        Args:
+            tipo (str): Tipo do gráfico ('mapa_calor', 'comparativo', 'barras')
+            dados: Dados dos setores
+            metrica (str): Métrica do gráfico (quando houver)
+        
+        Returns:
+            bytes: PNG ou None se a renderização falhar
+        """
+        if dados is None or len(dados) == 0:
+            return None
+        
+        chave = self._chave_render(tipo, dados, metrica) if self.cache is not None else None
+        
+        png = self._obter_em_cache(chave)
+        if png is None:
+            png = self.renderizar(tipo, dados, metrica)
+            self.renderizacoes += 1
+            self._armazenar_render(chave, png)
+        return png
+    
+    def _chave_render(self, tipo, dados, metrica):
+        """Chave do cache: hash das linhas usadas no gráfico + tipo, métrica e dpi"""
+        registros = self._registros(dados)
+        linhas = [[registro.get(coluna) for coluna in COLUNAS_GRAFICOS] for registro in registros]
+        return chave_hash(VERSAO_RENDER, tipo, metrica, self.dpi, linhas)
+    
+    def _renderizar_em_cache(self, tipo, dados, metrica):
+        """
+        Retorna a imagem do cache (memória ou disco) ou a renderiza e armazena
+        
+        Args:
+            tipo (str): Tipo do gráfico ('mapa_calor', 'comparativo', 'barras')
+            dados: Dados dos setores
+            metrica (str): Métrica do gráfico (quando houver)
+        
+        Returns:
+            str: Imagem em base64 (data URI) ou None se a renderização falhar
+        """
+        png = self.obter_png(tipo, dados, metrica)
+        return self._png_to_base64(png) if png else None
+    
+    def _obter_em_cache(self, chave):
+        """Busca o PNG na memória e depois no disco (None se não houver cache ou a imagem não existir)"""
+        if chave is None:
+            return None
+        
+        png = self.cache.obter(chave)
+        if png is None:
+            png = self._ler_disco(chave)
+            if png is not None:
+                self.acertos_disco += 1
+                self.cache.definir(chave, png)
+        return png
+    
+    def _armazenar_render(self, chave, png):
+        """Armazena um PNG recém-desenhado no cache (memória e disco)"""
+        if png and chave is not None:
+            self.cache.definir(chave, png)
+            self._gravar_disco(chave, png)
+    
+    def _finalizar_render(self, chave, png):
+        """Armazena um PNG recém-desenhado no cache e o devolve em base64"""
+        if not png:
+            return None
+        self._armazenar_render(chave, png)
+        return self._png_to_base64(png)
+    
+    def _caminho_disco(self, chave):
+        return os.path.join(self.cache_dir, f"{chave}.png")
+    
+    def _ler_disco(self, chave):
+        """Lê uma imagem gravada em disco (None se o disco estiver desativado ou a imagem não existir)"""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._caminho_disco(chave), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _gravar_disco(self, chave, png):
+        """Grava a imagem em disco e remove as mais antigas acima do limite de tamanho"""
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            caminho = self._caminho_disco(chave)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(png)
+            os.replace(temporario, caminho)
+            self._limitar_disco()
+        except OSError as e:
+            logger.warning(f"⚠️ Não foi possível gravar imagem no cache em disco: {e}")
+    
+    def _limitar_disco(self):
+        """Remove as imagens menos recentes até o diretório caber em Config.CACHE_IMAGENS_DISCO_MAX_MB"""
+        limite = Config.CACHE_IMAGENS_DISCO_MAX_MB * 1024 * 1024
+        arquivos = []
+        total = 0
+        with os.scandir(self.cache_dir) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and entrada.name.endswith('.png'):
+                    info = entrada.stat()
+                    arquivos.append((info.st_mtime, info.st_size, entrada.path))
+                    total += info.st_size
+        
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= limite:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
+    
+    def estatisticas_cache(self):
+        """Retorna métricas do cache de imagens"""
+        pool = self.pool.estatisticas() if self.pool else None
+        rapido = self.rapido.estatisticas() if self.rapido else None
+        if self.cache is None:
+            return {'ativo': False, 'renderizacoes': self.renderizacoes, 'pool_renderizacao': pool, 'render_rapido': rapido}
         return {
-            'mapa_estresse': self.gerar_mapa_calor_setores(dados, 'estresse'),
-            'mapa_felicidade': self.gerar_mapa_calor_setores(dados, 'felicidade'),
-            'comparativo': self.gerar_comparativo_metricas(dados),
-            'barras': self.gerar_grafico_barras_comparativo(dados)
+            **self.cache.estatisticas(),
+            'ativo': True,
+            'disco': self.cache_dir,
+            'acertos_disco': self.acertos_disco,
+            'renderizacoes': self.renderizacoes,
+            'pool_renderizacao': pool,
+            'render_rapido': rapido
         }
     
-    def _fig_to_base64(self, fig):
-        """Converte figura matplotlib para base64"""
+    def _fig_to_png(self, fig):
+        """Converte figura matplotlib para PNG (bytes)"""
         buffer = BytesIO()
-        fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
+        fig.savefig(buffer, format='png', dpi=self.dpi, bbox_inches='tight', 
                    facecolor='white', edgecolor='none')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
         plt.close(fig)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _png_to_base64(png):
+        """Converte PNG (bytes) para data URI base64"""
+        image_base64 = base64.b64encode(png).decode('utf-8')
         return f"data:image/png;base64,{image_base64}"
 
 
 # Instância global
-heatmap_gen = HeatmapGenerator()
+heatmap_gen = HeatmapGenerator(dpi=Config.GRAFICOS_DPI, render_rapido=Config.GRAFICOS_RENDER_RAPIDO)
 
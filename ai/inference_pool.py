@@ -0,0 +1,136 @@
+"""
+Work Well - Pool de Processos para Inferência
+Workers criados por fork compartilham os pesos do modelo (copy-on-write)
+"""
+import os
+import math
+import logging
+import multiprocessing
+import torch
+from ai.fork_seguro import threads_impedindo_fork
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Analisador já carregado no processo pai; os workers herdam a referência no fork
+_analisador_compartilhado = None
+
+
+def _inicializar_worker(threads_por_worker, textos_aquecimento):
+    """Limita as threads do PyTorch em cada worker e aquece o modelo no próprio worker"""
+    torch.set_num_threads(threads_por_worker)
+    if textos_aquecimento:
+        try:
+            _analisador_compartilhado._executar_bert_lote_local(textos_aquecimento)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no aquecimento do worker de inferência (continuando): {e}")
+
+
+def _processar_no_worker(args):
+    """Executa um pedaço do lote dentro do worker"""
+    textos, batch_size = args
+    return _analisador_compartilhado._executar_bert_lote_local(textos, batch_size)
+
+
+def fork_disponivel():
+    """O compartilhamento copy-on-write depende do método de início 'fork' (Linux/Mac)"""
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+class InferencePool:
+    """
+    Pool de processos de inferência com pesos compartilhados
+    
+    O modelo é carregado uma única vez no processo pai; os workers são criados
+    por fork e enxergam os mesmos pesos (os tensores são movidos para memória
+    compartilhada antes do fork), então não há cópias extras do modelo.
+    Cada lote é dividido entre os workers, contornando o GIL.
+    
+    O fork só é seguro em um processo de uma única thread e antes de o
+    PyTorch/tokenizer executarem trabalho paralelo: o pool deve ser criado
+    logo após o carregamento dos pesos, antes do aquecimento e do servidor.
+    Com outras threads vivas o pool não é criado (a inferência continua no
+    processo atual).
+    """
+    
+    def __init__(self, analisador, num_workers=None, textos_aquecimento=None):
+        """
+        Args:
+            analisador: SentimentAnalyzer com o modelo já carregado (e ainda não usado)
+            num_workers (int): Quantidade de processos (default: número de núcleos)
+            textos_aquecimento (list): Textos da inferência de aquecimento de cada worker
+        """
+        global _analisador_compartilhado
+        
+        if not fork_disponivel():
+            raise RuntimeError("pool de inferência requer o método de início 'fork' (indisponível nesta plataforma)")
+        
+        outras_threads = threads_impedindo_fork()
+        if outras_threads:
+            raise RuntimeError(f"fork com outras threads ativas pode travar os workers ({', '.join(outras_threads)})")
+        
+        nucleos = os.cpu_count() or 1
+        self.num_workers = max(int(num_workers or nucleos), 1)
+        self.threads_por_worker = max(nucleos // self.num_workers, 1)
+        
+        for modelo in self._modelos_torch(analisador):
+            modelo.share_memory()
+        
+        _analisador_compartilhado = analisador
+        contexto = multiprocessing.get_context('fork')
+        self._pool = contexto.Pool(
+            processes=self.num_workers,
+            initializer=_inicializar_worker,
+            initargs=(self.threads_por_worker, list(textos_aquecimento or []))
+        )
+        
+        # Métricas
+        self.total_lotes = 0
+        self.total_textos = 0
+        
+        logger.info(f"✅ Pool de inferência iniciado: {self.num_workers} workers x {self.threads_por_worker} threads")
+    
+    @staticmethod
+    def _modelos_torch(analisador):
+        """Modelos PyTorch cujos pesos devem ficar em memória compartilhada"""
+        # No caminho do pipeline, model_bert é o próprio modelo do pipeline
+        return [analisador.model_bert] if analisador.model_bert is not None else []
+    
+    def executar(self, textos, batch_size):
+        """
+        Divide os textos entre os workers e junta os resultados na ordem original
+        
+        Args:
+            textos (list): Textos a serem analisados
+            batch_size (int): Tamanho do lote usado dentro de cada worker
+        
+        Returns:
+            list: Polaridade de cada texto (ou None)
+        """
+        if not textos:
+            return []
+        
+        tamanho = max(math.ceil(len(textos) / self.num_workers), 1)
+        pedacos = [(textos[i:i + tamanho], batch_size) for i in range(0, len(textos), tamanho)]
+        
+        resultados = []
+        for parcial in self._pool.map(_processar_no_worker, pedacos):
+            resultados.extend(parcial)
+        
+        self.total_lotes += 1
+        self.total_textos += len(textos)
+        return resultados
+    
+    def encerrar(self):
+        """Finaliza os workers"""
+        self._pool.terminate()
+        self._pool.join()
+    
+    def estatisticas(self):
+        """Retorna métricas de uso do pool"""
+        return {
+            'workers': self.num_workers,
+            'threads_por_worker': self.threads_por_worker,
+            'lotes': self.total_lotes,
+            'textos': self.total_textos
+        }
@@ -0,0 +1,129 @@
+"""
+Work Well - Léxico de Sentimento Compilado
+Casamento de múltiplos termos em uma única passada (regex com limites de palavra)
+"""
+import re
+import json
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fim de frase e limites de oração: a negação não passa deles
+# ("não gostei. Estou feliz", "não é ruim, mas cansa")
+PADRAO_FRONTEIRA = r'[.!?;,]|(?<!\w)mas(?!\w)'
+
+
+class LexiconMatcher:
+    """
+    Casador de léxico ponderado para a análise básica de sentimento
+    
+    Todos os termos, as palavras de negação e as demais palavras são
+    compilados em uma única expressão regular; uma só passada sobre o texto
+    soma os pesos encontrados, aplica negação (ex: "não estou bem") e conta
+    as palavras. Os termos só casam como palavras inteiras, então "mal" não
+    casa dentro de "normal" nem "bem" dentro de "também". A negação vale até
+    o fim da janela ou até a próxima pontuação de frase/oração ou "mas".
+    """
+    
+    def __init__(self, termos, negacoes=None, janela_negacao=3, fator_negacao=-1.0):
+        """
+        Args:
+            termos (dict): Termo (palavra ou expressão) -> peso
+            negacoes (list): Palavras que invertem o peso dos termos seguintes
+            janela_negacao (int): Quantas palavras após a negação ela continua valendo
+            fator_negacao (float): Multiplicador aplicado ao peso de um termo negado
+        """
+        self.termos = {self._normalizar(t): float(p) for t, p in termos.items() if t.strip()}
+        self.negacoes = {self._normalizar(n) for n in (negacoes or []) if n.strip()}
+        self.janela_negacao = int(janela_negacao)
+        self.fator_negacao = float(fator_negacao)
+        self.padrao = self._compilar()
+    
+    @staticmethod
+    def _normalizar(termo):
+        """Minúsculas e espaços simples (o mesmo tratamento aplicado ao texto)"""
+        return ' '.join(termo.lower().split())
+    
+    @staticmethod
+    def _alternativas(termos):
+        """Monta a alternância da regex; termos mais longos primeiro para preferir expressões"""
+        ordenados = sorted(termos, key=len, reverse=True)
+        return '|'.join(r'\s+'.join(re.escape(p) for p in t.split()) for t in ordenados)
+    
+    def _compilar(self):
+        """Compila termos, negações e palavras genéricas em uma única regex"""
+        partes = []
+        if self.termos:
+            partes.append(rf'(?P<termo>(?<!\w)(?:{self._alternativas(self.termos)})(?!\w))')
+        if self.negacoes:
+            partes.append(rf'(?P<negacao>(?<!\w)(?:{self._alternativas(self.negacoes)})(?!\w))')
+        partes.append(rf'(?P<fronteira>{PADRAO_FRONTEIRA})')
+        partes.append(r'(?P<palavra>\w+)')
+        return re.compile('|'.join(partes))
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Carrega o léxico de um arquivo JSON
+        
+        Formato: {"termos": {"termo": peso, ...}, "negacoes": [...],
+                  "janela_negacao": 3, "fator_negacao": -1.0}
+        """
+        with open(caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        
+        matcher = cls(
+            dados.get('termos', {}),
+            negacoes=dados.get('negacoes', []),
+            janela_negacao=dados.get('janela_negacao', 3),
+            fator_negacao=dados.get('fator_negacao', -1.0)
+        )
+        logger.info(f"✅ Léxico de sentimento carregado: {len(matcher.termos)} termos, {len(matcher.negacoes)} negações")
+        return matcher
+    
+    def pontuar(self, texto):
+        """
+        Calcula a soma dos pesos do léxico no texto
+        
+        Args:
+            texto (str): Texto a ser analisado
+        
+        Returns:
+            tuple: (soma_positiva, soma_negativa, total_palavras) - soma_negativa é >= 0
+        """
+        soma_positiva = 0.0
+        soma_negativa = 0.0
+        total_palavras = 0
+        negacao_ate = -1  # Índice da última palavra ainda afetada pela negação
+        
+        for m in self.padrao.finditer(texto.lower()):
+            tipo = m.lastgroup
+            
+            if tipo == 'palavra':
+                total_palavras += 1
+                continue
+            
+            if tipo == 'negacao':
+                total_palavras += 1
+                negacao_ate = total_palavras + self.janela_negacao
+                continue
+            
+            if tipo == 'fronteira':
+                if m.group().isalpha():  # "mas" também conta como palavra
+                    total_palavras += 1
+                negacao_ate = -1
+                continue
+            
+            termo = m.group('termo')
+            peso = self.termos[' '.join(termo.split())]
+            if total_palavras < negacao_ate:
+                peso *= self.fator_negacao
+            total_palavras += len(termo.split())
+            
+            if peso >= 0:
+                soma_positiva += peso
+            else:
+                soma_negativa -= peso
+        
+        return soma_positiva, soma_negativa, total_palavras
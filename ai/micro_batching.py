@@ -0,0 +1,147 @@
+"""
+Work Well - Micro-batching de Inferência
+Agrupa requisições concorrentes em um único lote para o modelo
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchScheduler:
+    """
+    Agendador de micro-batching entre requisições
+    
+    Várias threads do Flask chamam submeter() ao mesmo tempo; uma thread de
+    trabalho junta os itens que chegarem dentro da janela de espera (ou até
+    atingir o lote máximo), executa uma única chamada em lote e devolve a
+    cada chamador o seu próprio resultado.
+    """
+    
+    def __init__(self, processar_lote, max_batch=16, max_espera_ms=5, nome='micro-batch', workers=1):
+        """
+        Args:
+            processar_lote (callable): Função que recebe uma lista de itens e
+                retorna uma lista de resultados na mesma ordem
+            max_batch (int): Número máximo de itens por lote
+            max_espera_ms (float): Tempo máximo (ms) que o primeiro item espera por companhia
+            nome (str): Nome da thread de trabalho (para logs)
+            workers (int): Quantidade de threads de trabalho consumindo a mesma fila
+        """
+        self.processar_lote = processar_lote
+        self.max_batch = max(int(max_batch), 1)
+        self.max_espera = max(float(max_espera_ms), 0.0) / 1000.0
+        self.nome = nome
+        self.workers = max(int(workers), 1)
+        
+        self._fila = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._lock_metricas = threading.Lock()
+        
+        # Métricas
+        self.total_lotes = 0
+        self.total_itens = 0
+        self.maior_lote = 0
+    
+    def _garantir_worker(self):
+        """Inicia as threads de trabalho na primeira submissão"""
+        if len(self._threads) == self.workers and all(t.is_alive() for t in self._threads):
+            return
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if len(self._threads) == self.workers:
+                return
+            while len(self._threads) < self.workers:
+                nome = self.nome if self.workers == 1 else f"{self.nome}-{len(self._threads) + 1}"
+                thread = threading.Thread(target=self._loop, name=nome, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"🚀 {self.nome}: {self.workers} worker(s) iniciado(s) (max_batch={self.max_batch}, max_espera={self.max_espera * 1000:.0f}ms)")
+    
+    def _coletar_lote(self):
+        """Bloqueia até o primeiro item e junta os que chegarem dentro da janela"""
+        lote = [self._fila.get()]
+        prazo = time.monotonic() + self.max_espera
+        
+        while len(lote) < self.max_batch:
+            restante = prazo - time.monotonic()
+            try:
+                if restante > 0:
+                    lote.append(self._fila.get(timeout=restante))
+                else:
+                    # Janela esgotada: só aproveita o que já está na fila
+                    lote.append(self._fila.get_nowait())
+            except queue.Empty:
+                break
+        
+        return lote
+    
+    def _loop(self):
+        """Laço principal da thread de trabalho"""
+        while True:
+            lote = self._coletar_lote()
+            itens = [item for item, _ in lote]
+            
+            try:
+                resultados = self.processar_lote(itens)
+                if len(resultados) != len(itens):
+                    raise ValueError(f"processar_lote retornou {len(resultados)} resultados para {len(itens)} itens")
+            except Exception as e:
+                logger.warning(f"⚠️ {self.nome}: erro ao processar lote de {len(itens)} itens: {e}")
+                for _, futuro in lote:
+                    futuro.set_exception(e)
+                continue
+            
+            with self._lock_metricas:
+                self.total_lotes += 1
+                self.total_itens += len(itens)
+                self.maior_lote = max(self.maior_lote, len(itens))
+            
+            for (_, futuro), resultado in zip(lote, resultados):
+                futuro.set_result(resultado)
+    
+    def enfileirar(self, item):
+        """
+        Envia um item para o próximo lote sem aguardar o processamento
+        
+        Args:
+            item: Item a ser processado
+        
+        Returns:
+            Future: Recebe o resultado (ou a exceção) quando o lote for processado
+        """
+        self._garantir_worker()
+        futuro = Future()
+        self._fila.put((item, futuro))
+        return futuro
+    
+    def submeter(self, item, timeout=None):
+        """
+        Envia um item para o próximo lote e aguarda o seu resultado
+        
+        Args:
+            item: Item a ser processado (ex: texto do comentário)
+            timeout (float): Tempo máximo de espera em segundos (None = sem limite)
+        
+        Returns:
+            Resultado correspondente ao item
+        """
+        return self.enfileirar(item).result(timeout=timeout)
+    
+    def estatisticas(self):
+        """Retorna métricas de uso do agendador"""
+        return {
+            'lotes': self.total_lotes,
+            'itens': self.total_itens,
+            'media_por_lote': round(self.total_itens / self.total_lotes, 2) if self.total_lotes else 0.0,
+            'maior_lote': self.maior_lote,
+            'fila': self._fila.qsize(),
+            'workers': self.workers,
+            'max_batch': self.max_batch,
+            'max_espera_ms': self.max_espera * 1000
+        }
@@ -0,0 +1,137 @@
+"""
+Work Well - Backend ONNX Runtime para o BERT
+Exporta o modelo para ONNX, aplica quantização dinâmica int8 e executa em CPU
+"""
+import os
+import copy
+import logging
+import numpy as np
+import torch
+from config import Config
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    ONNX_DISPONIVEL = True
+except ImportError:
+    ort = None
+    ONNX_DISPONIVEL = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _ModeloExportavel(torch.nn.Module):
+    """Adapta o modelo transformers para receber argumentos posicionais no export"""
+    
+    def __init__(self, modelo, nomes_entrada):
+        super().__init__()
+        self.modelo = modelo
+        self.nomes_entrada = nomes_entrada
+    
+    def forward(self, *args):
+        return self.modelo(**dict(zip(self.nomes_entrada, args)), return_dict=False)[0]
+
+
+class OnnxBackend:
+    """
+    Backend de inferência com ONNX Runtime (CPU)
+    
+    Na primeira execução o modelo é exportado para ONNX e quantizado (int8
+    dinâmico); os arquivos ficam em Config.ONNX_CACHE_DIR, identificados por
+    modelo e revisão, e são reutilizados nas próximas inicializações.
+    """
+    
+    def __init__(self, modelo, tokenizer, model_name, saida='logits', quantizar=None):
+        """
+        Args:
+            modelo: Modelo transformers já carregado (PyTorch)
+            tokenizer: Tokenizer correspondente
+            model_name (str): Nome do modelo (para identificar os arquivos em cache)
+            saida (str): 'logits' (classificação) ou 'last_hidden_state' (embeddings)
+            quantizar (bool): Aplicar quantização int8 (default: Config.ONNX_QUANTIZAR)
+        """
+        if not ONNX_DISPONIVEL:
+            raise RuntimeError("onnxruntime não está instalado")
+        
+        self.saida = saida
+        self.quantizado = Config.ONNX_QUANTIZAR if quantizar is None else quantizar
+        self.caminho = self._preparar_modelo(modelo, tokenizer, model_name)
+        
+        opcoes = ort.SessionOptions()
+        opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if Config.ONNX_THREADS > 0:
+            opcoes.intra_op_num_threads = Config.ONNX_THREADS
+        
+        self.sessao = ort.InferenceSession(self.caminho, opcoes, providers=['CPUExecutionProvider'])
+        self.nomes_entrada = [entrada.name for entrada in self.sessao.get_inputs()]
+    
+    def _caminhos(self, model_name):
+        """Retorna (arquivo fp32, arquivo int8) no diretório de cache"""
+        base = f"{model_name.replace('/', '__')}@{Config.MODELO_REVISAO}-{self.saida}"
+        return (
+            os.path.join(Config.ONNX_CACHE_DIR, f"{base}.onnx"),
+            os.path.join(Config.ONNX_CACHE_DIR, f"{base}-int8.onnx")
+        )
+    
+    def _preparar_modelo(self, modelo, tokenizer, model_name):
+        """Exporta e quantiza o modelo, se ainda não existir em cache"""
+        caminho_fp32, caminho_int8 = self._caminhos(model_name)
+        os.makedirs(Config.ONNX_CACHE_DIR, exist_ok=True)
+        
+        if not os.path.exists(caminho_fp32):
+            logger.info(f"🔄 Exportando modelo para ONNX: {caminho_fp32}")
+            self._exportar(modelo, tokenizer, caminho_fp32)
+        
+        if not self.quantizado:
+            return caminho_fp32
+        
+        if not os.path.exists(caminho_int8):
+            logger.info(f"🔄 Aplicando quantização dinâmica int8: {caminho_int8}")
+            quantize_dynamic(caminho_fp32, caminho_int8, weight_type=QuantType.QInt8)
+        
+        return caminho_int8
+    
+    def _exportar(self, modelo, tokenizer, caminho):
+        """Exporta o modelo PyTorch para ONNX com eixos dinâmicos (lote e sequência)"""
+        exemplo = tokenizer(['Exemplo de comentário para exportação.'], return_tensors='pt')
+        nomes_entrada = list(exemplo.keys())
+        
+        eixos = {nome: {0: 'lote', 1: 'sequencia'} for nome in nomes_entrada}
+        eixos[self.saida] = {0: 'lote', 1: 'sequencia'} if self.saida == 'last_hidden_state' else {0: 'lote'}
+        
+        # Exportar sempre a partir da CPU; o modelo recebido é compartilhado com o
+        # backend PyTorch (.to() move no lugar), então uma cópia sai da GPU
+        modelo_cpu = modelo if next(modelo.parameters()).device.type == 'cpu' else copy.deepcopy(modelo).to('cpu')
+        modelo_cpu.eval()
+        
+        with torch.no_grad():
+            torch.onnx.export(
+                _ModeloExportavel(modelo_cpu, nomes_entrada),
+                tuple(exemplo[nome] for nome in nomes_entrada),
+                caminho,
+                input_names=nomes_entrada,
+                output_names=[self.saida],
+                dynamic_axes=eixos,
+                opset_version=14
+            )
+    
+    def executar(self, inputs):
+        """
+        Executa o modelo ONNX sobre um lote tokenizado
+        
+        Args:
+            inputs (dict): Tensores (ou arrays) do tokenizer
+        
+        Returns:
+            torch.Tensor: logits ou last_hidden_state do lote
+        """
+        feed = {}
+        for nome in self.nomes_entrada:
+            valor = inputs[nome]
+            if torch.is_tensor(valor):
+                valor = valor.cpu().numpy()
+            feed[nome] = np.asarray(valor, dtype=np.int64)
+        
+        resultado = self.sessao.run([self.saida], feed)[0]
+        return torch.from_numpy(resultado)
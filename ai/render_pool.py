@@ -0,0 +1,125 @@
+"""
+Work Well - Pool de Processos para Renderização de Gráficos
+O pyplot não é thread-safe; cada gráfico do dashboard é desenhado em um
+processo próprio, com matplotlib/seaborn já importados e aquecidos
+"""
+import os
+import logging
+import multiprocessing
+from ai.fork_seguro import threads_impedindo_fork
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Gerador de gráficos do worker (criado no initializer, sem cache próprio)
+_gerador_worker = None
+
+# Dados usados para aquecer os workers (fontes, colormaps, backend Agg)
+_DADOS_AQUECIMENTO = [
+    {'SETOR_NOME': 'Aquecimento', 'MEDIA_ESTRESSE': 5.0, 'MEDIA_FELICIDADE': 5.0,
+     'MEDIA_ANSIEDADE': 5.0, 'MEDIA_MOTIVACAO': 5.0, 'TOTAL_REGISTROS': 1}
+]
+
+
+def _inicializar_worker(dpi):
+    """Cria o gerador do worker e desenha um gráfico descartável (fontes, colormaps, Agg)"""
+    global _gerador_worker
+    from ai.heatmap_generator import HeatmapGenerator
+    from config import Config
+    
+    _gerador_worker = HeatmapGenerator(dpi=dpi, usar_cache=False, render_rapido=Config.GRAFICOS_RENDER_RAPIDO)
+    _gerador_worker._renderizar_comparativo_metricas(_DADOS_AQUECIMENTO)
+
+
+def _renderizar_no_worker(tarefa):
+    """Desenha um gráfico dentro do worker e retorna (indice, PNG)"""
+    indice, tipo, dados, metrica = tarefa
+    return indice, _gerador_worker.renderizar(tipo, dados, metrica)
+
+
+class RenderPool:
+    """
+    Pool de processos que desenham os gráficos em paralelo
+    
+    Os workers são criados por fork, então já nascem com matplotlib/seaborn
+    importados; cada um desenha um gráfico descartável ao iniciar, para que a
+    primeira requisição não pague o carregamento de fontes e colormaps. Cada
+    worker desenha um gráfico por vez, com o seu próprio estado do pyplot.
+    
+    O fork só é seguro sem outras threads vivas: o pool deve ser criado antes
+    do carregamento do modelo em background, da conexão com o banco e das
+    threads de compactação e varredura (ver app.py). Com outras threads vivas
+    o pool não é criado e os gráficos são desenhados no processo atual.
+    """
+    
+    def __init__(self, dpi=150, num_workers=None, timeout=30):
+        """
+        Args:
+            dpi (int): Resolução das imagens
+            num_workers (int): Quantidade de processos (default: até 4, um por gráfico do dashboard)
+            timeout (float): Segundos de espera por cada gráfico antes de desistir do pool
+        """
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("pool de renderização requer o método de início 'fork' (indisponível nesta plataforma)")
+        
+        outras_threads = threads_impedindo_fork()
+        if outras_threads:
+            raise RuntimeError(f"fork com outras threads ativas pode travar os workers ({', '.join(outras_threads)})")
+        
+        self.num_workers = max(int(num_workers or min(os.cpu_count() or 1, 4)), 1)
+        self.timeout = timeout
+        
+        contexto = multiprocessing.get_context('fork')
+        self._pool = contexto.Pool(
+            processes=self.num_workers,
+            initializer=_inicializar_worker,
+            initargs=(dpi,)
+        )
+        
+        # Métricas
+        self.total_graficos = 0
+        self.total_falhas = 0
+        
+        logger.info(f"✅ Pool de renderização iniciado: {self.num_workers} workers")
+    
+    def renderizar(self, tarefas):
+        """
+        Desenha vários gráficos em paralelo, devolvendo cada um assim que termina
+        
+        Args:
+            tarefas (list): Tuplas (tipo, dados, metrica)
+        
+        Yields:
+            tuple: (indice da tarefa, PNG em bytes ou None), na ordem de conclusão;
+                em caso de falha do pool, as tarefas pendentes não são devolvidas
+        """
+        pendentes = set(range(len(tarefas)))
+        resultados = self._pool.imap_unordered(
+            _renderizar_no_worker,
+            [(indice, tipo, dados, metrica) for indice, (tipo, dados, metrica) in enumerate(tarefas)]
+        )
+        
+        try:
+            while pendentes:
+                indice, png = resultados.next(timeout=self.timeout)
+                pendentes.discard(indice)
+                self.total_graficos += 1
+                yield indice, png
+        except Exception as e:
+            # Timeout ou worker perdido: os gráficos pendentes não são devolvidos
+            # e quem chamou os desenha no próprio processo
+            self.total_falhas += len(pendentes)
+            logger.warning(f"⚠️ Pool de renderização falhou ({len(pendentes)} gráficos pendentes): {e}")
+    
+    def encerrar(self):
+        """Finaliza os workers"""
+        self._pool.terminate()
+        self._pool.join()
+    
+    def estatisticas(self):
+        """Retorna métricas de uso do pool"""
+        return {
+            'workers': self.num_workers,
+            'graficos': self.total_graficos,
+            'falhas': self.total_falhas
+        }
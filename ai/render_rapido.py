@@ -0,0 +1,296 @@
+"""
+Work Well - Renderização Rápida dos Gráficos
+Mantém figuras já montadas (eixos, colorbar, rótulos e layout) por gráfico e
+lista de setores; cada renderização só troca valores, cores e anotações
+antes de desenhar no canvas Agg
+"""
+import math
+import logging
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+import seaborn as sns
+from seaborn.utils import relative_luminance
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from ai.heatmap_generator import COLUNAS_METRICAS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colunas e rótulos do comparativo de métricas
+COLUNAS_COMPARATIVO = ['MEDIA_ESTRESSE', 'MEDIA_FELICIDADE', 'MEDIA_ANSIEDADE', 'MEDIA_MOTIVACAO']
+ROTULOS_COMPARATIVO = ['Estresse', 'Felicidade', 'Ansiedade', 'Motivação']
+
+# Margem do recorte (mesma do savefig com bbox_inches='tight')
+MARGEM_RECORTE = 0.1
+
+
+class RenderizadorRapido:
+    """
+    Desenha os gráficos do HeatmapGenerator reaproveitando figuras montadas
+    
+    A primeira renderização de um gráfico para uma lista de setores monta a
+    figura como o desenho completo (sns.heatmap / barh, colorbar, títulos,
+    rótulos) sem pyplot. As seguintes só atualizam a matriz de cores, as
+    anotações e as barras: o tight_layout é refeito apenas quando o tamanho
+    dos elementos muda (ex.: total de registros com mais dígitos), e o
+    recorte é calculado sem o desenho extra do bbox_inches='tight'.
+    
+    As figuras são compartilhadas, então as renderizações são serializadas.
+    """
+    
+    # Métodos que montam e atualizam cada tipo de gráfico
+    TIPOS = {
+        'mapa_calor': ('_montar_mapa_calor', '_atualizar_mapa_calor'),
+        'comparativo': ('_montar_comparativo', '_atualizar_comparativo'),
+        'barras': ('_montar_barras', '_atualizar_barras')
+    }
+    
+    def __init__(self, gerador, max_templates=32):
+        """
+        Args:
+            gerador (HeatmapGenerator): Gerador dono das paletas e do dpi
+            max_templates (int): Figuras montadas mantidas em memória (LRU)
+        """
+        self.gerador = gerador
+        self.max_templates = max(int(max_templates), 1)
+        
+        self._templates = OrderedDict()  # (tipo, métrica, setores) -> template
+        self._lock = threading.Lock()
+        
+        # Métricas
+        self.templates_criados = 0
+        self.reutilizacoes = 0
+        self.relayouts = 0
+    
+    def renderizar(self, tipo, registros, metrica=None):
+        """
+        Desenha um gráfico reaproveitando a figura montada, se houver
+        
+        Args:
+            tipo (str): 'mapa_calor', 'comparativo' ou 'barras'
+            registros (list): Dicionários com os dados dos setores
+            metrica (str): Métrica (usada pelo mapa de calor)
+        
+        Returns:
+            bytes: PNG, ou None se o gráfico não tiver caminho rápido
+        """
+        if tipo not in self.TIPOS or (tipo == 'mapa_calor' and metrica not in COLUNAS_METRICAS):
+            return None
+        
+        montar, atualizar = self.TIPOS[tipo]
+        setores = tuple(registro.get('SETOR_NOME') for registro in registros)
+        chave = (tipo, metrica, setores)
+        
+        with self._lock:
+            template = self._templates.get(chave)
+            if template is None:
+                template = getattr(self, montar)(setores, metrica)
+                self._guardar(chave, template)
+                self.templates_criados += 1
+            else:
+                self._templates.move_to_end(chave)
+                self.reutilizacoes += 1
+            
+            getattr(self, atualizar)(template, registros, metrica)
+            self._ajustar_layout(template)
+            return self._desenhar(template)
+    
+    def estatisticas(self):
+        """Retorna métricas de uso dos templates"""
+        return {
+            'templates': len(self._templates),
+            'max_templates': self.max_templates,
+            'templates_criados': self.templates_criados,
+            'reutilizacoes': self.reutilizacoes,
+            'relayouts': self.relayouts
+        }
+    
+    # ==================== MONTAGEM ====================
+    
+    def _nova_figura(self, figsize, colunas=1):
+        """Cria figura e eixos fora do pyplot (canvas Agg próprio)"""
+        fig = Figure(figsize=figsize)
+        canvas = FigureCanvasAgg(fig)
+        eixos = fig.subplots(1, colunas)
+        return fig, canvas, eixos
+    
+    def _template(self, fig, canvas, **artistas):
+        return {'fig': fig, 'canvas': canvas, 'caixas': None, **artistas}
+    
+    def _montar_mapa_calor(self, setores, metrica):
+        """Mesmo desenho de HeatmapGenerator._renderizar_mapa_calor_setores"""
+        fig, canvas, ax = self._nova_figura((14, max(len(setores) * 0.5, 6)))
+        
+        sns.heatmap(
+            np.full((len(setores), 1), 5.0),
+            annot=True,
+            fmt='.1f',
+            cmap=self.gerador._paleta_metrica(metrica),
+            cbar_kws={'label': f'Nível de {metrica.capitalize()} (1-10)'},
+            yticklabels=list(setores),
+            xticklabels=[metrica.capitalize()],
+            vmin=1,
+            vmax=10,
+            linewidths=2,
+            linecolor='white',
+            ax=ax
+        )
+        anotacoes = list(ax.texts)
+        
+        ax.set_title(
+            f'Mapa de Calor - {metrica.capitalize()} por Setor',
+            fontsize=16,
+            fontweight='bold',
+            pad=20
+        )
+        
+        info = ax.text(
+            1.15, 0.5, '',
+            transform=ax.transAxes,
+            fontsize=10,
+            verticalalignment='center',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
+        )
+        
+        return self._template(fig, canvas, mesh=ax.collections[0], anotacoes=anotacoes, info=info)
+    
+    def _montar_comparativo(self, setores, metrica=None):
+        """Mesmo desenho de HeatmapGenerator._renderizar_comparativo_metricas"""
+        fig, canvas, ax = self._nova_figura((14, max(len(setores) * 0.6, 8)))
+        
+        sns.heatmap(
+            np.full((len(setores), len(COLUNAS_COMPARATIVO)), 5.0),
+            annot=True,
+            fmt='.1f',
+            cmap=self.gerador.paleta_geral,
+            cbar_kws={'label': 'Intensidade (1-10)'},
+            yticklabels=list(setores),
+            xticklabels=ROTULOS_COMPARATIVO,
+            vmin=1,
+            vmax=10,
+            linewidths=1.5,
+            linecolor='gray',
+            ax=ax
+        )
+        anotacoes = list(ax.texts)
+        
+        ax.set_title(
+            'Comparativo de Métricas Emocionais por Setor',
+            fontsize=16,
+            fontweight='bold',
+            pad=20
+        )
+        
+        return self._template(fig, canvas, mesh=ax.collections[0], anotacoes=anotacoes)
+    
+    def _montar_barras(self, setores, metrica=None):
+        """Mesmo desenho de HeatmapGenerator._renderizar_grafico_barras_comparativo"""
+        fig, canvas, (ax1, ax2) = self._nova_figura((16, 6), colunas=2)
+        
+        graficos = []
+        for ax, rotulo, titulo, critico in (
+            (ax1, 'Nível Médio de Estresse', 'Estresse por Setor', 7),
+            (ax2, 'Nível Médio de Felicidade', 'Felicidade por Setor', 3)
+        ):
+            barras = ax.barh(list(setores), [0] * len(setores), edgecolor='black', linewidth=1.5)
+            ax.set_xlabel(rotulo, fontsize=12, fontweight='bold')
+            ax.set_title(titulo, fontsize=14, fontweight='bold')
+            ax.set_xlim(0, 10)
+            ax.axvline(x=critico, color='red', linestyle='--', linewidth=2, alpha=0.5, label='Nível Crítico')
+            ax.legend()
+            ax.grid(axis='x', alpha=0.3)
+            
+            # Valores nas barras (posição e texto definidos a cada renderização)
+            textos = [ax.text(0, i, '', va='center', fontweight='bold') for i in range(len(setores))]
+            graficos.append((barras, textos))
+        
+        fig.suptitle('Análise Emocional Corporativa - Work Well',
+                     fontsize=16, fontweight='bold', y=0.98)
+        
+        return self._template(fig, canvas, graficos=graficos)
+    
+    # ==================== ATUALIZAÇÃO ====================
+    
+    @staticmethod
+    def _valor(valor):
+        """Converte o valor do banco em float (None vira NaN, como no DataFrame)"""
+        return float(valor) if valor is not None else math.nan
+    
+    def _atualizar_heatmap(self, template, matriz):
+        """Troca os valores da malha de cores e as anotações (regras do sns.heatmap)"""
+        mesh = template['mesh']
+        valores = np.ma.masked_invalid(np.asarray(matriz, dtype=float))
+        mesh.set_array(valores.reshape(np.shape(mesh.get_array())))
+        
+        for texto, valor in zip(template['anotacoes'], valores.flat):
+            if valor is np.ma.masked:
+                texto.set_text('')
+                continue
+            luminancia = relative_luminance(mesh.cmap(mesh.norm(valor)))
+            texto.set_text(f'{valor:.1f}')
+            texto.set_color('.15' if luminancia > .408 else 'w')
+    
+    def _atualizar_mapa_calor(self, template, registros, metrica):
+        coluna = COLUNAS_METRICAS[metrica]
+        self._atualizar_heatmap(template, [[self._valor(r.get(coluna))] for r in registros])
+        
+        total_registros = sum(r.get('TOTAL_REGISTROS') or 0 for r in registros)
+        template['info'].set_text(
+            f'Total de registros: {int(total_registros)}\n'
+            f'Setores analisados: {len(registros)}'
+        )
+    
+    def _atualizar_comparativo(self, template, registros, metrica=None):
+        self._atualizar_heatmap(
+            template,
+            [[self._valor(r.get(coluna)) for coluna in COLUNAS_COMPARATIVO] for r in registros]
+        )
+    
+    def _atualizar_barras(self, template, registros, metrica=None):
+        estresse = [self._valor(r.get('MEDIA_ESTRESSE')) for r in registros]
+        felicidade = [self._valor(r.get('MEDIA_FELICIDADE')) for r in registros]
+        
+        cores_estresse = ['#d62728' if x >= 7 else '#ff7f0e' if x >= 5 else '#2ca02c' for x in estresse]
+        cores_felicidade = ['#2ca02c' if x >= 7 else '#ff7f0e' if x >= 5 else '#d62728' for x in felicidade]
+        
+        for (barras, textos), valores, cores in zip(
+            template['graficos'], (estresse, felicidade), (cores_estresse, cores_felicidade)
+        ):
+            for i, (barra, texto, v, cor) in enumerate(zip(barras, textos, valores, cores)):
+                barra.set_width(v)
+                barra.set_facecolor(cor)
+                texto.set_position((v + 0.2, i))
+                texto.set_text(f'{v:.1f}')
+    
+    # ==================== LAYOUT E DESENHO ====================
+    
+    def _ajustar_layout(self, template):
+        """Refaz o tight_layout só quando o tamanho de algum eixo (com rótulos e textos) muda"""
+        fig = template['fig']
+        renderer = template['canvas'].get_renderer()
+        
+        caixas = [ax.get_tightbbox(renderer).bounds for ax in fig.axes]
+        if caixas != template['caixas']:
+            fig.tight_layout()
+            template['caixas'] = [ax.get_tightbbox(renderer).bounds for ax in fig.axes]
+            self.relayouts += 1
+    
+    def _desenhar(self, template):
+        """Desenha no canvas Agg e recorta como bbox_inches='tight', sem o desenho extra"""
+        fig = template['fig']
+        recorte = fig.get_tightbbox(template['canvas'].get_renderer()).padded(MARGEM_RECORTE)
+        
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', dpi=self.gerador.dpi, bbox_inches=recorte,
+                    facecolor='white', edgecolor='none')
+        return buffer.getvalue()
+    
+    def _guardar(self, chave, template):
+        """Armazena o template e descarta os menos usados acima do limite"""
+        self._templates[chave] = template
+        while len(self._templates) > self.max_templates:
+            self._templates.popitem(last=False)
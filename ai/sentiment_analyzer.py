@@ -3,13 +3,24 @@ Work Well - Análise de Sentimento com Deep Learning
 Utiliza modelos transformer para português (BERT) + OpenAI GPT
 """
 import logging
+import os
+import threading
+import time
+import json
+import hashlib
+import unicodedata
 from textblob import TextBlob
 import nltk
 import torch
 import torch.nn.functional as F
 from transformers import AutoTokenizer, AutoModel, AutoModelForSequenceClassification, pipeline
 from config import Config
+from cache import TTLCache, chave_hash
 from ai.gpt_service import gpt_service
+from ai.micro_batching import MicroBatchScheduler
+from ai.lexicon_matcher import LexiconMatcher
+from ai.onnx_backend import OnnxBackend, ONNX_DISPONIVEL
+from ai.inference_pool import InferencePool, fork_disponivel
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +32,12 @@ try:
 except:
     pass
 
+# Textos usados na inferência de aquecimento do modelo
+TEXTOS_AQUECIMENTO = [
+    'Hoje foi um dia tranquilo no trabalho.',
+    'Estou cansado e preocupado com os prazos da equipe nesta semana.'
+]
+
 
 class SentimentAnalyzer:
     """
@@ -29,276 +46,724 @@ class SentimentAnalyzer:
     Processa texto em português e retorna sentimento + score
     """
     
-    def __init__(self):
-        self.modelo_carregado = False
-        self.modelo_bert = None
+    def __init__(self, carregar_em_background=False, estrategia=None):
+        """
+        Args:
+            carregar_em_background (bool): Se True, o modelo é carregado e aquecido em
+                uma thread separada e a análise básica é usada enquanto isso
+            estrategia (str): 'auto' (tenta pipeline, classificação e embeddings, nessa ordem),
+                'pipeline', 'classificacao', 'embeddings' ou 'basico' (sem BERT).
+                Default: Config.MODELO_ESTRATEGIA
+        """
+        self.modelo_carregado = False  # Publicado só depois do aquecimento: libera o BERT para as requisições
+        self._pesos_carregados = False  # Modelo em memória (usado pelo aquecimento antes de liberar)
+        self.model_bert = None
+        self.onnx_backend = None  # Backend ONNX Runtime (quantizado), se ativado em Config
+        self.labels_modelo = None  # id2label do modelo do pipeline (interpretação igual à do pipeline)
+        self.pool = None  # Pool de processos de inferência, se ativado em Config
         self.tokenizer = None
         self.sentiment_pipeline = None
         self.use_embeddings = False  # Flag para usar embeddings se modelo não for fine-tuned
+        self.ancoras = None  # Embeddings das âncoras (positivas + negativas), normalizados
+        self.total_ancoras_positivas = 0
         self.model_name = Config.MODELO_SENTIMENTO
-        self._carregar_modelo()
+        self.estrategia = (estrategia or Config.MODELO_ESTRATEGIA).lower()
+        
+        # Léxico compilado da análise básica: pronto antes do modelo, para servir o fallback
+        self.lexico = LexiconMatcher.carregar(Config.LEXICO_SENTIMENTO)
+        
+        # Estado do carregamento: nao_iniciado -> carregando -> aquecendo -> pronto | fallback
+        self.estado_modelo = 'nao_iniciado'
+        self._pronto = threading.Event()
+        self._thread_carregamento = None
+        
+        # Cache de resultados (polaridade BERT e análise GPT) por texto normalizado
+        self.cache = None
+        if Config.CACHE_SENTIMENTO_ATIVO:
+            self.cache = TTLCache(
+                max_entradas=Config.CACHE_SENTIMENTO_MAX_ENTRADAS,
+                max_bytes=Config.CACHE_SENTIMENTO_MAX_MB * 1024 * 1024,
+                ttl_segundos=Config.CACHE_SENTIMENTO_TTL,
+                nome='sentimento'
+            )
+        
+        # Agrupa chamadas concorrentes de analisar_texto() em um único lote no BERT
+        self.scheduler = None
+        if Config.MICROBATCH_ATIVO:
+            self.scheduler = MicroBatchScheduler(
+                self._executar_bert_lote,
+                max_batch=Config.MICROBATCH_MAX_BATCH,
+                max_espera_ms=Config.MICROBATCH_MAX_ESPERA_MS,
+                nome='bert-micro-batch'
+            )
+        
+        if carregar_em_background and Config.INFERENCIA_WORKERS != 0:
+            # O fork do pool precisa acontecer antes de qualquer outra thread (ver _iniciar_pool)
+            logger.info("ℹ️ Pool de inferência ativo: modelo carregado antes de iniciar o servidor (sem carregamento em background)")
+            carregar_em_background = False
+        
+        if carregar_em_background:
+            self.iniciar_carregamento()
+        else:
+            self._carregar_e_aquecer()
+    
+    def _carregar_e_aquecer(self):
+        """Carrega o modelo e executa uma inferência de aquecimento"""
+        try:
+            self.estado_modelo = 'carregando'
+            self._carregar_modelo()
+            
+            if self._pesos_carregados and Config.SENTIMENTO_BACKEND == 'onnx':
+                self._ativar_onnx()
+            
+            if self._pesos_carregados:
+                self.estado_modelo = 'aquecendo'
+                self._iniciar_pool()  # Antes do aquecimento: fork sem threads do PyTorch/tokenizer
+                self._aquecer_modelo()
+                # Só agora as requisições passam a usar o BERT (backend e pool definitivos)
+                self.modelo_carregado = True
+                self.estado_modelo = 'pronto'
+            else:
+                self.estado_modelo = 'fallback'
+        except Exception as e:
+            logger.error(f"❌ Erro no carregamento do modelo: {e}")
+            self.estado_modelo = 'fallback'
+        finally:
+            self._pronto.set()
+    
+    def _ativar_onnx(self):
+        """
+        Ativa o backend ONNX Runtime (int8) para o modelo já carregado
+        Se algo falhar, continua usando PyTorch
+        """
+        if not ONNX_DISPONIVEL:
+            logger.warning("⚠️ SENTIMENTO_BACKEND=onnx, mas onnxruntime não está instalado (usando PyTorch)")
+            return
+        
+        try:
+            saida = 'last_hidden_state' if self.use_embeddings else 'logits'
+            self.onnx_backend = OnnxBackend(self.model_bert, self.tokenizer, self.model_name, saida)
+            logger.info(f"✅ Backend ONNX Runtime ativo ({os.path.basename(self.onnx_backend.caminho)})")
+        
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ativar backend ONNX (usando PyTorch): {e}")
+            self.onnx_backend = None
+    
+    def _iniciar_pool(self):
+        """
+        Cria o pool de processos de inferência (Config.INFERENCIA_WORKERS)
+        
+        Os workers são criados por fork logo após o carregamento dos pesos e
+        antes de qualquer inferência: o processo ainda não tem threads do
+        servidor, do micro-batching nem os pools internos do PyTorch/OpenMP e
+        do tokenizer, que podem deixar locks presos no processo filho. Cada
+        worker faz o próprio aquecimento ao iniciar.
+        """
+        if Config.INFERENCIA_WORKERS == 0:
+            return
+        if self.onnx_backend:
+            logger.warning("⚠️ Pool de inferência não é usado com o backend ONNX (sessões não sobrevivem ao fork)")
+            return
+        if torch.cuda.is_available():
+            logger.warning("⚠️ Pool de inferência desativado: GPU disponível (CUDA não suporta fork)")
+            return
+        if not fork_disponivel():
+            logger.warning("⚠️ Pool de inferência desativado: plataforma sem suporte a fork")
+            return
+        
+        try:
+            num_workers = Config.INFERENCIA_WORKERS if Config.INFERENCIA_WORKERS > 0 else None
+            self.pool = InferencePool(self, num_workers, textos_aquecimento=TEXTOS_AQUECIMENTO)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao iniciar pool de inferência (continuando no processo atual): {e}")
+            self.pool = None
+    
+    def _aquecer_modelo(self):
+        """
+        Executa uma inferência de aquecimento para inicializar kernels e alocações
+        antes de marcar o modelo como pronto
+        """
+        inicio = time.perf_counter()
+        try:
+            self._executar_bert_lote(TEXTOS_AQUECIMENTO)
+            logger.info(f"🔥 Modelo aquecido em {(time.perf_counter() - inicio) * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no aquecimento do modelo (continuando): {e}")
+    
+    def iniciar_carregamento(self):
+        """
+        Inicia o carregamento e aquecimento do modelo em background
+        
+        Enquanto o modelo não estiver carregado, analisar_texto() usa a análise
+        básica por palavras-chave.
+        """
+        if self._thread_carregamento and self._thread_carregamento.is_alive():
+            return
+        if self._pronto.is_set():
+            return
+        
+        self._thread_carregamento = threading.Thread(
+            target=self._carregar_e_aquecer,
+            name='bert-carregamento',
+            daemon=True
+        )
+        self._thread_carregamento.start()
+        logger.info("⏳ Carregamento do modelo iniciado em background (usando análise básica até ficar pronto)")
+    
+    def aguardar_pronto(self, timeout=None):
+        """
+        Aguarda o fim do carregamento/aquecimento do modelo
+        
+        Returns:
+            bool: True se o carregamento terminou (com ou sem sucesso) dentro do timeout
+        """
+        return self._pronto.wait(timeout)
+    
+    def esta_pronto(self):
+        """
+        Indica se o modelo está carregado e aquecido (readiness)
+        
+        Um fallback por falha no carregamento não conta como pronto; com a
+        estratégia 'basico' a análise por palavras-chave é a configurada, então
+        basta o fim do carregamento.
+        """
+        if self.estrategia == 'basico':
+            return self._pronto.is_set()
+        return self.estado_modelo == 'pronto'
     
     def _carregar_modelo(self):
         """
         Carrega o modelo de Deep Learning (BERT) para análise de sentimento
         Usa modelo pré-treinado neuralmind/bert-base-portuguese-cased
         """
+        if self.estrategia == 'basico':
+            logger.info("ℹ️ Estratégia 'basico' configurada: modelo BERT não será carregado")
+            return
+        
         try:
-            logger.info(f"🔄 Carregando modelo de Deep Learning: {self.model_name}")
+            logger.info(f"🔄 Carregando modelo de Deep Learning: {self.model_name} (estratégia: {self.estrategia})")
             
             # Tentar carregar modelo fine-tuned para sentimento primeiro
             # Se não encontrar, usar modelo base com embeddings
             try:
                 # Tentar pipeline de sentiment-analysis (requer modelo fine-tuned)
+                self._verificar_estrategia('pipeline')
                 self.sentiment_pipeline = pipeline(
                     "sentiment-analysis",
                     model=self.model_name,
                     tokenizer=self.model_name,
+                    revision=Config.MODELO_REVISAO,
                     device=0 if torch.cuda.is_available() else -1,
                     return_all_scores=True
                 )
-                self.modelo_carregado = True
+                # Tokenizer e modelo do pipeline são usados diretamente na inferência em lote
+                self.tokenizer = self.sentiment_pipeline.tokenizer
+                self.model_bert = self.sentiment_pipeline.model
+                self.labels_modelo = dict(getattr(self.model_bert.config, 'id2label', {}) or {})
+                self._pesos_carregados = True
                 logger.info("✅ Modelo BERT carregado com sucesso (pipeline sentiment-analysis)")
-                
+            
             except Exception as e:
                 logger.info(f"ℹ️ Pipeline de sentiment não disponível, tentando modelo base: {e}")
                 
                 # Tentar carregar modelo fine-tuned para classificação
                 try:
-                    self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    self._verificar_estrategia('classificacao')
+                    self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, revision=Config.MODELO_REVISAO)
                     self.model_bert = AutoModelForSequenceClassification.from_pretrained(
                         self.model_name,
+                        revision=Config.MODELO_REVISAO,
                         device_map="auto" if torch.cuda.is_available() else None
                     )
                     self.model_bert.eval()
-                    self.modelo_carregado = True
+                    self._pesos_carregados = True
                     logger.info("✅ Modelo BERT carregado (SequenceClassification)")
-                    
+                
                 except Exception as e2:
                     logger.info(f"ℹ️ Modelo de classificação não disponível, usando embeddings: {e2}")
                     
                     # Fallback: usar modelo base BERT com embeddings
                     try:
-                        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                        self._verificar_estrategia('embeddings')
+                        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, revision=Config.MODELO_REVISAO)
                         self.model_bert = AutoModel.from_pretrained(
                             self.model_name,
+                            revision=Config.MODELO_REVISAO,
                             device_map="auto" if torch.cuda.is_available() else None
                         )
                         self.model_bert.eval()
                         self.use_embeddings = True
-                        self.modelo_carregado = True
+                        self._pesos_carregados = True
                         logger.info("✅ Modelo BERT base carregado (usando embeddings para análise)")
-                        
+                        self._carregar_ancoras()
+                    
                     except Exception as e3:
                         logger.error(f"❌ Erro ao carregar modelo BERT: {e3}")
                         logger.warning("⚠️ Usando análise básica como fallback")
-                        self.modelo_carregado = False
-                    
+                        self._pesos_carregados = False
+        
         except Exception as e:
             logger.error(f"❌ Erro geral ao carregar modelo: {e}")
             logger.warning("⚠️ Usando análise básica como fallback")
-            self.modelo_carregado = False
+            self._pesos_carregados = False
     
-    def _analisar_com_bert(self, texto):
+    def _verificar_estrategia(self, nome):
+        """Interrompe a tentativa de carregamento se a estratégia não foi habilitada"""
+        if self.estrategia not in ('auto', nome):
+            raise RuntimeError(f"estratégia '{nome}' desativada (configurada: '{self.estrategia}')")
+    
+    def _dispositivo(self):
+        """Retorna o dispositivo de inferência (GPU se disponível)"""
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    
+    def _polaridade_pipeline(self, scores):
         """
-        Análise de sentimento usando modelo BERT de Deep Learning
-        Retorna score de sentimento baseado no modelo pré-treinado
+        Converte a saída do pipeline (lista de labels/scores) em polaridade (-1 a 1)
+        
+        Returns:
+            float: Polaridade, ou None se não foi possível interpretar os labels
         """
-        if not self.modelo_carregado or not texto:
+        # Normalmente retorna [{'label': 'POSITIVE', 'score': 0.9}, {'label': 'NEGATIVE', 'score': 0.1}]
+        # ou [{'label': 'LABEL_0', 'score': 0.1}, {'label': 'LABEL_1', 'score': 0.9}]
+        if scores and isinstance(scores[0], list):
+            scores = scores[0]
+        if not scores:
+            return None
+        
+        # Encontrar scores positivo e negativo
+        score_positivo = 0.0
+        score_negativo = 0.0
+        
+        for item in scores:
+            label = str(item.get('label', '')).upper()
+            score = item.get('score', 0.0)
+            
+            # Verificar diferentes formatos de labels
+            if 'POS' in label or 'POSITIVE' in label or 'LABEL_1' in label or label == '1':
+                score_positivo = score
+            elif 'NEG' in label or 'NEGATIVE' in label or 'LABEL_0' in label or label == '0':
+                score_negativo = score
+        
+        # Se não encontrou labels específicos, usar o score mais alto como positivo
+        if score_positivo == 0.0 and score_negativo == 0.0 and len(scores) >= 2:
+            # Assumir que o maior score é positivo
+            scores_sorted = sorted(scores, key=lambda x: x.get('score', 0), reverse=True)
+            score_positivo = scores_sorted[0].get('score', 0.5)
+            score_negativo = scores_sorted[1].get('score', 0.5) if len(scores_sorted) > 1 else 1.0 - score_positivo
+        
+        # Calcular polaridade (-1 a 1)
+        if score_positivo > 0 or score_negativo > 0:
+            return score_positivo - score_negativo
+        return None
+    
+    def _polaridades_classificacao(self, logits):
+        """
+        Converte logits de classificação em polaridades
+        Para modelos vindos do pipeline, interpreta os labels do mesmo jeito que o pipeline
+        """
+        if not self.labels_modelo:
+            return self._polaridades_logits(logits)
+        
+        # O pipeline aplica sigmoid quando há uma única saída e softmax nos demais casos
+        probs = torch.sigmoid(logits) if logits.shape[-1] == 1 else F.softmax(logits, dim=-1)
+        return [
+            self._polaridade_pipeline([
+                {'label': self.labels_modelo.get(k, str(k)), 'score': p} for k, p in enumerate(linha)
+            ])
+            for linha in probs.tolist()
+        ]
+    
+    def _polaridades_logits(self, logits):
+        """Converte logits de SequenceClassification em polaridades (-1 a 1)"""
+        probs = F.softmax(logits, dim=-1)
+        
+        if probs.shape[1] >= 2:
+            # Classe 0 = negativo, classe 1 = positivo
+            return (probs[:, 1] - probs[:, 0]).tolist()
+        return ((probs[:, 0] - 0.5) * 2).tolist()
+    
+    def _arquivo_ancoras(self):
+        """
+        Caminho do arquivo com os embeddings das âncoras persistidos em disco
+        
+        A chave inclui modelo, revisão e as próprias palavras-âncora, então
+        trocar qualquer um deles gera um novo arquivo automaticamente.
+        """
+        chave = json.dumps({
+            'modelo': self.model_name,
+            'revisao': Config.MODELO_REVISAO,
+            'positivas': Config.ANCORAS_POSITIVAS,
+            'negativas': Config.ANCORAS_NEGATIVAS
+        }, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(chave.encode('utf-8')).hexdigest()[:16]
+        nome_modelo = self.model_name.replace('/', '__')
+        return os.path.join(Config.ANCORAS_CACHE_DIR, f"{nome_modelo}@{Config.MODELO_REVISAO}-{digest}.pt")
+    
+    def _calcular_embeddings_ancoras(self, palavras):
+        """Calcula os embeddings [CLS] de uma lista de palavras-âncora em uma única passada"""
+        tokens = self.tokenizer(palavras, return_tensors="pt", padding=True, truncation=True)
+        tokens = {k: v.to(self._dispositivo()) for k, v in tokens.items()}
+        with torch.no_grad():
+            out = self.model_bert(**tokens)
+        return out.last_hidden_state[:, 0, :].detach().cpu()
+    
+    def _carregar_ancoras(self):
+        """
+        Prepara o banco de embeddings das âncoras positivas/negativas
+        
+        Os embeddings são calculados uma única vez (ou lidos do disco, se já
+        existirem para o mesmo modelo/revisão) e mantidos como um tensor
+        empilhado e normalizado: primeiro as âncoras positivas, depois as negativas.
+        """
+        self.ancoras = None
+        self.total_ancoras_positivas = 0
+        
+        positivas = Config.ANCORAS_POSITIVAS
+        negativas = Config.ANCORAS_NEGATIVAS
+        if not positivas or not negativas:
+            logger.warning("⚠️ Âncoras de sentimento não configuradas (embeddings desativados)")
+            return
+        
+        arquivo = self._arquivo_ancoras()
+        embeddings = None
+        
+        if os.path.exists(arquivo):
+            try:
+                embeddings = torch.load(arquivo, map_location="cpu")
+                logger.info(f"✅ Embeddings das âncoras carregados do disco: {arquivo}")
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao ler âncoras do disco (recalculando): {e}")
+                embeddings = None
+        
+        if embeddings is None:
+            try:
+                embeddings = self._calcular_embeddings_ancoras(positivas + negativas)
+            except Exception as e:
+                logger.error(f"❌ Erro ao calcular embeddings das âncoras: {e}")
+                return
+            
+            try:
+                os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+                torch.save(embeddings, arquivo)
+                logger.info(f"💾 Embeddings das âncoras salvos em: {arquivo}")
+            except Exception as e:
+                logger.warning(f"⚠️ Não foi possível salvar as âncoras em disco (continuando): {e}")
+        
+        self.ancoras = F.normalize(embeddings, dim=-1).to(self._dispositivo())
+        self.total_ancoras_positivas = len(positivas)
+    
+    def _polaridades_embeddings(self, outputs):
+        """
+        Calcula polaridades por similaridade cosseno com o banco de âncoras
+        
+        Uma única multiplicação de matrizes (textos x âncoras) gera todas as
+        similaridades; a polaridade é a diferença entre a similaridade média
+        com as âncoras positivas e com as negativas.
+        """
+        if self.ancoras is None:
+            # Se não conseguiu embeddings de referência, usar análise básica
             return None
         
+        # Embedding de cada texto (usar [CLS] token)
+        if torch.is_tensor(outputs):
+            # Saída do ONNX Runtime: last_hidden_state já como tensor
+            text_embeddings = outputs[:, 0, :]
+        elif hasattr(outputs, 'last_hidden_state'):
+            text_embeddings = outputs.last_hidden_state[:, 0, :]
+        elif hasattr(outputs, 'pooler_output'):
+            text_embeddings = outputs.pooler_output
+        else:
+            text_embeddings = outputs[0][:, 0, :]
+        
+        text_embeddings = text_embeddings.to(self.ancoras.device)
+        similaridades = F.normalize(text_embeddings, dim=-1) @ self.ancoras.T
+        cos_sim_pos = similaridades[:, :self.total_ancoras_positivas].mean(dim=1)
+        cos_sim_neg = similaridades[:, self.total_ancoras_positivas:].mean(dim=1)
+        
+        # Normalizar para -1 a 1
+        polaridades = ((cos_sim_pos - cos_sim_neg) / 2.0).clamp(-1.0, 1.0)
+        return polaridades.tolist()
+    
+    def _inferir_lote(self, inputs):
+        """
+        Executa uma passada do modelo sobre um lote já tokenizado e com padding
+        Usa ONNX Runtime se o backend estiver ativo, senão PyTorch
+        
+        Args:
+            inputs (dict): Tensores do tokenizer (input_ids, attention_mask, ...)
+        
+        Returns:
+            list: Polaridade de cada item do lote, ou None se a saída não pôde ser interpretada
+        """
+        if self.onnx_backend:
+            saida = self.onnx_backend.executar(inputs)
+            
+            if self.use_embeddings:
+                return self._polaridades_embeddings(saida)
+            return self._polaridades_classificacao(saida)
+        
+        device = self._dispositivo()
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        
+        with torch.no_grad():
+            outputs = self.model_bert(**inputs)
+        
+        # Se usar embeddings (modelo base), fazer análise baseada em embeddings
+        if self.use_embeddings:
+            return self._polaridades_embeddings(outputs)
+        # Se é modelo de classificação (SequenceClassification)
+        if hasattr(outputs, 'logits'):
+            return self._polaridades_classificacao(outputs.logits)
+        return None
+    
+    def _executar_bert_lote(self, textos, batch_size=None):
+        """
+        Executa o BERT em lote (sem cache)
+        Usa o pool de processos se estiver ativo, senão executa no próprio processo
+        """
+        if self.pool and self.modelo_carregado and textos:
+            try:
+                return self.pool.executar(list(textos), batch_size)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro no pool de inferência, executando localmente: {e}")
+        
+        return self._executar_bert_lote_local(textos, batch_size)
+    
+    def _tokenizar_em_janelas(self, entradas):
+        """
+        Tokeniza os textos em janelas de tokens com sobreposição (sliding window)
+        
+        Textos maiores que Config.CHUNK_MAX_TOKENS viram várias janelas, cada uma
+        com até CHUNK_MAX_TOKENS tokens e CHUNK_SOBREPOSICAO tokens repetidos da
+        janela anterior, em vez de perder o final do texto.
+        
+        Returns:
+            tuple: (codificados sem padding, índice do texto de origem de cada janela)
+        """
+        max_tokens = min(Config.CHUNK_MAX_TOKENS, getattr(self.tokenizer, 'model_max_length', 512) or 512)
+        sobreposicao = max(min(Config.CHUNK_SOBREPOSICAO, max_tokens // 2), 0)
+        
+        if getattr(self.tokenizer, 'is_fast', False):
+            codificados = self.tokenizer(
+                entradas,
+                truncation=True,
+                max_length=max_tokens,
+                stride=sobreposicao,
+                return_overflowing_tokens=True
+            )
+            origem = list(codificados.pop('overflow_to_sample_mapping'))
+            return codificados, origem
+        
+        # Tokenizer lento não suporta janelas: truncar por tokens
+        codificados = self.tokenizer(entradas, truncation=True, max_length=max_tokens)
+        return codificados, list(range(len(entradas)))
+    
+    def _agregar_janelas(self, polaridades, pesos):
+        """
+        Combina as polaridades das janelas de um mesmo texto
+        Estratégia em Config.CHUNK_AGREGACAO: 'media', 'minimo' ou 'ponderada' (pelo número de tokens)
+        """
+        if len(polaridades) == 1:
+            return polaridades[0]
+        
+        estrategia = Config.CHUNK_AGREGACAO
+        if estrategia == 'minimo':
+            return min(polaridades)
+        if estrategia == 'media':
+            return sum(polaridades) / len(polaridades)
+        return sum(p * w for p, w in zip(polaridades, pesos)) / max(sum(pesos), 1)
+    
+    def _executar_bert_lote_local(self, textos, batch_size=None):
+        """
+        Análise de sentimento em lote usando o modelo BERT
+        
+        Os textos são tokenizados de uma vez e divididos em janelas de tokens;
+        todas as janelas são ordenadas por tamanho (length bucketing) e
+        processadas em lotes com padding dinâmico, de modo que cada lote só é
+        preenchido até a maior janela do próprio lote. As polaridades das
+        janelas de cada texto são então agregadas.
+        
+        Args:
+            textos (list): Lista de textos a serem analisados
+            batch_size (int): Tamanho de cada lote (default: Config.SENTIMENTO_BATCH_SIZE)
+        
+        Returns:
+            list: Polaridade (-1 a 1) de cada texto, ou None quando o BERT não conseguiu analisar
+        """
+        polaridades = [None] * len(textos)
+        if not self._pesos_carregados or not textos:
+            return polaridades
+        if not self.tokenizer or not (self.model_bert or self.onnx_backend):
+            return polaridades
+        
+        batch_size = max(int(batch_size or Config.SENTIMENTO_BATCH_SIZE), 1)
+        
+        indices = [i for i, texto in enumerate(textos) if texto]
+        entradas = [textos[i] for i in indices]
+        if not entradas:
+            return polaridades
+        
         try:
-            # Limitar tamanho do texto (BERT tem limite de tokens)
-            max_length = 512
-            if len(texto) > max_length:
-                texto = texto[:max_length]
+            if not self.onnx_backend and torch.cuda.is_available() and hasattr(self.model_bert, 'to'):
+                self.model_bert = self.model_bert.to(self._dispositivo())
             
-            # Usar pipeline se disponível (mais simples)
-            if self.sentiment_pipeline:
-                try:
-                    resultados = self.sentiment_pipeline(texto)
-                    
-                    # Processar resultados do pipeline
-                    # O pipeline retorna lista de scores para cada label
-                    if resultados and len(resultados) > 0:
-                        # Normalmente retorna [{'label': 'POSITIVE', 'score': 0.9}, {'label': 'NEGATIVE', 'score': 0.1}]
-                        # ou [{'label': 'LABEL_0', 'score': 0.1}, {'label': 'LABEL_1', 'score': 0.9}]
-                        scores = resultados[0] if isinstance(resultados[0], list) else resultados
-                        
-                        # Encontrar scores positivo e negativo
-                        score_positivo = 0.0
-                        score_negativo = 0.0
-                        
-                        for item in scores:
-                            label = str(item.get('label', '')).upper()
-                            score = item.get('score', 0.0)
-                            
-                            # Verificar diferentes formatos de labels
-                            if 'POS' in label or 'POSITIVE' in label or 'LABEL_1' in label or label == '1':
-                                score_positivo = score
-                            elif 'NEG' in label or 'NEGATIVE' in label or 'LABEL_0' in label or label == '0':
-                                score_negativo = score
-                        
-                        # Se não encontrou labels específicos, usar o score mais alto como positivo
-                        if score_positivo == 0.0 and score_negativo == 0.0 and len(scores) >= 2:
-                            # Assumir que o maior score é positivo
-                            scores_sorted = sorted(scores, key=lambda x: x.get('score', 0), reverse=True)
-                            score_positivo = scores_sorted[0].get('score', 0.5)
-                            score_negativo = scores_sorted[1].get('score', 0.5) if len(scores_sorted) > 1 else 1.0 - score_positivo
-                        
-                        # Calcular polaridade (-1 a 1)
-                        if score_positivo > 0 or score_negativo > 0:
-                            polaridade = score_positivo - score_negativo
-                            logger.info(f"✅ Pipeline BERT: positivo={score_positivo:.3f}, negativo={score_negativo:.3f}, polaridade={polaridade:.3f}")
-                            return polaridade
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro no pipeline BERT: {e}, tentando método direto...")
-                    # Continuar para método direto
-                    
-            # Fallback: usar modelo e tokenizer diretamente
-            elif self.tokenizer and self.model_bert:
-                # Tokenizar texto
-                inputs = self.tokenizer(
-                    texto,
-                    return_tensors="pt",
-                    truncation=True,
-                    max_length=512,
-                    padding=True
-                )
-                
-                # Mover para GPU se disponível
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                if torch.cuda.is_available():
-                    inputs = {k: v.to(device) for k, v in inputs.items()}
-                    if hasattr(self.model_bert, 'to'):
-                        self.model_bert = self.model_bert.to(device)
+            # Tokenizar tudo de uma vez, sem padding (o padding é feito por lote)
+            codificados, origem = self._tokenizar_em_janelas(entradas)
+            tamanhos = [len(ids) for ids in codificados['input_ids']]
+            ordem = sorted(range(len(origem)), key=lambda j: tamanhos[j])
+            
+            polaridades_janelas = [None] * len(origem)
+            for inicio in range(0, len(ordem), batch_size):
+                lote = ordem[inicio:inicio + batch_size]
+                features = [{k: codificados[k][j] for k in codificados.keys()} for j in lote]
+                inputs = self.tokenizer.pad(features, return_tensors="pt")
                 
-                # Fazer inferência
-                with torch.no_grad():
-                    outputs = self.model_bert(**inputs)
-                    
-                    # Se usar embeddings (modelo base), fazer análise baseada em embeddings
-                    if self.use_embeddings:
-                        # Obter embeddings do [CLS] token
-                        if hasattr(outputs, 'last_hidden_state'):
-                            embeddings = outputs.last_hidden_state
-                        elif hasattr(outputs, 'pooler_output'):
-                            embeddings = outputs.pooler_output
-                        else:
-                            # Tentar obter do primeiro token
-                            embeddings = outputs[0][:, 0, :]  # [CLS] token
-                        
-                        # Análise de sentimento baseada em embeddings
-                        # Usar palavras-chave positivas/negativas como referência
-                        palavras_pos_ref = ['bom', 'ótimo', 'feliz', 'satisfeito', 'alegre']
-                        palavras_neg_ref = ['ruim', 'triste', 'estressado', 'cansado', 'ansioso']
-                        
-                        # Tokenizar palavras de referência e obter seus embeddings
-                        pos_embeddings = []
-                        neg_embeddings = []
-                        
-                        for palavra in palavras_pos_ref:
-                            try:
-                                tokens = self.tokenizer(palavra, return_tensors="pt", padding=True, truncation=True)
-                                if torch.cuda.is_available():
-                                    tokens = {k: v.to(device) for k, v in tokens.items()}
-                                with torch.no_grad():
-                                    out = self.model_bert(**tokens)
-                                    if hasattr(out, 'last_hidden_state'):
-                                        pos_embeddings.append(out.last_hidden_state[:, 0, :].mean(dim=0))
-                            except:
-                                pass
-                        
-                        for palavra in palavras_neg_ref:
-                            try:
-                                tokens = self.tokenizer(palavra, return_tensors="pt", padding=True, truncation=True)
-                                if torch.cuda.is_available():
-                                    tokens = {k: v.to(device) for k, v in tokens.items()}
-                                with torch.no_grad():
-                                    out = self.model_bert(**tokens)
-                                    if hasattr(out, 'last_hidden_state'):
-                                        neg_embeddings.append(out.last_hidden_state[:, 0, :].mean(dim=0))
-                            except:
-                                pass
-                        
-                        # Calcular similaridade com embeddings de referência
-                        if pos_embeddings and neg_embeddings:
-                            # Média dos embeddings de referência
-                            pos_ref = torch.stack(pos_embeddings).mean(dim=0)
-                            neg_ref = torch.stack(neg_embeddings).mean(dim=0)
-                            
-                            # Embedding do texto (usar [CLS] token)
-                            text_embedding = embeddings[:, 0, :].squeeze() if len(embeddings.shape) > 2 else embeddings.squeeze()
-                            
-                            # Calcular similaridade cosseno
-                            cos_sim_pos = F.cosine_similarity(text_embedding.unsqueeze(0), pos_ref.unsqueeze(0))
-                            cos_sim_neg = F.cosine_similarity(text_embedding.unsqueeze(0), neg_ref.unsqueeze(0))
-                            
-                            # Normalizar para -1 a 1
-                            polaridade = (cos_sim_pos.item() - cos_sim_neg.item()) / 2.0
-                            return max(-1.0, min(1.0, polaridade))
-                        else:
-                            # Se não conseguiu embeddings de referência, usar análise básica
-                            return None
-                    
-                    # Se é modelo de classificação (SequenceClassification)
-                    elif hasattr(outputs, 'logits'):
-                        logits = outputs.logits
-                        probs = F.softmax(logits, dim=-1)
-                        
-                        if probs.shape[1] >= 2:
-                            score_negativo = probs[0][0].item()
-                            score_positivo = probs[0][1].item()
-                            polaridade = score_positivo - score_negativo
-                            return polaridade
-                        else:
-                            return (probs[0][0].item() - 0.5) * 2
-                    else:
-                        return None
-                        
+                valores = self._inferir_lote(inputs)
+                if valores is None:
+                    continue
+                for j, polaridade in zip(lote, valores):
+                    polaridades_janelas[j] = polaridade
+            
+            # Agregar as janelas de cada texto
+            janelas_por_texto = {}
+            for j, k in enumerate(origem):
+                if polaridades_janelas[j] is not None:
+                    janelas_por_texto.setdefault(k, []).append((polaridades_janelas[j], tamanhos[j]))
+            
+            for k, janelas in janelas_por_texto.items():
+                polaridades[indices[k]] = self._agregar_janelas(
+                    [p for p, _ in janelas],
+                    [w for _, w in janelas]
+                )
+            
+            logger.info(f"✅ BERT em lote: {len(entradas)} textos, {len(origem)} janelas (batch_size={batch_size})")
+        
         except Exception as e:
-            logger.warning(f"⚠️ Erro na análise BERT: {e}")
-            return None
+            logger.warning(f"⚠️ Erro na análise BERT em lote: {e}")
         
-        return None
+        return polaridades
     
-    def _analisar_portugues_basico(self, texto):
-        """Análise básica de sentimento em português usando palavras-chave (fallback)"""
-        texto_lower = texto.lower()
-        
-        # Palavras positivas
-        palavras_positivas = [
-            'bem', 'bom', 'ótimo', 'excelente', 'feliz', 'satisfeito', 'satisfeita',
-            'alegre', 'contente', 'animado', 'animada', 'motivado', 'motivada',
-            'ótima', 'bom dia', 'tudo bem', 'está bem', 'estou bem', 'estamos bem',
-            'perfeito', 'maravilhoso', 'gratidão', 'grato', 'grata', 'satisfação',
-            'prazer', 'entusiasmado', 'entusiasmada', 'confiante', 'tranquilo', 'tranquila'
-        ]
+    def _normalizar_texto(self, texto):
+        """Normaliza o texto para a chave do cache (Unicode NFC e espaços colapsados)"""
+        return ' '.join(unicodedata.normalize('NFC', texto).split())
+    
+    def _chave_bert(self, texto):
+        """Chave do cache para a polaridade BERT: texto normalizado + versão do modelo/backend"""
+        backend = 'onnx' if self.onnx_backend else 'torch'
+        return chave_hash('bert', self._normalizar_texto(texto), self.model_name, Config.MODELO_REVISAO, backend)
+    
+    def _analisar_com_bert_lote(self, textos, batch_size=None):
+        """
+        Análise de sentimento em lote usando o modelo BERT, com cache de resultados
         
-        # Palavras negativas
-        palavras_negativas = [
-            'mal', 'ruim', 'péssimo', 'terrível', 'triste', 'infeliz', 'insatisfeito',
-            'insatisfeita', 'deprimido', 'deprimida', 'ansioso', 'ansiosa', 'estressado',
-            'estressada', 'cansado', 'cansada', 'desmotivado', 'desmotivada', 'preocupado',
-            'preocupada', 'angustiado', 'angustiada', 'frustrado', 'frustrada', 'irritado',
-            'irritada', 'nervoso', 'nervosa', 'medo', 'medo', 'pânico', 'desesperado'
-        ]
+        Apenas os textos que não estão no cache são enviados ao modelo.
+        
+        Args:
+            textos (list): Lista de textos a serem analisados
+            batch_size (int): Tamanho de cada lote (default: Config.SENTIMENTO_BATCH_SIZE)
+        
+        Returns:
+            list: Polaridade (-1 a 1) de cada texto, ou None quando o BERT não conseguiu analisar
+        """
+        if not self.cache or not self.modelo_carregado:
+            return self._executar_bert_lote(textos, batch_size)
         
-        # Contar ocorrências
-        count_positivo = sum(1 for palavra in palavras_positivas if palavra in texto_lower)
-        count_negativo = sum(1 for palavra in palavras_negativas if palavra in texto_lower)
+        polaridades = [None] * len(textos)
+        pendentes = []
+        for i, texto in enumerate(textos):
+            if not texto:
+                continue
+            chave = self._chave_bert(texto)
+            polaridade = self.cache.obter(chave)
+            if polaridade is None:
+                pendentes.append((i, chave))
+            else:
+                polaridades[i] = polaridade
+        
+        if pendentes:
+            calculadas = self._executar_bert_lote([textos[i] for i, _ in pendentes], batch_size)
+            for (i, chave), polaridade in zip(pendentes, calculadas):
+                polaridades[i] = polaridade
+                if polaridade is not None:
+                    self.cache.definir(chave, polaridade, tamanho=64)
+        
+        return polaridades
+    
+    def _analisar_com_gpt(self, texto):
+        """
+        Análise avançada com GPT, com cache por texto normalizado + modelo GPT
+        Evita repetir a chamada à OpenAI para comentários idênticos
+        """
+        if not self.cache:
+            return gpt_service.analisar_sentimento_avancado(texto)
+        
+        chave = chave_hash('gpt', self._normalizar_texto(texto), gpt_service.model, gpt_service.temperature)
+        analise_gpt = self.cache.obter(chave)
+        if analise_gpt is not None:
+            return analise_gpt
+        
+        analise_gpt = gpt_service.analisar_sentimento_avancado(texto)
+        if analise_gpt:
+            self.cache.definir(chave, analise_gpt)
+        return analise_gpt
+    
+    def _analisar_com_bert(self, texto):
+        """
+        Análise de sentimento usando modelo BERT de Deep Learning
+        Retorna score de sentimento baseado no modelo pré-treinado
+        """
+        if not self.modelo_carregado or not texto:
+            return None
+        
+        chave = self._chave_bert(texto) if self.cache else None
+        if chave:
+            polaridade = self.cache.obter(chave)
+            if polaridade is not None:
+                return polaridade
+        
+        # Com micro-batching, o texto entra no próximo lote junto com as requisições concorrentes
+        if self.scheduler:
+            try:
+                polaridade = self.scheduler.submeter(texto, timeout=Config.MICROBATCH_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro no micro-batching do BERT: {e}")
+                return None
+        else:
+            polaridade = self._executar_bert_lote([texto], batch_size=1)[0]
+        
+        if chave and polaridade is not None:
+            self.cache.definir(chave, polaridade, tamanho=64)
+        return polaridade
+    
+    def _analisar_portugues_basico(self, texto):
+        """
+        Análise básica de sentimento em português usando palavras-chave (fallback)
+        Usa o léxico ponderado compilado (uma única passada sobre o texto, com negação)
+        """
+        soma_positiva, soma_negativa, total_palavras = self.lexico.pontuar(texto)
         
-        # Calcular score
-        total_palavras = len(texto.split())
         if total_palavras == 0:
             return 0.0
         
         # Score baseado na diferença entre positivo e negativo
-        score = (count_positivo - count_negativo) / max(total_palavras, 1) * 2
+        score = (soma_positiva - soma_negativa) / max(total_palavras, 1) * 2
         score = max(-1.0, min(1.0, score))  # Limitar entre -1 e 1
         
         return score
     
+    def _resultado_vazio(self):
+        """Resultado padrão para textos vazios ou muito curtos"""
+        return {
+            'sentimento': 'neutro',
+            'score': 0.0,
+            'confianca': 0.0,
+            'metodo': 'vazio'
+        }
+    
+    def _texto_valido(self, texto):
+        """Verifica se o texto tem conteúdo suficiente para análise"""
+        return bool(texto) and len(texto.strip()) >= 3
+    
     def analisar_texto(self, texto, usar_gpt=True):
         """
         Análise de sentimento híbrida usando Deep Learning (BERT) + GPT (se disponível)
@@ -311,33 +776,74 @@ class SentimentAnalyzer:
         Args:
             texto (str): Texto a ser analisado
             usar_gpt (bool): Se deve usar GPT para análise avançada
-            
+        
         Returns:
             dict: Análise completa com sentimento, score e insights
         """
-        if not texto or len(texto.strip()) < 3:
-            return {
-                'sentimento': 'neutro',
-                'score': 0.0,
-                'confianca': 0.0,
-                'metodo': 'vazio'
-            }
+        if not self._texto_valido(texto):
+            return self._resultado_vazio()
+        
+        # 🧠 PRIORIDADE 1: Análise com Deep Learning (BERT)
+        polaridade_bert = None
+        if self.modelo_carregado:
+            logger.info("🧠 Usando modelo BERT (Deep Learning) para análise...")
+            polaridade_bert = self._analisar_com_bert(texto)
         
+        return self._montar_resultado(texto, polaridade_bert, usar_gpt)
+    
+    def analisar_lote(self, textos, usar_gpt=False, batch_size=None):
+        """
+        Análise de sentimento em lote (vários textos em uma única chamada ao modelo)
+        
+        Os textos são enviados ao BERT em lotes com padding dinâmico e agrupados
+        por tamanho, o que aproveita muito melhor a CPU do que chamar
+        analisar_texto() para cada comentário.
+        
+        Args:
+            textos (list): Lista de textos a serem analisados
+            usar_gpt (bool): Se deve usar GPT para análise avançada (uma chamada por texto)
+            batch_size (int): Tamanho de cada lote (default: Config.SENTIMENTO_BATCH_SIZE)
+        
+        Returns:
+            list: Um dict por texto, no mesmo formato de analisar_texto() e na mesma ordem
+        """
+        textos = list(textos)
+        indices = [i for i, texto in enumerate(textos) if self._texto_valido(texto)]
+        
+        polaridades_bert = [None] * len(indices)
+        if self.modelo_carregado and indices:
+            logger.info(f"🧠 Usando modelo BERT (Deep Learning) para análise em lote de {len(indices)} textos...")
+            polaridades_bert = self._analisar_com_bert_lote([textos[i] for i in indices], batch_size)
+        
+        resultados = [self._resultado_vazio() for _ in textos]
+        for i, polaridade_bert in zip(indices, polaridades_bert):
+            resultados[i] = self._montar_resultado(textos[i], polaridade_bert, usar_gpt)
+        
+        return resultados
+    
+    def _montar_resultado(self, texto, polaridade_bert, usar_gpt):
+        """
+        Monta o resultado final a partir da polaridade do BERT (ou do fallback básico)
+        e, opcionalmente, da análise avançada com GPT
+        
+        Args:
+            texto (str): Texto analisado
+            polaridade_bert (float): Polaridade calculada pelo BERT, ou None se indisponível
+            usar_gpt (bool): Se deve usar GPT para análise avançada
+        
+        Returns:
+            dict: Análise completa com sentimento, score e insights
+        """
         try:
             polaridade = None
             metodo_usado = 'basico'
             confianca_base = 0.5
             
-            # 🧠 PRIORIDADE 1: Análise com Deep Learning (BERT)
-            if self.modelo_carregado:
-                logger.info("🧠 Usando modelo BERT (Deep Learning) para análise...")
-                polaridade_bert = self._analisar_com_bert(texto)
-                
-                if polaridade_bert is not None:
-                    polaridade = polaridade_bert
-                    metodo_usado = 'deep_learning_bert'
-                    confianca_base = 0.85  # Alta confiança no modelo BERT
-                    logger.info(f"✅ Análise BERT concluída: polaridade={polaridade:.3f}")
+            if polaridade_bert is not None:
+                polaridade = polaridade_bert
+                metodo_usado = 'deep_learning_bert'
+                confianca_base = 0.85  # Alta confiança no modelo BERT
+                logger.info(f"✅ Análise BERT concluída: polaridade={polaridade:.3f}")
             
             # 🔄 FALLBACK: Se BERT não funcionou, usar análise básica
             if polaridade is None:
@@ -383,7 +889,7 @@ class SentimentAnalyzer:
             # 🚀 PRIORIDADE 2: Análise avançada com GPT (se disponível e solicitado)
             if usar_gpt and gpt_service.verificar_disponibilidade():
                 logger.info("🤖 Combinando com GPT para análise avançada...")
-                analise_gpt = gpt_service.analisar_sentimento_avancado(texto)
+                analise_gpt = self._analisar_com_gpt(texto)
                 
                 if analise_gpt:
                     resultado['gpt_analise'] = analise_gpt
@@ -411,7 +917,7 @@ class SentimentAnalyzer:
             
             logger.info(f"📊 Sentimento analisado: {sentimento} (score: {resultado['score']}, método: {resultado['metodo']}, DL: {self.modelo_carregado})")
             return resultado
-            
+        
         except Exception as e:
             logger.error(f"❌ Erro na análise de sentimento: {e}")
             import traceback
@@ -434,7 +940,7 @@ class SentimentAnalyzer:
             ansiedade (int): 1-10
             motivacao (int): 1-10
             comentario_sentimento (dict): Resultado da análise de sentimento do comentário (opcional)
-            
+        
         Returns:
             dict: Análise e classificação do estado emocional
         """
@@ -491,17 +997,17 @@ class SentimentAnalyzer:
             problemas.append('Estresse muito elevado')
         elif estresse >= 6:
             problemas.append('Estresse moderado')
-            
+        
         if felicidade <= 2:
             problemas.append('Felicidade muito baixa')
         elif felicidade <= 4:
             problemas.append('Felicidade baixa')
-            
+        
         if ansiedade >= 8:
             problemas.append('Ansiedade muito alta')
         elif ansiedade >= 6:
             problemas.append('Ansiedade moderada')
-            
+        
         if motivacao <= 2:
             problemas.append('Motivação muito baixa')
         elif motivacao <= 4:
@@ -545,5 +1051,5 @@ class SentimentAnalyzer:
 
 
 # Instância global
-analyzer = SentimentAnalyzer()
+analyzer = SentimentAnalyzer(carregar_em_background=Config.MODELO_CARREGAMENTO_BACKGROUND)
 
@@ -2,15 +2,26 @@
 Work Well - Backend Flask
 Sistema de Análise Emocional Corporativa com Deep Learning
 """
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template, send_from_directory, url_for, Response, stream_with_context
 from flask_cors import CORS
 from config import Config
+from ai.heatmap_generator import heatmap_gen
+
+# Pool de renderização dos gráficos (processos separados; o pyplot não é thread-safe).
+# Criado antes dos imports abaixo: o fork tem que acontecer antes de qualquer
+# thread (carregamento do BERT em background, pool Oracle, compactador, varredura)
+if Config.RENDER_WORKERS:
+    heatmap_gen.iniciar_pool(Config.RENDER_WORKERS if Config.RENDER_WORKERS > 0 else None)
+
 from database.db_connection import db
+from database.cache_agregados import cache_agregados
 from ai.sentiment_analyzer import analyzer
-from ai.heatmap_generator import heatmap_gen
 from ai.gpt_service import gpt_service
+from ai.enriquecimento import enriquecedor
 import logging
 import traceback
+import csv
+import io
 
 # Configuração de logging
 logging.basicConfig(
@@ -27,6 +38,12 @@ CORS(app)
 # Conectar ao banco de dados ao iniciar
 try:
     db.connect()
+    if Config.RESUMO_DIARIO_ATIVO:
+        db.iniciar_compactador()
+    # Sem enriquecimento assíncrono não há fila para recuperar; a varredura
+    # começa então no primeiro registro com "assincrono": true
+    if Config.ENRIQUECIMENTO_ASSINCRONO:
+        enriquecedor.iniciar_varredura()
     logger.info("🚀 Work Well iniciado com sucesso!")
 except Exception as e:
     logger.error(f"❌ Erro ao conectar ao banco: {e}")
@@ -40,17 +57,57 @@ def index():
     return render_template('index.html')
 
 
+def _status_modelo():
+    """Traduz o estado de carregamento do modelo para o health check"""
+    if analyzer.estado_modelo == 'pronto':
+        return 'loaded'
+    if analyzer.estado_modelo == 'fallback':
+        return 'error'
+    return 'loading'
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Verifica saúde da aplicação"""
     return jsonify({
         'status': 'online',
-        'database': 'connected' if db.connection else 'disconnected',
-        'ai_model': 'loaded' if analyzer.modelo_carregado else 'error',
-        'gpt_service': 'available' if gpt_service.verificar_disponibilidade() else 'unavailable'
+        'live': True,
+        'ready': analyzer.esta_pronto(),
+        'database': 'connected' if db.esta_conectado() else 'disconnected',
+        'pool_oracle': db.estatisticas_pool(),
+        'consultas': db.estatisticas_consultas(),
+        'enriquecimento': enriquecedor.estatisticas(),
+        'ai_model': _status_modelo(),
+        'ai_model_state': analyzer.estado_modelo,
+        'gpt_service': 'available' if gpt_service.verificar_disponibilidade() else 'unavailable',
+        'cache_sentimento': analyzer.cache.estatisticas() if analyzer.cache else None,
+        'cache_agregados': cache_agregados.estatisticas(),
+        'cache_imagens': heatmap_gen.estatisticas_cache(),
+        'pool_inferencia': analyzer.pool.estatisticas() if analyzer.pool else None
     })
 
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness: o processo está de pé e respondendo"""
+    return jsonify({'live': True})
+
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness: o modelo terminou de carregar e aquecer
+    Retorna 503 enquanto o modelo estiver carregando ou se o carregamento
+    falhou (análise básica em uso)
+    """
+    pronto = analyzer.esta_pronto()
+    return jsonify({
+        'ready': pronto,
+        'ai_model': _status_modelo(),
+        'ai_model_state': analyzer.estado_modelo
+    }), (200 if pronto else 503)
+
+
 @app.route('/api/setores/<int:empresa_id>', methods=['GET'])
 def listar_setores(empresa_id):
     """Lista todos os setores de uma empresa"""
@@ -68,6 +125,44 @@ def listar_setores(empresa_id):
         }), 500
 
 
+CAMPOS_OBRIGATORIOS_REGISTRO = ['colaborador_id', 'setor_id', 'nivel_estresse', 'nivel_felicidade']
+VALORES_ANONIMO = ('S', 'N')  # CHECK da coluna ANONIMO
+
+
+def _validar_registro(data):
+    """Retorna a mensagem de erro do registro, ou None se estiver válido"""
+    if not isinstance(data, dict):
+        return 'Registro deve ser um objeto JSON'
+    for field in CAMPOS_OBRIGATORIOS_REGISTRO:
+        if field not in data:
+            return f'Campo obrigatório: {field}'
+    if data.get('anonimo', 'N') not in VALORES_ANONIMO:
+        return 'Campo "anonimo" deve ser "S" ou "N"'
+    return None
+
+
+def _limpar_comentario(data):
+    """Remove espaços e limita o comentário a 1000 caracteres (VARCHAR2(1000) no banco)"""
+    comentario = data.get('comentario', '').strip() if data.get('comentario') else ''
+    return comentario[:1000]
+
+
+def _ler_booleano(valor, padrao):
+    """
+    Lê uma flag booleana do JSON
+    
+    Aceita true/false do JSON ou as strings "true"/"false" (como as flags de
+    Config); ausente ou null usa o padrão. Qualquer outro valor retorna None.
+    """
+    if valor is None:
+        return padrao
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str) and valor.strip().lower() in ('true', 'false'):
+        return valor.strip().lower() == 'true'
+    return None
+
+
 @app.route('/api/registro-emocional', methods=['POST'])
 def criar_registro_emocional():
     """
@@ -82,26 +177,34 @@ def criar_registro_emocional():
         "nivel_ansiedade": 4,
         "nivel_motivacao": 8,
         "comentario": "Me sinto bem hoje",
-        "anonimo": "N"
+        "anonimo": "N",
+        "assincrono": false
     }
+    
+    Com "assincrono": true (ou Config.ENRIQUECIMENTO_ASSINCRONO), o registro é
+    confirmado logo após o INSERT: a resposta traz só a análise numérica e a
+    URL de status, e o sentimento do comentário é calculado em background.
     """
     try:
         data = request.get_json()
         
         # Validar dados obrigatórios
-        required_fields = ['colaborador_id', 'setor_id', 'nivel_estresse', 'nivel_felicidade']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Campo obrigatório: {field}'
-                }), 400
+        erro = _validar_registro(data)
+        if erro:
+            return jsonify({
+                'success': False,
+                'error': erro
+            }), 400
+        
+        assincrono = _ler_booleano(data.get('assincrono'), Config.ENRIQUECIMENTO_ASSINCRONO)
+        if assincrono is None:
+            return jsonify({
+                'success': False,
+                'error': 'Campo "assincrono" deve ser true ou false'
+            }), 400
         
         # Limpar e validar comentário
-        comentario = data.get('comentario', '').strip() if data.get('comentario') else ''
-        # Limitar tamanho do comentário (VARCHAR2(1000) no banco)
-        if len(comentario) > 1000:
-            comentario = comentario[:1000]
+        comentario = _limpar_comentario(data)
         
         # Inserir no banco
         registro_id = db.insert_registro_emocional(
@@ -117,7 +220,10 @@ def criar_registro_emocional():
         
         # Análise de sentimento (se houver comentário)
         analise_sentimento = None
-        if comentario:
+        if comentario and assincrono:
+            enriquecedor.enfileirar(registro_id, comentario)
+            enriquecedor.iniciar_varredura()
+        elif comentario:
             try:
                 resultado_sentimento = analyzer.analisar_texto(comentario)
                 if resultado_sentimento and resultado_sentimento.get('sentimento') != 'erro':
@@ -145,6 +251,17 @@ def criar_registro_emocional():
         
         logger.info(f"✅ Registro {registro_id} criado com sucesso")
         
+        if comentario and assincrono:
+            return jsonify({
+                'success': True,
+                'registro_id': registro_id,
+                'analise_sentimento': None,
+                'status_sentimento': 'pendente',
+                'status_url': url_for('status_sentimento_registro', registro_id=registro_id),
+                'analise_numerica': analise_numerica,
+                'mensagem': 'Registro criado com sucesso! Análise do comentário em andamento.'
+            }), 202
+        
         return jsonify({
             'success': True,
             'registro_id': registro_id,
@@ -152,7 +269,7 @@ def criar_registro_emocional():
             'analise_numerica': analise_numerica,
             'mensagem': 'Registro criado com sucesso!'
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro ao criar registro: {e}\n{traceback.format_exc()}")
         return jsonify({
@@ -161,6 +278,150 @@ def criar_registro_emocional():
         }), 500
 
 
+@app.route('/api/registro-emocional/<int:registro_id>/sentimento', methods=['GET'])
+def status_sentimento_registro(registro_id):
+    """Status da análise de sentimento de um registro criado em modo assíncrono"""
+    try:
+        status = enriquecedor.obter_status(registro_id)
+        if status is None:
+            return jsonify({
+                'success': False,
+                'error': 'Registro não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'registro_id': registro_id,
+            **status
+        })
+    except Exception as e:
+        logger.error(f"Erro ao consultar status do sentimento: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/registros-emocionais/lote', methods=['POST'])
+def criar_registros_emocionais_lote():
+    """
+    Cria vários registros emocionais de uma vez (quiosques, importações do RH)
+    
+    Todos os registros são validados antes; os comentários passam por uma
+    única análise de sentimento em lote e a inserção é feita com array DML
+    em uma só transação (ou todos entram, ou nenhum).
+    
+    Body JSON:
+    {
+        "registros": [
+            {"colaborador_id": 1, "setor_id": 1, "nivel_estresse": 5, "nivel_felicidade": 7, ...},
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        registros = data.get('registros') if isinstance(data, dict) else data
+        
+        if not isinstance(registros, list) or not registros:
+            return jsonify({
+                'success': False,
+                'error': 'Envie uma lista não vazia em "registros"'
+            }), 400
+        
+        if len(registros) > Config.LOTE_MAX_REGISTROS:
+            return jsonify({
+                'success': False,
+                'error': f'Máximo de {Config.LOTE_MAX_REGISTROS} registros por lote'
+            }), 400
+        
+        # Validar todos antes de inserir qualquer um
+        erros = []
+        for indice, registro in enumerate(registros):
+            erro = _validar_registro(registro)
+            if erro:
+                erros.append({'indice': indice, 'error': erro})
+        if erros:
+            return jsonify({
+                'success': False,
+                'error': 'Registros inválidos',
+                'erros': erros
+            }), 400
+        
+        comentarios = [_limpar_comentario(registro) for registro in registros]
+        
+        # Análise de sentimento dos comentários em uma única chamada ao modelo
+        analises = [None] * len(registros)
+        indices_comentados = [i for i, comentario in enumerate(comentarios) if comentario]
+        if indices_comentados:
+            try:
+                resultados = analyzer.analisar_lote([comentarios[i] for i in indices_comentados], usar_gpt=False)
+                for i, resultado in zip(indices_comentados, resultados):
+                    if resultado and resultado.get('sentimento') != 'erro':
+                        analises[i] = resultado
+            except Exception as e:
+                logger.warning(f"⚠️ Erro na análise de sentimento em lote (continuando): {e}")
+        
+        registro_ids = db.insert_registros_emocionais_lote([{
+            'colaborador_id': registro['colaborador_id'],
+            'setor_id': registro['setor_id'],
+            'estresse': registro['nivel_estresse'],
+            'felicidade': registro['nivel_felicidade'],
+            'ansiedade': registro.get('nivel_ansiedade', 5),
+            'motivacao': registro.get('nivel_motivacao', 5),
+            'comentario': comentario,
+            'anonimo': registro.get('anonimo', 'N'),
+            'sentimento': analise['sentimento'] if analise else None,
+            'score': analise['score'] if analise else None
+        } for registro, comentario, analise in zip(registros, comentarios, analises)])
+        
+        logger.info(f"✅ {len(registro_ids)} registros criados em lote")
+        
+        return jsonify({
+            'success': True,
+            'total': len(registro_ids),
+            'registro_ids': registro_ids,
+            'registros': [{
+                'registro_id': registro_id,
+                'sentimento': analise['sentimento'] if analise else None,
+                'score': analise['score'] if analise else None
+            } for registro_id, analise in zip(registro_ids, analises)],
+            'mensagem': f'{len(registro_ids)} registros criados com sucesso!'
+        })
+    
+    except Exception as e:
+        logger.error(f"❌ Erro ao criar registros em lote: {e}\n{traceback.format_exc()}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+FORMATOS_GRAFICOS = ('imagem', 'dados', 'url')
+
+
+def _formato_graficos():
+    """Lê o query param `formato` dos endpoints de gráficos (None se inválido)"""
+    formato = request.args.get('formato', 'imagem')
+    return formato if formato in FORMATOS_GRAFICOS else None
+
+
+def _erro_formato_graficos():
+    return jsonify({
+        'success': False,
+        'error': f"Formato inválido. Use: {', '.join(FORMATOS_GRAFICOS)}"
+    }), 400
+
+
+def _url_grafico(empresa_id, nome, dias, dados_setores):
+    """URL da imagem binária do gráfico, versionada pelo conteúdo (parâmetro v)"""
+    tipo, metrica = heatmap_gen.GRAFICOS[nome]
+    return url_for(
+        'obter_grafico', empresa_id=empresa_id, nome=nome, dias=dias,
+        v=heatmap_gen.versao_grafico(tipo, dados_setores, metrica)
+    )
+
+
 @app.route('/api/mapa-calor/<int:empresa_id>', methods=['GET'])
 def gerar_mapa_calor(empresa_id):
     """
@@ -169,10 +430,38 @@ def gerar_mapa_calor(empresa_id):
     Query params:
     - dias: número de dias para análise (default: 30)
     - metrica: estresse|felicidade|ansiedade|motivacao (default: estresse)
+    - formato: imagem (PNG em base64) | dados (spec JSON para o frontend desenhar)
+      | url (endereço da imagem em /api/graficos) (default: imagem)
     """
     try:
         dias = request.args.get('dias', 30, type=int)
         metrica = request.args.get('metrica', 'estresse')
+        formato = _formato_graficos()
+        if formato is None:
+            return _erro_formato_graficos()
+        
+        if formato == 'url':
+            # As imagens de /api/graficos são desenhadas com os dados do dashboard
+            nome = f'mapa_{metrica}'
+            if nome not in heatmap_gen.GRAFICOS:
+                return jsonify({
+                    'success': False,
+                    'error': 'Métrica inválida. Use: estresse, felicidade, ansiedade, motivacao'
+                }), 400
+            
+            dados_setores = db.obter_dashboard(empresa_id, dias)['setores']
+            if not dados_setores:
+                return jsonify({
+                    'success': False,
+                    'error': 'Nenhum dado encontrado para gerar mapa de calor'
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'mapa_url': _url_grafico(empresa_id, nome, dias, dados_setores),
+                'total_setores': len(dados_setores),
+                'periodo_dias': dias
+            })
         
         # Obter dados do banco
         dados = db.obter_dados_mapa_calor(empresa_id, dias)
@@ -183,6 +472,14 @@ def gerar_mapa_calor(empresa_id):
                 'error': 'Nenhum dado encontrado para gerar mapa de calor'
             }), 404
         
+        if formato == 'dados':
+            return jsonify({
+                'success': True,
+                'grafico': heatmap_gen.especificacao_mapa_calor(dados, metrica),
+                'total_setores': len(dados),
+                'periodo_dias': dias
+            })
+        
         # Gerar mapa de calor
         imagem_base64 = heatmap_gen.gerar_mapa_calor_setores(dados, metrica)
         
@@ -198,7 +495,7 @@ def gerar_mapa_calor(empresa_id):
             'total_setores': len(dados),
             'periodo_dias': dias
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro ao gerar mapa de calor: {e}\n{traceback.format_exc()}")
         return jsonify({
@@ -207,27 +504,64 @@ def gerar_mapa_calor(empresa_id):
         }), 500
 
 
+def _formatar_estatisticas(resultado):
+    """Converte os totais da empresa (colunas do banco) no formato da API"""
+    estatisticas = {
+        'total_colaboradores': resultado.get('TOTAL_COLABORADORES', 0),
+        'total_registros': resultado.get('TOTAL_REGISTROS', 0),
+        'media_estresse': float(resultado.get('MEDIA_ESTRESSE', 0) or 0),
+        'media_felicidade': float(resultado.get('MEDIA_FELICIDADE', 0) or 0),
+        'media_ansiedade': float(resultado.get('MEDIA_ANSIEDADE', 0) or 0),
+        'media_motivacao': float(resultado.get('MEDIA_MOTIVACAO', 0) or 0)
+    }
+    if 'CASOS_ESTRESSE_ALTO' in resultado:
+        estatisticas['casos_estresse_alto'] = resultado['CASOS_ESTRESSE_ALTO'] or 0
+        estatisticas['casos_felicidade_baixa'] = resultado['CASOS_FELICIDADE_BAIXA'] or 0
+        estatisticas['ultimo_registro'] = resultado['ULTIMO_REGISTRO']
+    return estatisticas
+
+
 @app.route('/api/dashboard/<int:empresa_id>', methods=['GET'])
 def obter_dashboard(empresa_id):
-    """Retorna dados completos do dashboard"""
+    """
+    Retorna dados completos do dashboard (setores e totais da empresa em uma consulta)
+    
+    Query params:
+    - dias: número de dias para análise (default: 30)
+    - formato: imagem (visualizacoes em base64) | dados (graficos como spec JSON)
+      | url (visualizacoes como endereços das imagens em /api/graficos) (default: imagem)
+    """
     try:
         dias = request.args.get('dias', 30, type=int)
+        formato = _formato_graficos()
+        if formato is None:
+            return _erro_formato_graficos()
         
         # Obter dados
-        dados_setores = db.obter_dados_mapa_calor(empresa_id, dias)
-        dashboard_rh = db.obter_dashboard_rh(empresa_id)
-        
-        # Gerar visualizações
-        visualizacoes = heatmap_gen.gerar_dashboard_completo(dados_setores)
+        painel = db.obter_dashboard(empresa_id, dias)
+        dados_setores = painel['setores']
         
-        return jsonify({
+        resposta = {
             'success': True,
             'dados_setores': dados_setores,
-            'dashboard_rh': dashboard_rh,
-            'visualizacoes': visualizacoes,
+            'dashboard_rh': dados_setores,
+            'estatisticas': _formatar_estatisticas(painel['empresa'] or {}),
             'periodo_dias': dias
-        })
+        }
+        
+        # Gerar visualizações
+        if formato == 'dados':
+            resposta['graficos'] = heatmap_gen.especificacoes_dashboard(dados_setores)
+        elif formato == 'url':
+            resposta['visualizacoes'] = {
+                nome: _url_grafico(empresa_id, nome, dias, dados_setores) if dados_setores else None
+                for nome in heatmap_gen.GRAFICOS_DASHBOARD
+            }
+        else:
+            resposta['visualizacoes'] = heatmap_gen.gerar_dashboard_completo(dados_setores)
         
+        return jsonify(resposta)
+    
     except Exception as e:
         logger.error(f"❌ Erro ao obter dashboard: {e}\n{traceback.format_exc()}")
         return jsonify({
@@ -236,6 +570,65 @@ def obter_dashboard(empresa_id):
         }), 500
 
 
+@app.route('/api/graficos/<int:empresa_id>/<nome>.png', methods=['GET'])
+def obter_grafico(empresa_id, nome):
+    """
+    Retorna um gráfico como imagem PNG binária (sem base64 nem JSON)
+    
+    A ETag é o hash dos dados do gráfico: se o navegador já tem a versão atual
+    (If-None-Match), a resposta é 304 sem corpo e sem desenhar nada.
+    
+    Query params:
+    - dias: número de dias para análise (default: 30)
+    - v: versão do gráfico (incluída nas URLs de formato=url); quando é a atual,
+      a imagem fica no cache do navegador sem revalidação
+    """
+    try:
+        if nome not in heatmap_gen.GRAFICOS:
+            return jsonify({
+                'success': False,
+                'error': f"Gráfico inválido. Use: {', '.join(heatmap_gen.GRAFICOS)}"
+            }), 404
+        
+        dias = request.args.get('dias', 30, type=int)
+        dados_setores = db.obter_dashboard(empresa_id, dias)['setores']
+        
+        if not dados_setores:
+            return jsonify({
+                'success': False,
+                'error': 'Nenhum dado encontrado para gerar o gráfico'
+            }), 404
+        
+        tipo, metrica = heatmap_gen.GRAFICOS[nome]
+        versao = heatmap_gen.versao_grafico(tipo, dados_setores, metrica)
+        
+        if request.if_none_match.contains(versao):
+            resposta = Response(status=304)
+        else:
+            png = heatmap_gen.obter_png(tipo, dados_setores, metrica)
+            if not png:
+                return jsonify({
+                    'success': False,
+                    'error': 'Erro ao gerar imagem do gráfico'
+                }), 500
+            resposta = Response(png, mimetype='image/png')
+        
+        resposta.set_etag(versao)
+        if request.args.get('v') == versao:
+            # URL versionada: o conteúdo nunca muda para esta URL
+            resposta.headers['Cache-Control'] = f'private, max-age={Config.GRAFICOS_CACHE_MAX_AGE}, immutable'
+        else:
+            resposta.headers['Cache-Control'] = 'private, no-cache'
+        return resposta
+    
+    except Exception as e:
+        logger.error(f"❌ Erro ao gerar gráfico: {e}\n{traceback.format_exc()}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/analisar-sentimento', methods=['POST'])
 def analisar_sentimento():
     """Analisa sentimento de um texto (com GPT se disponível)"""
@@ -256,7 +649,7 @@ def analisar_sentimento():
             'success': True,
             'resultado': resultado
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro ao analisar sentimento: {e}")
         return jsonify({
@@ -306,7 +699,7 @@ def gerar_recomendacoes_ia():
             'success': True,
             'recomendacoes': recomendacoes
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro ao gerar recomendações IA: {e}\n{traceback.format_exc()}")
         return jsonify({
@@ -351,7 +744,7 @@ def gerar_relatorio_ia(empresa_id):
             'dados_base': dados_setores,
             'periodo_dias': dias
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro ao gerar relatório IA: {e}\n{traceback.format_exc()}")
         return jsonify({
@@ -394,7 +787,7 @@ def chat_coach_virtual():
             'success': True,
             'resposta': resposta
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro no coach virtual: {e}")
         return jsonify({
@@ -403,6 +796,42 @@ def chat_coach_virtual():
         }), 500
 
 
+@app.route('/api/exportar-registros/<int:empresa_id>', methods=['GET'])
+def exportar_registros(empresa_id):
+    """
+    Exporta os registros emocionais da empresa em CSV (streaming)
+    
+    As linhas saem do banco em blocos e são enviadas conforme chegam,
+    sem montar o resultado inteiro em memória.
+    
+    Query params:
+    - dias: limitar aos últimos N dias (default: todo o histórico)
+    """
+    dias = request.args.get('dias', None, type=int)
+    colunas = ['ID', 'DATA_REGISTRO', 'SETOR', 'NIVEL_ESTRESSE', 'NIVEL_FELICIDADE',
+               'NIVEL_ANSIEDADE', 'NIVEL_MOTIVACAO', 'SENTIMENTO_TEXTO', 'SCORE_SENTIMENTO']
+    
+    def gerar_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(colunas)
+        
+        for i, linha in enumerate(db.iterar_registros_emocionais(empresa_id, dias), 1):
+            writer.writerow(linha)
+            if i % Config.ORACLE_ARRAYSIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue()
+    
+    return Response(
+        stream_with_context(gerar_csv()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=registros_empresa_{empresa_id}.csv'}
+    )
+
+
 @app.route('/api/estatisticas/<int:empresa_id>', methods=['GET'])
 def obter_estatisticas(empresa_id):
     """Retorna estatísticas gerais da empresa"""
@@ -418,16 +847,9 @@ def obter_estatisticas(empresa_id):
         
         return jsonify({
             'success': True,
-            'estatisticas': {
-                'total_colaboradores': resultado.get('TOTAL_COLABORADORES', 0),
-                'total_registros': resultado.get('TOTAL_REGISTROS', 0),
-                'media_estresse': float(resultado.get('MEDIA_ESTRESSE', 0) or 0),
-                'media_felicidade': float(resultado.get('MEDIA_FELICIDADE', 0) or 0),
-                'media_ansiedade': float(resultado.get('MEDIA_ANSIEDADE', 0) or 0),
-                'media_motivacao': float(resultado.get('MEDIA_MOTIVACAO', 0) or 0)
-            }
+            'estatisticas': _formatar_estatisticas(resultado)
         })
-        
+    
     except Exception as e:
         logger.error(f"❌ Erro ao obter estatísticas: {e}")
         return jsonify({
@@ -461,6 +883,10 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         logger.info("⏹️ Servidor interrompido pelo usuário")
     finally:
+        if analyzer.pool:
+            analyzer.pool.encerrar()
+        heatmap_gen.encerrar_pool()
+        enriquecedor.encerrar_varredura()
         db.disconnect()
         logger.info("👋 Work Well encerrado")
 
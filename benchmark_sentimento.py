@@ -0,0 +1,265 @@
+"""
+Benchmark de análise de sentimento: vazão, latência, memória e acurácia
+Executa cada estratégia do SentimentAnalyzer sobre o corpus rotulado em
+benchmark/corpus_sentimento.csv e salva os resultados em JSON
+
+Execute: python benchmark_sentimento.py
+         python benchmark_sentimento.py --backends pipeline,basico --batch-sizes 1,8,32
+         python benchmark_sentimento.py --comparar benchmark_anterior.json
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import logging
+from datetime import datetime
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')  # Reduzir logs
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark', 'corpus_sentimento.csv')
+ARQUIVO_SAIDA = 'benchmark_sentimento.json'
+
+# Estratégias de carregamento (Config.MODELO_ESTRATEGIA); 'basico' é o fallback por palavras-chave
+BACKENDS = ['pipeline', 'classificacao', 'embeddings', 'basico']
+BATCH_SIZES = [1, 8, 32]
+REPETICOES = 3
+CLASSES = ['positivo', 'negativo', 'neutro']
+
+
+def print_header(text):
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+
+def carregar_corpus(caminho=CORPUS):
+    """Lê o corpus rotulado (colunas: texto, sentimento)"""
+    with open(caminho, encoding='utf-8', newline='') as f:
+        linhas = list(csv.DictReader(f))
+    return [linha['texto'] for linha in linhas], [linha['sentimento'] for linha in linhas]
+
+
+def percentil(valores, p):
+    """Percentil pelo método nearest-rank"""
+    ordenados = sorted(valores)
+    indice = max(int(round(p / 100 * len(ordenados) + 0.5)) - 1, 0)
+    return ordenados[min(indice, len(ordenados) - 1)]
+
+
+def pico_memoria_mb():
+    """Pico de memória residente (RSS) do processo atual, em MB"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def metricas_classificacao(esperados, previstos):
+    """Acurácia, F1 por classe e F1 macro"""
+    acertos = sum(1 for e, p in zip(esperados, previstos) if e == p)
+    f1_classes = {}
+    for classe in CLASSES:
+        vp = sum(1 for e, p in zip(esperados, previstos) if e == classe and p == classe)
+        fp = sum(1 for e, p in zip(esperados, previstos) if e != classe and p == classe)
+        fn = sum(1 for e, p in zip(esperados, previstos) if e == classe and p != classe)
+        precisao = vp / (vp + fp) if vp + fp else 0.0
+        revocacao = vp / (vp + fn) if vp + fn else 0.0
+        f1 = 2 * precisao * revocacao / (precisao + revocacao) if precisao + revocacao else 0.0
+        f1_classes[classe] = round(f1, 4)
+    
+    return {
+        'acuracia': round(acertos / len(esperados), 4) if esperados else 0.0,
+        'f1_macro': round(sum(f1_classes.values()) / len(CLASSES), 4),
+        'f1_por_classe': f1_classes
+    }
+
+
+def medir_backend(backend, batch_sizes, repeticoes):
+    """
+    Mede uma estratégia no processo atual
+    
+    Deve rodar em um processo próprio: o modelo é carregado na importação
+    do analisador e o pico de RSS só é significativo isolado.
+    
+    Returns:
+        dict: Resultados da estratégia
+    """
+    from config import Config
+    Config.MODELO_ESTRATEGIA = backend
+    Config.MODELO_CARREGAMENTO_BACKGROUND = False
+    Config.CACHE_SENTIMENTO_ATIVO = False  # Medir o modelo, não o cache
+    Config.MICROBATCH_ATIVO = False
+    Config.INFERENCIA_WORKERS = 0
+    
+    textos, esperados = carregar_corpus()
+    
+    inicio = time.perf_counter()
+    from ai.sentiment_analyzer import analyzer
+    tempo_carregamento = time.perf_counter() - inicio
+    
+    if backend != 'basico' and not analyzer.modelo_carregado:
+        return {'backend': backend, 'erro': 'modelo não carregou com esta estratégia'}
+    
+    resultado = {
+        'backend': backend,
+        'modelo': analyzer.model_name if backend != 'basico' else None,
+        'backend_inferencia': Config.SENTIMENTO_BACKEND if backend != 'basico' else None,
+        'carregamento_s': round(tempo_carregamento, 2),
+        'latencia': {}
+    }
+    
+    # Aquecimento fora da medição
+    analyzer.analisar_lote(textos[:4], usar_gpt=False)
+    
+    previstos = None
+    for batch_size in batch_sizes:
+        latencias = []
+        inicio_total = time.perf_counter()
+        for _ in range(repeticoes):
+            previstos_rodada = []
+            for i in range(0, len(textos), batch_size):
+                inicio = time.perf_counter()
+                parcial = analyzer.analisar_lote(textos[i:i + batch_size], usar_gpt=False, batch_size=batch_size)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                previstos_rodada.extend(r['sentimento'] for r in parcial)
+            previstos = previstos_rodada
+        duracao_total = time.perf_counter() - inicio_total
+        
+        resultado['latencia'][f'batch_{batch_size}'] = {
+            'comentarios_por_segundo': round(len(textos) * repeticoes / duracao_total, 1),
+            'p50_ms': round(percentil(latencias, 50), 2),
+            'p95_ms': round(percentil(latencias, 95), 2),
+            'p99_ms': round(percentil(latencias, 99), 2),
+            'lotes_medidos': len(latencias)
+        }
+    
+    resultado['qualidade'] = metricas_classificacao(esperados, previstos)
+    resultado['pico_rss_mb'] = pico_memoria_mb()
+    return resultado
+
+
+def executar_em_subprocesso(backend, batch_sizes, repeticoes):
+    """Roda medir_backend() em um processo filho e lê o resultado em JSON"""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
+        caminho = tmp.name
+    try:
+        comando = [
+            sys.executable, os.path.abspath(__file__),
+            '--backend', backend,
+            '--batch-sizes', ','.join(str(b) for b in batch_sizes),
+            '--repeticoes', str(repeticoes),
+            '--saida', caminho
+        ]
+        processo = subprocess.run(comando)
+        if processo.returncode != 0:
+            return {'backend': backend, 'erro': f'processo terminou com código {processo.returncode}'}
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(caminho)
+
+
+def commit_atual():
+    """Hash do commit atual (None fora de um repositório git)"""
+    try:
+        saida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+        return saida.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def exibir_resultados(relatorio, anterior=None):
+    """Imprime a tabela de resultados e, se houver, a variação em relação a outro relatório"""
+    anteriores = {r['backend']: r for r in (anterior or {}).get('backends', [])}
+    
+    for r in relatorio['backends']:
+        print(f"\n🧪 {r['backend']}")
+        if 'erro' in r:
+            print(f"   ❌ {r['erro']}")
+            continue
+        
+        base = anteriores.get(r['backend'], {})
+        q = r['qualidade']
+        print(f"   Acurácia: {q['acuracia']:.1%} | F1 macro: {q['f1_macro']:.3f} | "
+              f"Pico RSS: {r['pico_rss_mb']} MB | Carregamento: {r['carregamento_s']}s")
+        if 'qualidade' in base:
+            print(f"   Δ acurácia: {q['acuracia'] - base['qualidade']['acuracia']:+.1%} | "
+                  f"Δ F1 macro: {q['f1_macro'] - base['qualidade']['f1_macro']:+.3f}")
+        
+        for chave, lat in r['latencia'].items():
+            linha = (f"   {chave:>9}: {lat['comentarios_por_segundo']:>8} com/s | "
+                     f"p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms")
+            lat_base = base.get('latencia', {}).get(chave)
+            if lat_base and lat_base['comentarios_por_segundo']:
+                variacao = lat['comentarios_por_segundo'] / lat_base['comentarios_por_segundo'] - 1
+                linha += f" ({variacao:+.1%} vazão)"
+            print(linha)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de análise de sentimento - Work Well')
+    parser.add_argument('--backends', default=','.join(BACKENDS),
+                        help=f"Estratégias separadas por vírgula (default: {','.join(BACKENDS)})")
+    parser.add_argument('--batch-sizes', default=','.join(str(b) for b in BATCH_SIZES),
+                        help='Tamanhos de lote separados por vírgula')
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES,
+                        help='Quantas vezes o corpus é percorrido por tamanho de lote')
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA, help='Arquivo JSON de resultados')
+    parser.add_argument('--comparar', help='Relatório JSON anterior para comparação')
+    parser.add_argument('--backend', help=argparse.SUPPRESS)  # Uso interno: mede uma estratégia neste processo
+    args = parser.parse_args()
+    
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',') if b.strip()]
+    
+    if args.backend:
+        resultado = medir_backend(args.backend, batch_sizes, args.repeticoes)
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False)
+        return
+    
+    textos, esperados = carregar_corpus()
+    print_header("📏 BENCHMARK DE SENTIMENTO - Work Well")
+    print(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Corpus: {len(textos)} textos rotulados | Lotes: {batch_sizes} | Repetições: {args.repeticoes}")
+    
+    relatorio = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_atual(),
+        'corpus': {'arquivo': os.path.relpath(CORPUS), 'textos': len(textos),
+                   'por_classe': {c: esperados.count(c) for c in CLASSES}},
+        'batch_sizes': batch_sizes,
+        'repeticoes': args.repeticoes,
+        'backends': []
+    }
+    
+    backends = [b.strip() for b in args.backends.split(',') if b.strip()]
+    for i, backend in enumerate(backends, 1):
+        print(f"\n[{i}/{len(backends)}] Medindo '{backend}'...")
+        relatorio['backends'].append(executar_em_subprocesso(backend, batch_sizes, args.repeticoes))
+    
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+    
+    print_header("📊 RESULTADOS")
+    if anterior:
+        print(f"Comparando com: {args.comparar} (commit {anterior.get('commit')})")
+    exibir_resultados(relatorio, anterior)
+    
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados salvos em: {args.saida}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Work Well - Cache em memória com LRU, TTL e limite de memória
+Usado para resultados de análise de sentimento, agregados e imagens
+"""
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def chave_hash(*partes):
+    """Gera uma chave estável (sha256) a partir de qualquer combinação de valores serializáveis"""
+    conteudo = json.dumps(partes, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def estimar_tamanho(valor):
+    """Estimativa do tamanho em bytes de um valor armazenado no cache"""
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if isinstance(valor, str):
+        return len(valor.encode('utf-8'))
+    try:
+        return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class TTLCache:
+    """
+    Cache thread-safe com despejo LRU e expiração por tempo (TTL)
+    
+    Limitado tanto pelo número de entradas quanto pelo total de bytes;
+    mantém contadores de acertos/falhas para acompanhar a taxa de acerto.
+    """
+    
+    def __init__(self, max_entradas=10000, max_bytes=32 * 1024 * 1024, ttl_segundos=None, nome='cache'):
+        """
+        Args:
+            max_entradas (int): Número máximo de entradas
+            max_bytes (int): Tamanho máximo estimado do conteúdo, em bytes
+            ttl_segundos (float): Tempo de vida de cada entrada (None = sem expiração)
+            nome (str): Nome do cache (para métricas e logs)
+        """
+        self.max_entradas = max(int(max_entradas), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+        self.ttl = ttl_segundos if ttl_segundos and ttl_segundos > 0 else None
+        self.nome = nome
+        
+        self._dados = OrderedDict()  # chave -> (valor, tamanho, expira_em)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        
+        # Métricas
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+        self.expirados = 0
+    
+    def _remover(self, chave):
+        """Remove uma entrada (deve ser chamado com o lock adquirido)"""
+        _, tamanho, _ = self._dados.pop(chave)
+        self.total_bytes -= tamanho
+    
+    def obter(self, chave, padrao=None):
+        """
+        Retorna o valor armazenado ou `padrao` se não existir/estiver expirado
+        A entrada encontrada passa a ser a mais recentemente usada
+        """
+        with self._lock:
+            entrada = self._dados.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return padrao
+            
+            valor, _, expira_em = entrada
+            if expira_em is not None and expira_em <= time.monotonic():
+                self._remover(chave)
+                self.expirados += 1
+                self.falhas += 1
+                return padrao
+            
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+            return valor
+    
+    def definir(self, chave, valor, tamanho=None):
+        """
+        Armazena um valor, despejando as entradas menos usadas se necessário
+        
+        Args:
+            chave: Chave da entrada
+            valor: Valor a armazenar
+            tamanho (int): Tamanho em bytes (estimado automaticamente se omitido)
+        """
+        tamanho = estimar_tamanho(valor) if tamanho is None else tamanho
+        if tamanho > self.max_bytes:
+            # Maior que o cache inteiro: não vale a pena armazenar
+            return
+        
+        expira_em = time.monotonic() + self.ttl if self.ttl else None
+        
+        with self._lock:
+            if chave in self._dados:
+                self._remover(chave)
+            
+            self._dados[chave] = (valor, tamanho, expira_em)
+            self.total_bytes += tamanho
+            
+            while len(self._dados) > self.max_entradas or self.total_bytes > self.max_bytes:
+                chave_antiga = next(iter(self._dados))
+                self._remover(chave_antiga)
+                self.despejos += 1
+    
+    def invalidar(self, chave):
+        """Remove uma entrada específica"""
+        with self._lock:
+            if chave in self._dados:
+                self._remover(chave)
+    
+    def invalidar_se(self, predicado):
+        """
+        Remove todas as entradas cuja chave satisfaz o predicado
+        
+        Returns:
+            int: Quantidade de entradas removidas
+        """
+        with self._lock:
+            chaves = [chave for chave in self._dados if predicado(chave)]
+            for chave in chaves:
+                self._remover(chave)
+            return len(chaves)
+    
+    def limpar(self):
+        """Remove todas as entradas (mantém as métricas)"""
+        with self._lock:
+            self._dados.clear()
+            self.total_bytes = 0
+    
+    def __len__(self):
+        return len(self._dados)
+    
+    def estatisticas(self):
+        """Retorna métricas de uso do cache"""
+        total = self.acertos + self.falhas
+        return {
+            'nome': self.nome,
+            'entradas': len(self._dados),
+            'bytes': self.total_bytes,
+            'max_entradas': self.max_entradas,
+            'max_bytes': self.max_bytes,
+            'ttl_segundos': self.ttl,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': round(self.acertos / total, 4) if total else 0.0,
+            'despejos': self.despejos,
+            'expirados': self.expirados
+        }
@@ -0,0 +1,162 @@
+"""
+Relatório comparativo: PyTorch vs ONNX Runtime (int8) para o BERT
+Mede o desvio das polaridades (acurácia) e a latência de cada backend
+Execute: python comparar_onnx.py
+"""
+import sys
+import json
+import time
+import logging
+import statistics
+from datetime import datetime
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')  # Reduzir logs
+
+ARQUIVO_RELATORIO = 'relatorio_onnx.json'
+
+TEXTOS = [
+    "Estou me sentindo muito bem hoje! O trabalho está ótimo e estou feliz.",
+    "Hoje foi um dia excelente! Me sinto motivado e satisfeito com tudo.",
+    "Estou muito feliz e contente com minha equipe. Tudo está perfeito!",
+    "Estou muito estressado e cansado. O trabalho está me deixando ansioso.",
+    "Me sinto triste e desmotivado. As coisas não estão indo bem.",
+    "Estou frustrado e irritado com a situação. Não aguento mais isso.",
+    "O dia foi péssimo. Estou muito preocupado e angustiado.",
+    "Hoje foi um dia normal. Nada de especial aconteceu.",
+    "Estou indo trabalhar como sempre. Tudo está igual.",
+    "Não tenho muito a dizer. Está tudo como esperado.",
+    "Estou bem, mas poderia estar melhor. Algumas coisas estão boas, outras não.",
+    "Tudo bem.",
+    "Estou extremamente feliz e realizado! Este é o melhor dia da minha vida!",
+    "Estou completamente esgotado e deprimido. Não consigo mais continuar assim.",
+    "Cansado hoje, muitas reuniões seguidas.",
+    "A equipe entregou o projeto no prazo e todos comemoraram.",
+]
+
+REPETICOES = 5
+
+
+def classificar(polaridade):
+    """Mesmos limiares usados em SentimentAnalyzer"""
+    if polaridade is None:
+        return None
+    if polaridade > 0.15:
+        return 'positivo'
+    if polaridade < -0.15:
+        return 'negativo'
+    return 'neutro'
+
+
+def medir(analyzer, textos, batch_size):
+    """Executa o lote várias vezes e retorna (polaridades, latências em ms por lote)"""
+    latencias = []
+    polaridades = None
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        polaridades = analyzer._executar_bert_lote(textos, batch_size=batch_size)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return polaridades, latencias
+
+
+def resumo_latencia(latencias, total_textos):
+    return {
+        'mediana_ms': round(statistics.median(latencias), 2),
+        'min_ms': round(min(latencias), 2),
+        'textos_por_segundo': round(total_textos / (statistics.median(latencias) / 1000), 1)
+    }
+
+
+print("=" * 70)
+print("  ⚖️  PyTorch vs ONNX Runtime (int8) - Work Well")
+print("=" * 70)
+print(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+try:
+    from config import Config
+    Config.SENTIMENTO_BACKEND = 'torch'
+    Config.MICROBATCH_ATIVO = False
+    
+    from ai.sentiment_analyzer import SentimentAnalyzer
+    from ai.onnx_backend import ONNX_DISPONIVEL
+    
+    if not ONNX_DISPONIVEL:
+        print("\n❌ onnxruntime não está instalado (pip install onnxruntime)")
+        sys.exit(1)
+    
+    analyzer = SentimentAnalyzer(carregar_em_background=False)
+    if not analyzer.modelo_carregado:
+        print("\n❌ Modelo BERT não carregou; nada a comparar")
+        sys.exit(1)
+    
+    relatorio = {
+        'modelo': analyzer.model_name,
+        'revisao': Config.MODELO_REVISAO,
+        'total_textos': len(TEXTOS),
+        'repeticoes': REPETICOES,
+        'latencia': {}
+    }
+    
+    # PyTorch (referência)
+    print("\n[1/2] Medindo PyTorch...")
+    resultados_torch = {}
+    for batch_size in (1, len(TEXTOS)):
+        resultados_torch[batch_size] = medir(analyzer, TEXTOS, batch_size)
+    
+    # ONNX Runtime
+    print("[2/2] Exportando/quantizando e medindo ONNX Runtime...")
+    analyzer._ativar_onnx()
+    if not analyzer.onnx_backend:
+        print("\n❌ Não foi possível ativar o backend ONNX (veja os logs)")
+        sys.exit(1)
+    analyzer._executar_bert_lote(TEXTOS[:2])  # Aquecimento
+    
+    resultados_onnx = {}
+    for batch_size in (1, len(TEXTOS)):
+        resultados_onnx[batch_size] = medir(analyzer, TEXTOS, batch_size)
+    
+    # Desvio de acurácia (comparando com o lote completo)
+    pol_torch = resultados_torch[len(TEXTOS)][0]
+    pol_onnx = resultados_onnx[len(TEXTOS)][0]
+    pares = [(t, o) for t, o in zip(pol_torch, pol_onnx) if t is not None and o is not None]
+    desvios = [abs(t - o) for t, o in pares]
+    concordancia = sum(1 for t, o in pares if classificar(t) == classificar(o))
+    
+    relatorio['desvio'] = {
+        'medio': round(statistics.mean(desvios), 4) if desvios else None,
+        'maximo': round(max(desvios), 4) if desvios else None,
+        'concordancia_sentimento': round(concordancia / len(pares), 4) if pares else None
+    }
+    
+    for batch_size in (1, len(TEXTOS)):
+        torch_lat = resumo_latencia(resultados_torch[batch_size][1], len(TEXTOS))
+        onnx_lat = resumo_latencia(resultados_onnx[batch_size][1], len(TEXTOS))
+        relatorio['latencia'][f'batch_{batch_size}'] = {
+            'torch': torch_lat,
+            'onnx_int8': onnx_lat,
+            'speedup': round(torch_lat['mediana_ms'] / onnx_lat['mediana_ms'], 2) if onnx_lat['mediana_ms'] else None
+        }
+    
+    # ========== RELATÓRIO ==========
+    print("\n" + "=" * 70)
+    print("  📊 RELATÓRIO")
+    print("=" * 70)
+    print(f"\n🎯 Desvio de polaridade (ONNX vs PyTorch):")
+    print(f"   Médio: {relatorio['desvio']['medio']}")
+    print(f"   Máximo: {relatorio['desvio']['maximo']}")
+    print(f"   Concordância de sentimento: {relatorio['desvio']['concordancia_sentimento']:.1%}")
+    
+    print(f"\n⏱️  Latência (mediana de {REPETICOES} execuções, {len(TEXTOS)} textos):")
+    for chave, dados in relatorio['latencia'].items():
+        print(f"   {chave}: torch={dados['torch']['mediana_ms']}ms | "
+              f"onnx_int8={dados['onnx_int8']['mediana_ms']}ms | speedup={dados['speedup']}x")
+    
+    with open(ARQUIVO_RELATORIO, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Relatório salvo em: {ARQUIVO_RELATORIO}")
+    print("=" * 70)
+
+except Exception as e:
+    print(f"\n❌ ERRO durante a comparação: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
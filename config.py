@@ -19,14 +19,106 @@ class Config:
     ORACLE_PASSWORD = os.getenv('ORACLE_PASSWORD', '')
     ORACLE_DSN = os.getenv('ORACLE_DSN', 'oracle.fiap.com.br:1521/orcl')
     
+    # Backend de armazenamento: 'oracle' (padrão) ou 'sqlite' (embutido, testes locais e um só nó)
+    DB_BACKEND = os.getenv('DB_BACKEND', 'oracle').lower()
+    SQLITE_CAMINHO = os.getenv('SQLITE_CAMINHO', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workwell.db'))
+    SQLITE_TIMEOUT = float(os.getenv('SQLITE_TIMEOUT', 30))  # Segundos esperando o lock de escrita
+    
+    # Pool de sessões Oracle
+    ORACLE_POOL_MIN = int(os.getenv('ORACLE_POOL_MIN', 1))
+    ORACLE_POOL_MAX = int(os.getenv('ORACLE_POOL_MAX', 8))
+    ORACLE_POOL_INCREMENTO = int(os.getenv('ORACLE_POOL_INCREMENTO', 1))
+    ORACLE_POOL_TIMEOUT = float(os.getenv('ORACLE_POOL_TIMEOUT', 10))  # Segundos esperando uma sessão livre
+    ORACLE_POOL_PING = int(os.getenv('ORACLE_POOL_PING', 60))  # Segundos ociosa até a sessão ser verificada
+    ORACLE_STMT_CACHE = int(os.getenv('ORACLE_STMT_CACHE', 50))  # Statements em cache por sessão
+    ORACLE_ARRAYSIZE = int(os.getenv('ORACLE_ARRAYSIZE', 1000))  # Linhas por ida ao banco em leituras grandes
+    MIGRACAO_PARTICIONAR_REGISTROS = os.getenv('MIGRACAO_PARTICIONAR_REGISTROS', 'False') == 'True'  # Requer opção de particionamento
+    
     # Configurações de Análise
     DIAS_ANALISE_PADRAO = 30
     LIMITE_ESTRESSE_ALTO = 7
     LIMITE_FELICIDADE_BAIXA = 3
+    LOTE_MAX_REGISTROS = int(os.getenv('LOTE_MAX_REGISTROS', 1000))  # Registros por chamada ao endpoint de lote
+    
+    # Resumo diário (empresa, setor, dia) usado pelas consultas agregadas
+    RESUMO_DIARIO_ATIVO = os.getenv('RESUMO_DIARIO_ATIVO', 'True') == 'True'
+    RESUMO_DIARIO_INTERVALO = int(os.getenv('RESUMO_DIARIO_INTERVALO', 3600))  # Segundos entre compactações
+    RESUMO_DIARIO_DIAS_RECOMPACTAR = int(os.getenv('RESUMO_DIARIO_DIAS_RECOMPACTAR', 2))  # Dias fechados recalculados (e lidos dos registros nas consultas)
     
     # Deep Learning
     MODELO_SENTIMENTO = 'neuralmind/bert-base-portuguese-cased'
+    MODELO_REVISAO = os.getenv('MODELO_REVISAO', 'main')
+    MODELO_ESTRATEGIA = os.getenv('MODELO_ESTRATEGIA', 'auto')  # auto | pipeline | classificacao | embeddings | basico
+    MODELO_CARREGAMENTO_BACKGROUND = os.getenv('MODELO_CARREGAMENTO_BACKGROUND', 'True') == 'True'
+    
+    # Backend de inferência: 'torch' (padrão) ou 'onnx' (ONNX Runtime CPU, quantizado int8)
+    SENTIMENTO_BACKEND = os.getenv('SENTIMENTO_BACKEND', 'torch').lower()
+    ONNX_QUANTIZAR = os.getenv('ONNX_QUANTIZAR', 'True') == 'True'
+    ONNX_THREADS = int(os.getenv('ONNX_THREADS', 0))  # 0 = decidido pelo ONNX Runtime
+    ONNX_CACHE_DIR = os.getenv('ONNX_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'onnx'))
     CONFIANCA_MINIMA = 0.6
+    LEXICO_SENTIMENTO = os.getenv('LEXICO_SENTIMENTO', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai', 'lexico_sentimento.json'))
+    SENTIMENTO_BATCH_SIZE = int(os.getenv('SENTIMENTO_BATCH_SIZE', 32))  # Textos por lote no BERT
+    
+    # Comentários longos: janelas de tokens com sobreposição
+    CHUNK_MAX_TOKENS = int(os.getenv('CHUNK_MAX_TOKENS', 512))
+    CHUNK_SOBREPOSICAO = int(os.getenv('CHUNK_SOBREPOSICAO', 64))
+    CHUNK_AGREGACAO = os.getenv('CHUNK_AGREGACAO', 'ponderada')  # media | minimo | ponderada
+    
+    # Cache de resultados de sentimento (BERT + GPT)
+    CACHE_SENTIMENTO_ATIVO = os.getenv('CACHE_SENTIMENTO_ATIVO', 'True') == 'True'
+    CACHE_SENTIMENTO_MAX_ENTRADAS = int(os.getenv('CACHE_SENTIMENTO_MAX_ENTRADAS', 20000))
+    CACHE_SENTIMENTO_MAX_MB = int(os.getenv('CACHE_SENTIMENTO_MAX_MB', 32))
+    CACHE_SENTIMENTO_TTL = int(os.getenv('CACHE_SENTIMENTO_TTL', 24 * 3600))  # Segundos
+    
+    # Cache de agregados (dashboard, mapa de calor, estatísticas, relatório)
+    CACHE_AGREGADOS_ATIVO = os.getenv('CACHE_AGREGADOS_ATIVO', 'True') == 'True'
+    CACHE_AGREGADOS_MAX_ENTRADAS = int(os.getenv('CACHE_AGREGADOS_MAX_ENTRADAS', 2000))
+    CACHE_AGREGADOS_MAX_MB = int(os.getenv('CACHE_AGREGADOS_MAX_MB', 16))
+    CACHE_AGREGADOS_TTL = int(os.getenv('CACHE_AGREGADOS_TTL', 300))  # Segundos (limita a defasagem da janela de dias)
+    
+    # Gráficos e cache de imagens renderizadas
+    GRAFICOS_DPI = int(os.getenv('GRAFICOS_DPI', 150))
+    CACHE_IMAGENS_ATIVO = os.getenv('CACHE_IMAGENS_ATIVO', 'True') == 'True'
+    CACHE_IMAGENS_MAX_ENTRADAS = int(os.getenv('CACHE_IMAGENS_MAX_ENTRADAS', 500))
+    CACHE_IMAGENS_MAX_MB = int(os.getenv('CACHE_IMAGENS_MAX_MB', 64))
+    CACHE_IMAGENS_DIR = os.getenv('CACHE_IMAGENS_DIR', '')  # Vazio = só em memória
+    CACHE_IMAGENS_DISCO_MAX_MB = int(os.getenv('CACHE_IMAGENS_DISCO_MAX_MB', 256))
+    GRAFICOS_RENDER_RAPIDO = os.getenv('GRAFICOS_RENDER_RAPIDO', 'True') == 'True'  # Reaproveita figuras já montadas por lista de setores
+    GRAFICOS_TEMPLATES_MAX = int(os.getenv('GRAFICOS_TEMPLATES_MAX', 32))  # Figuras montadas mantidas em memória
+    GRAFICOS_CACHE_MAX_AGE = int(os.getenv('GRAFICOS_CACHE_MAX_AGE', 86400))  # Segundos no cache do navegador (URLs versionadas)
+    
+    # Pool de processos de renderização dos gráficos (0 = desativado, -1 = até 4 workers)
+    RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', 0))
+    RENDER_TIMEOUT = float(os.getenv('RENDER_TIMEOUT', 30))  # Segundos por gráfico
+    
+    # Pool de processos de inferência (0 = desativado, -1 = um worker por núcleo)
+    # Criado por fork antes de qualquer thread: com o pool ativo o modelo é carregado na importação, sem background
+    INFERENCIA_WORKERS = int(os.getenv('INFERENCIA_WORKERS', 0))
+    
+    # Micro-batching entre requisições concorrentes
+    MICROBATCH_ATIVO = os.getenv('MICROBATCH_ATIVO', 'True') == 'True'
+    MICROBATCH_MAX_BATCH = int(os.getenv('MICROBATCH_MAX_BATCH', 16))
+    MICROBATCH_MAX_ESPERA_MS = float(os.getenv('MICROBATCH_MAX_ESPERA_MS', 5))  # Orçamento de latência por lote
+    MICROBATCH_TIMEOUT = float(os.getenv('MICROBATCH_TIMEOUT', 30))  # Segundos até desistir e usar o fallback
+    
+    # Enriquecimento assíncrono de sentimento (registro é confirmado antes da análise)
+    ENRIQUECIMENTO_ASSINCRONO = os.getenv('ENRIQUECIMENTO_ASSINCRONO', 'False') == 'True'  # Padrão quando a requisição não informa
+    ENRIQUECIMENTO_WORKERS = int(os.getenv('ENRIQUECIMENTO_WORKERS', 2))
+    ENRIQUECIMENTO_MAX_BATCH = int(os.getenv('ENRIQUECIMENTO_MAX_BATCH', 32))
+    ENRIQUECIMENTO_MAX_ESPERA_MS = float(os.getenv('ENRIQUECIMENTO_MAX_ESPERA_MS', 200))
+    ENRIQUECIMENTO_USAR_GPT = os.getenv('ENRIQUECIMENTO_USAR_GPT', 'True') == 'True'
+    # Varredura que reenfileira registros sem sentimento (fila em memória perdida em reinício/queda)
+    ENRIQUECIMENTO_VARREDURA_INTERVALO = int(os.getenv('ENRIQUECIMENTO_VARREDURA_INTERVALO', 300))  # Segundos (0 = desativada); só com enriquecimento assíncrono em uso
+    ENRIQUECIMENTO_VARREDURA_DIAS = int(os.getenv('ENRIQUECIMENTO_VARREDURA_DIAS', 7))  # Janela de registros verificados
+    ENRIQUECIMENTO_VARREDURA_ESPERA = int(os.getenv('ENRIQUECIMENTO_VARREDURA_ESPERA', 120))  # Segundos antes de considerar um registro perdido
+    ENRIQUECIMENTO_VARREDURA_LIMITE = int(os.getenv('ENRIQUECIMENTO_VARREDURA_LIMITE', 500))  # Registros por varredura
+    ENRIQUECIMENTO_VARREDURA_RESERVA = int(os.getenv('ENRIQUECIMENTO_VARREDURA_RESERVA', 900))  # Segundos em que um registro reservado por um processo não é pego por outro
+    
+    # Âncoras para análise por embeddings (modelo BERT base sem fine-tuning)
+    ANCORAS_POSITIVAS = [p.strip() for p in os.getenv('ANCORAS_POSITIVAS', 'bom,ótimo,feliz,satisfeito,alegre').split(',') if p.strip()]
+    ANCORAS_NEGATIVAS = [p.strip() for p in os.getenv('ANCORAS_NEGATIVAS', 'ruim,triste,estressado,cansado,ansioso').split(',') if p.strip()]
+    ANCORAS_CACHE_DIR = os.getenv('ANCORAS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'ancoras'))
     
     # OpenAI / ChatGPT
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
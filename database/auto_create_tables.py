@@ -3,6 +3,7 @@ Cria automaticamente as tabelas do Work Well com sufixo _WorkWell
 """
 import oracledb
 from config import Config
+from database.migrations import aplicar_migracoes
 import logging
 
 logger = logging.getLogger(__name__)
@@ -86,84 +87,21 @@ def insert_initial_data(cursor, connection):
     logger.info("✅ Dados iniciais inseridos com sucesso!")
 
 def create_tables_if_not_exist(connection):
-    """Cria as tabelas automaticamente se não existirem"""
-    cursor = connection.cursor()
-    
-    tables_sql = [
-        # Tabela de Empresas
-        """CREATE TABLE EMPRESAS_WorkWell (
-            ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-            NOME VARCHAR2(255) NOT NULL,
-            CNPJ VARCHAR2(18) UNIQUE NOT NULL,
-            DATA_CADASTRO TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )""",
-        
-        # Tabela de Setores
-        """CREATE TABLE SETORES_WorkWell (
-            ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-            EMPRESA_ID NUMBER NOT NULL,
-            NOME VARCHAR2(255) NOT NULL,
-            DESCRICAO VARCHAR2(500),
-            CONSTRAINT FK_SETOR_EMPRESA_WW FOREIGN KEY (EMPRESA_ID) REFERENCES EMPRESAS_WorkWell(ID)
-        )""",
-        
-        # Tabela de Colaboradores
-        """CREATE TABLE COLABORADORES_WorkWell (
-            ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-            EMPRESA_ID NUMBER NOT NULL,
-            SETOR_ID NUMBER,
-            CODIGO_ACESSO VARCHAR2(255) UNIQUE NOT NULL,
-            DATA_CADASTRO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT FK_COLAB_EMPRESA_WW FOREIGN KEY (EMPRESA_ID) REFERENCES EMPRESAS_WorkWell(ID),
-            CONSTRAINT FK_COLAB_SETOR_WW FOREIGN KEY (SETOR_ID) REFERENCES SETORES_WorkWell(ID)
-        )""",
-        
-        # Tabela de Registros Emocionais
-        """CREATE TABLE REGISTROS_EMOCIONAIS_WorkWell (
-            ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-            COLABORADOR_ID NUMBER,
-            EMPRESA_ID NUMBER NOT NULL,
-            SETOR_ID NUMBER NOT NULL,
-            NIVEL_ESTRESSE NUMBER(2) NOT NULL,
-            NIVEL_FELICIDADE NUMBER(2) NOT NULL,
-            NIVEL_ANSIEDADE NUMBER(2) DEFAULT 5 NOT NULL,
-            NIVEL_MOTIVACAO NUMBER(2) DEFAULT 5 NOT NULL,
-            COMENTARIO VARCHAR2(1000),
-            SENTIMENTO_TEXTO VARCHAR2(50),
-            SCORE_SENTIMENTO NUMBER(5,2),
-            DATA_REGISTRO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT CK_ESTRESSE CHECK (NIVEL_ESTRESSE BETWEEN 1 AND 10),
-            CONSTRAINT CK_FELICIDADE CHECK (NIVEL_FELICIDADE BETWEEN 1 AND 10),
-            CONSTRAINT CK_ANSIEDADE CHECK (NIVEL_ANSIEDADE BETWEEN 1 AND 10),
-            CONSTRAINT CK_MOTIVACAO CHECK (NIVEL_MOTIVACAO BETWEEN 1 AND 10),
-            CONSTRAINT FK_REG_COLAB_WW FOREIGN KEY (COLABORADOR_ID) REFERENCES COLABORADORES_WorkWell(ID),
-            CONSTRAINT FK_REG_EMPRESA_WW FOREIGN KEY (EMPRESA_ID) REFERENCES EMPRESAS_WorkWell(ID),
-            CONSTRAINT FK_REG_SETOR_WW FOREIGN KEY (SETOR_ID) REFERENCES SETORES_WorkWell(ID)
-        )"""
-    ]
-    
+    """Cria/atualiza as tabelas via migrações versionadas e insere os dados iniciais"""
     logger.info("Verificando e criando tabelas...")
     
-    # Nomes das tabelas para logs
-    table_names = ["EMPRESAS_WorkWell", "SETORES_WorkWell", "COLABORADORES_WorkWell", "REGISTROS_EMOCIONAIS_WorkWell"]
+    # Tabelas, índices e demais alterações de schema (ver database/migrations.py)
+    try:
+        novas = aplicar_migracoes(connection)
+        if novas:
+            logger.info(f"✅ Migrações aplicadas: {novas}")
+        else:
+            logger.info("ℹ️ Schema já está atualizado (nenhuma migração pendente)")
+    except (oracledb.Error, RuntimeError) as e:
+        logger.error(f"❌ Erro ao aplicar migrações: {e}")
+        connection.rollback()
     
-    # Criar tabelas (se não existirem) - uma por vez com commit
-    for i, sql in enumerate(tables_sql, 1):
-        table_name = table_names[i-1]
-        try:
-            cursor.execute(sql)
-            connection.commit()
-            logger.info(f"✅ Tabela {i}/4 ({table_name}) criada com sucesso")
-        except oracledb.Error as e:
-            error_obj, = e.args
-            if error_obj.code == 955:  # Tabela já existe
-                logger.info(f"ℹ️ Tabela {i}/4 ({table_name}) já existe (pulando)")
-                connection.commit()  # Garantir commit mesmo se já existe
-            else:
-                logger.error(f"❌ Erro ao criar tabela {i}/4 ({table_name}): {error_obj.message}")
-                logger.error(f"   Código do erro: {error_obj.code}")
-                connection.rollback()  # Rollback em caso de erro
-                # Continuar tentando criar as outras tabelas
+    cursor = connection.cursor()
     
     # Inserir dados iniciais (se não existirem)
     logger.info("Inserindo dados iniciais...")
@@ -174,4 +112,3 @@ def create_tables_if_not_exist(connection):
     
     cursor.close()
     logger.info("✅ Verificação de tabelas e dados concluída!")
-
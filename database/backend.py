@@ -0,0 +1,262 @@
+"""
+Work Well - Interface comum dos backends de banco de dados
+Implementada por OracleDB (database/db_connection.py) e SQLiteDB (database/sqlite_db.py)
+"""
+import numpy as np
+import pandas as pd
+from config import Config
+from database.cache_agregados import cache_agregados
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None  # Opcional: saída colunar no formato Arrow
+
+
+class BancoDados:
+    """
+    Contrato dos backends de armazenamento
+    
+    A aplicação usa apenas estes métodos (via a instância global `db`), então
+    qualquer backend que os implemente pode ser selecionado em Config.DB_BACKEND.
+    Os resultados usam os mesmos nomes de colunas (maiúsculos) em todos os backends.
+    """
+    
+    # ==================== CONEXÃO ====================
+    
+    def connect(self):
+        """Abre o acesso ao banco e garante que as tabelas existem"""
+        raise NotImplementedError
+    
+    def disconnect(self):
+        """Fecha todas as conexões com o banco"""
+        raise NotImplementedError
+    
+    def esta_conectado(self):
+        """Indica se o backend está pronto para uso"""
+        raise NotImplementedError
+    
+    def conexao(self):
+        """Context manager que fornece uma conexão DB-API e a devolve ao final"""
+        raise NotImplementedError
+    
+    def estatisticas_pool(self):
+        """Métricas de uso das conexões"""
+        raise NotImplementedError
+    
+    # ==================== CONSULTAS GENÉRICAS ====================
+    
+    consultas = None  # RegistroConsultas com os statements nomeados do backend
+    
+    def executar_consulta(self, nome, params=None):
+        """
+        Executa um SELECT registrado pelo nome e retorna uma lista de dicts
+        
+        Args:
+            nome (str): Nome do statement em self.consultas
+            params (dict): Bind variables
+        """
+        with self.consultas.medir(nome) as sql:
+            return self.execute_query(sql, params)
+    
+    def estatisticas_consultas(self):
+        """Métricas de execução por statement (maior tempo total primeiro)"""
+        return self.consultas.estatisticas() if self.consultas else None
+    
+    def execute_query(self, query, params=None):
+        """Executa um SELECT e retorna uma lista de dicts"""
+        raise NotImplementedError
+    
+    def iterar_query(self, query, params=None, arraysize=None, prefetchrows=None, como_dict=False):
+        """Executa um SELECT e gera as linhas sob demanda"""
+        raise NotImplementedError
+    
+    def execute_query_colunar(self, query, params=None, formato='pandas', arraysize=None):
+        """Executa um SELECT e retorna o resultado por colunas"""
+        raise NotImplementedError
+    
+    def execute_insert(self, query, params):
+        """Executa INSERT/UPDATE/DELETE com commit"""
+        raise NotImplementedError
+    
+    # ==================== REGISTROS EMOCIONAIS ====================
+    
+    def insert_registro_emocional(self, colaborador_id, setor_id, estresse, felicidade, ansiedade=5, motivacao=5, comentario='', anonimo='N'):
+        """Insere um registro emocional e retorna o ID gerado"""
+        raise NotImplementedError
+    
+    def insert_registros_emocionais_lote(self, registros):
+        """Insere vários registros em uma transação e retorna os IDs gerados"""
+        raise NotImplementedError
+    
+    def atualizar_sentimento(self, registro_id, sentimento, score):
+        """Grava o sentimento de um registro"""
+        raise NotImplementedError
+    
+    def atualizar_sentimentos_lote(self, atualizacoes):
+        """Grava o sentimento de vários registros em uma transação"""
+        raise NotImplementedError
+    
+    def obter_sentimento_registro(self, registro_id):
+        """Retorna ID, SENTIMENTO_TEXTO, SCORE_SENTIMENTO e TEM_COMENTARIO ('S'/'N') de um registro"""
+        raise NotImplementedError
+    
+    def obter_registros_sem_sentimento(self, dias, espera_segundos, limite, reserva_segundos):
+        """
+        Registros com comentário e sem sentimento gravado (enriquecimento perdido)
+        
+        Args:
+            dias (int): Janela de registros verificados
+            espera_segundos (int): Ignora registros mais novos (ainda na fila)
+            limite (int): Máximo de registros retornados (os mais antigos primeiro)
+            reserva_segundos (int): Ignora registros reservados há menos tempo que isso
+        
+        Returns:
+            list: Dicts com ID e COMENTARIO
+        """
+        return self.executar_consulta('registros_sem_sentimento', {
+            'dias': dias,
+            'espera': espera_segundos,
+            'limite': limite,
+            'reserva': reserva_segundos
+        })
+    
+    def reservar_registros_sentimento(self, registro_ids, reserva_segundos):
+        """
+        Reserva registros sem sentimento para este processo (varredura com vários processos)
+        
+        Args:
+            registro_ids (list): IDs candidatos
+            reserva_segundos (int): Reservas mais antigas que isso podem ser tomadas
+        
+        Returns:
+            list: IDs reservados (os demais já têm sentimento ou estão com outro processo)
+        """
+        raise NotImplementedError
+    
+    def iterar_registros_emocionais(self, empresa_id, dias=None):
+        """Gera os registros da empresa para exportação"""
+        raise NotImplementedError
+    
+    # ==================== AGREGADOS ====================
+    
+    def obter_setores(self, empresa_id):
+        """Lista os setores da empresa"""
+        raise NotImplementedError
+    
+    def obter_dados_mapa_calor(self, empresa_id, dias=30):
+        """Médias por setor na janela (servidas pelo cache de agregados)"""
+        return cache_agregados.obter_ou_calcular(
+            'mapa_calor', empresa_id, dias,
+            lambda: self._consultar_dados_mapa_calor(empresa_id, dias)
+        )
+    
+    def obter_estatisticas(self, empresa_id, dias=30):
+        """Médias e totais da empresa na janela (servidos pelo cache de agregados)"""
+        return cache_agregados.obter_ou_calcular(
+            'estatisticas', empresa_id, dias,
+            lambda: self._consultar_estatisticas(empresa_id, dias)
+        )
+    
+    def _consultar_dados_mapa_calor(self, empresa_id, dias):
+        """Consulta as médias por setor no banco"""
+        raise NotImplementedError
+    
+    def _consultar_estatisticas(self, empresa_id, dias):
+        """Consulta as médias e totais da empresa no banco"""
+        raise NotImplementedError
+    
+    def obter_dashboard(self, empresa_id, dias=30):
+        """
+        Dados completos do dashboard em uma única consulta ao banco
+        
+        Returns:
+            dict: {'setores': [...], 'empresa': {...}}. Cada setor tem as colunas de
+                obter_dados_mapa_calor() e mais TOTAL_COLABORADORES,
+                CASOS_ESTRESSE_ALTO, CASOS_FELICIDADE_BAIXA e ULTIMO_REGISTRO;
+                'empresa' tem as mesmas colunas para a empresa inteira
+        """
+        return cache_agregados.obter_ou_calcular(
+            'dashboard', empresa_id, dias,
+            lambda: self._consultar_dashboard(empresa_id, dias)
+        )
+    
+    def _statement_dashboard(self, empresa_id, dias):
+        """
+        Statement do dashboard e seus binds (backends com resumo diário trocam o statement)
+        
+        Returns:
+            tuple: (nome do statement, params)
+        """
+        return 'dashboard', {
+            'empresa_id': empresa_id,
+            'dias': dias,
+            'limite_estresse': Config.LIMITE_ESTRESSE_ALTO,
+            'limite_felicidade': Config.LIMITE_FELICIDADE_BAIXA
+        }
+    
+    def _consultar_dashboard(self, empresa_id, dias):
+        """Executa o statement do dashboard (setores + linha da empresa) e separa as linhas"""
+        linhas = self.executar_consulta(*self._statement_dashboard(empresa_id, dias))
+        
+        setores = []
+        empresa = None
+        for linha in linhas:
+            if linha.pop('TOTAL_EMPRESA'):
+                linha.pop('SETOR_NOME')
+                empresa = linha
+            else:
+                setores.append(linha)
+        
+        return {'setores': setores, 'empresa': empresa}
+    
+    def obter_dashboard_rh(self, empresa_id):
+        """Retorna dados do dashboard RH"""
+        return self.obter_dashboard(empresa_id, 30)['setores']
+    
+    def compactar_resumo_diario(self, dias_recompactar=None):
+        """Atualiza tabelas de resumo, se o backend tiver (default: nada a fazer)"""
+        return 0
+    
+    def iniciar_compactador(self, intervalo=None):
+        """Inicia a compactação periódica, se o backend tiver (default: nada a fazer)"""
+    
+    # ==================== AUXILIARES ====================
+    
+    @staticmethod
+    def _invalidar_agregados(empresa_id=None):
+        """
+        Descarta os agregados em cache após uma escrita
+        
+        Args:
+            empresa_id (int): Empresa afetada (None = escrita genérica, descarta todas)
+        """
+        if empresa_id is None:
+            cache_agregados.limpar()
+        else:
+            cache_agregados.invalidar_empresa(empresa_id)
+    
+    @staticmethod
+    def _montar_colunar(columns, valores, formato):
+        """
+        Converte colunas já lidas (listas de valores) no formato pedido
+        
+        Args:
+            columns (list): Nomes das colunas
+            valores (list): Uma lista de valores por coluna
+            formato (str): 'pandas', 'numpy' ou 'arrow'
+        """
+        arrays = {nome: np.asarray(coluna) for nome, coluna in zip(columns, valores)}
+        if formato == 'numpy':
+            return arrays
+        if formato == 'arrow':
+            return pa.table(arrays)
+        return pd.DataFrame(arrays, columns=columns)
+    
+    @staticmethod
+    def _validar_formato_colunar(formato):
+        """Valida o formato pedido em execute_query_colunar()"""
+        if formato not in ('pandas', 'numpy', 'arrow'):
+            raise ValueError(f"Formato colunar inválido: {formato}")
+        if formato == 'arrow' and pa is None:
+            raise RuntimeError("pyarrow não está instalado (pip install pyarrow)")
@@ -0,0 +1,115 @@
+"""
+Work Well - Cache de agregados por empresa
+Evita recalcular no banco as médias do dashboard, mapa de calor, estatísticas
+e relatório a cada requisição; as escritas invalidam a empresa afetada
+"""
+import logging
+import threading
+from config import Config
+from cache import TTLCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CacheAgregados:
+    """
+    Cache dos resultados agregados, com chave (consulta, empresa_id, dias)
+    
+    Cada empresa tem um número de versão incrementado a cada escrita: uma
+    consulta que começou antes da escrita não grava o resultado (já
+    desatualizado) no cache. O TTL limita a defasagem que não passa pelas
+    escritas deste processo (janela deslizante de dias, outros processos
+    gravando no mesmo banco).
+    
+    Atualizações de sentimento não invalidam: nenhum agregado em cache lê
+    SENTIMENTO_TEXTO/SCORE_SENTIMENTO, e o enriquecimento assíncrono
+    esvaziaria o cache logo após cada inserção.
+    
+    Os valores retornados são compartilhados entre requisições e não devem
+    ser modificados.
+    """
+    
+    def __init__(self, max_entradas=2000, max_bytes=16 * 1024 * 1024, ttl_segundos=300, ativo=True):
+        """
+        Args:
+            max_entradas (int): Número máximo de resultados em cache
+            max_bytes (int): Tamanho máximo estimado do conteúdo, em bytes
+            ttl_segundos (float): Tempo de vida de cada resultado
+            ativo (bool): Se False, toda consulta vai direto ao banco
+        """
+        self.ativo = ativo
+        self.cache = TTLCache(max_entradas=max_entradas, max_bytes=max_bytes, ttl_segundos=ttl_segundos, nome='agregados')
+        
+        self._lock = threading.Lock()
+        self._versoes = {}  # empresa_id -> versão
+        self._geracao = 0  # Incrementada por limpar()
+        self.total_invalidacoes = 0
+    
+    def _versao(self, empresa_id):
+        with self._lock:
+            return self._geracao, self._versoes.get(empresa_id, 0)
+    
+    def obter_ou_calcular(self, consulta, empresa_id, dias, calcular):
+        """
+        Retorna o agregado em cache ou o calcula (e armazena)
+        
+        Args:
+            consulta (str): Nome da consulta (ex.: 'mapa_calor')
+            empresa_id (int): Empresa consultada
+            dias (int): Janela da consulta
+            calcular (callable): Função sem argumentos que consulta o banco
+        
+        Returns:
+            Resultado da consulta
+        """
+        if not self.ativo:
+            return calcular()
+        
+        chave = (consulta, empresa_id, dias)
+        resultado = self.cache.obter(chave)
+        if resultado is not None:
+            return resultado
+        
+        versao = self._versao(empresa_id)
+        resultado = calcular()
+        
+        if resultado is not None and self._versao(empresa_id) == versao:
+            self.cache.definir(chave, resultado)
+        return resultado
+    
+    def invalidar_empresa(self, empresa_id):
+        """
+        Descarta os agregados de uma empresa após uma escrita
+        
+        Returns:
+            int: Quantidade de resultados descartados
+        """
+        with self._lock:
+            self._versoes[empresa_id] = self._versoes.get(empresa_id, 0) + 1
+            self.total_invalidacoes += 1
+        return self.cache.invalidar_se(lambda chave: chave[1] == empresa_id)
+    
+    def limpar(self):
+        """Descarta todos os agregados"""
+        with self._lock:
+            self._geracao += 1
+            self.total_invalidacoes += 1
+        self.cache.limpar()
+    
+    def estatisticas(self):
+        """Retorna métricas de uso do cache de agregados"""
+        return {
+            **self.cache.estatisticas(),
+            'ativo': self.ativo,
+            'invalidacoes': self.total_invalidacoes
+        }
+
+
+# Instância global
+cache_agregados = CacheAgregados(
+    max_entradas=Config.CACHE_AGREGADOS_MAX_ENTRADAS,
+    max_bytes=Config.CACHE_AGREGADOS_MAX_MB * 1024 * 1024,
+    ttl_segundos=Config.CACHE_AGREGADOS_TTL,
+    ativo=Config.CACHE_AGREGADOS_ATIVO
+)
@@ -0,0 +1,401 @@
+"""
+Work Well - Registro central de statements SQL
+Cada consulta tem um nome e um texto fixo, com todos os valores (inclusive a
+janela de dias) passados como bind variables
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+
+class RegistroConsultas:
+    """
+    Statements nomeados de um backend, com métricas de execução por nome
+    
+    Como o texto de cada statement nunca muda, o banco faz um único hard parse
+    por statement e o cache de statements de cada sessão do pool
+    (Config.ORACLE_STMT_CACHE) reaproveita o cursor já preparado nas
+    execuções seguintes.
+    """
+    
+    def __init__(self, consultas):
+        """
+        Args:
+            consultas (dict): nome -> texto SQL
+        """
+        self._consultas = dict(consultas)
+        self._lock = threading.Lock()
+        self._metricas = {nome: self._metricas_vazias() for nome in self._consultas}
+    
+    @staticmethod
+    def _metricas_vazias():
+        return {'execucoes': 0, 'erros': 0, 'tempo_total': 0.0, 'tempo_maximo': 0.0}
+    
+    def sql(self, nome):
+        """Retorna o texto SQL de um statement registrado"""
+        try:
+            return self._consultas[nome]
+        except KeyError:
+            raise KeyError(f"Statement não registrado: {nome}") from None
+    
+    @contextmanager
+    def medir(self, nome):
+        """
+        Fornece o SQL do statement e contabiliza a execução feita no bloco
+        
+        Uso:
+            with consultas.medir('setores') as sql:
+                cursor.execute(sql, params)
+        """
+        sql = self.sql(nome)
+        inicio = time.perf_counter()
+        erro = False
+        try:
+            yield sql
+        except Exception:
+            erro = True
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            with self._lock:
+                metricas = self._metricas[nome]
+                metricas['execucoes'] += 1
+                metricas['erros'] += int(erro)
+                metricas['tempo_total'] += duracao
+                metricas['tempo_maximo'] = max(metricas['tempo_maximo'], duracao)
+    
+    def medir_iteracao(self, nome, gerar_linhas):
+        """
+        Percorre as linhas de um statement medindo só a execução e a primeira busca
+        
+        Em consultas lidas sob demanda (exportações), o restante do tempo depende
+        de quem consome as linhas (ex.: download do cliente) e fica fora das
+        métricas do statement.
+        
+        Args:
+            nome (str): Nome do statement
+            gerar_linhas (callable): Recebe o SQL e devolve um iterador de linhas
+        
+        Yields:
+            Linhas produzidas por gerar_linhas
+        """
+        linhas = iter(gerar_linhas(self.sql(nome)))
+        with self.medir(nome):
+            primeira = next(linhas, None)
+        if primeira is None:
+            return
+        yield primeira
+        yield from linhas
+    
+    def estatisticas(self):
+        """
+        Retorna as métricas por statement, do maior para o menor tempo total
+        
+        Returns:
+            dict: nome -> {execucoes, erros, tempo_total_ms, tempo_medio_ms, tempo_maximo_ms}
+        """
+        with self._lock:
+            metricas = {nome: dict(valores) for nome, valores in self._metricas.items()}
+        
+        resultado = {}
+        for nome, m in sorted(metricas.items(), key=lambda item: item[1]['tempo_total'], reverse=True):
+            resultado[nome] = {
+                'execucoes': m['execucoes'],
+                'erros': m['erros'],
+                'tempo_total_ms': round(m['tempo_total'] * 1000, 2),
+                'tempo_medio_ms': round(m['tempo_total'] / m['execucoes'] * 1000, 2) if m['execucoes'] else 0.0,
+                'tempo_maximo_ms': round(m['tempo_maximo'] * 1000, 2)
+            }
+        return resultado
+
+
+# ==================== STATEMENTS ORACLE ====================
+
+# Primeiro dia lido direto dos registros: o seguinte ao último compactado ou,
+# se for antes, o primeiro dia que o compactador ainda recalcula (registros
+# que chegam depois da compactação), limitado ao início da janela
+_CTE_CORTE_RESUMO = """
+            CORTE AS (
+                SELECT GREATEST(
+                           LEAST(NVL(MAX(DIA) + 1, TRUNC(SYSDATE) - :dias), TRUNC(SYSDATE) - :dias_recompactar),
+                           TRUNC(SYSDATE) - :dias
+                       ) AS DIA
+                FROM RESUMO_DIARIO_WorkWell
+            )"""
+
+CONSULTAS_ORACLE = {
+    'setores': """
+        SELECT ID, NOME, DESCRICAO
+        FROM SETORES_WorkWell
+        WHERE EMPRESA_ID = :empresa_id
+        ORDER BY NOME
+    """,
+    
+    'mapa_calor': """
+        SELECT
+            S.NOME AS SETOR_NOME,
+            ROUND(AVG(R.NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
+            ROUND(AVG(R.NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
+            ROUND(AVG(R.NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
+            ROUND(AVG(R.NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
+            COUNT(R.ID) AS TOTAL_REGISTROS
+        FROM
+            REGISTROS_EMOCIONAIS_WorkWell R
+        JOIN
+            SETORES_WorkWell S ON R.SETOR_ID = S.ID
+        WHERE
+            R.EMPRESA_ID = :empresa_id
+            AND R.DATA_REGISTRO >= SYSTIMESTAMP - NUMTODSINTERVAL(:dias, 'DAY')
+        GROUP BY
+            S.NOME
+        ORDER BY
+            S.NOME
+    """,
+    
+    'estatisticas': """
+        SELECT
+            ROUND(AVG(NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
+            ROUND(AVG(NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
+            ROUND(AVG(NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
+            ROUND(AVG(NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
+            COUNT(ID) AS TOTAL_REGISTROS,
+            COUNT(DISTINCT COLABORADOR_ID) AS TOTAL_COLABORADORES
+        FROM
+            REGISTROS_EMOCIONAIS_WorkWell
+        WHERE
+            EMPRESA_ID = :empresa_id
+            AND DATA_REGISTRO >= SYSTIMESTAMP - NUMTODSINTERVAL(:dias, 'DAY')
+    """,
+    
+    'mapa_calor_resumo': """
+        WITH""" + _CTE_CORTE_RESUMO + """,
+            DADOS AS (
+                SELECT SETOR_ID, SOMA_ESTRESSE, SOMA_FELICIDADE, SOMA_ANSIEDADE, SOMA_MOTIVACAO, TOTAL_REGISTROS
+                FROM RESUMO_DIARIO_WorkWell
+                WHERE EMPRESA_ID = :empresa_id
+                  AND DIA >= TRUNC(SYSDATE) - :dias
+                  AND DIA < (SELECT DIA FROM CORTE)
+                UNION ALL
+                SELECT SETOR_ID, SUM(NIVEL_ESTRESSE), SUM(NIVEL_FELICIDADE), SUM(NIVEL_ANSIEDADE), SUM(NIVEL_MOTIVACAO), COUNT(*)
+                FROM REGISTROS_EMOCIONAIS_WorkWell
+                WHERE EMPRESA_ID = :empresa_id
+                  AND DATA_REGISTRO >= (SELECT DIA FROM CORTE)
+                GROUP BY SETOR_ID
+            )
+        SELECT
+            S.NOME AS SETOR_NOME,
+            ROUND(SUM(D.SOMA_ESTRESSE) / SUM(D.TOTAL_REGISTROS), 1) AS MEDIA_ESTRESSE,
+            ROUND(SUM(D.SOMA_FELICIDADE) / SUM(D.TOTAL_REGISTROS), 1) AS MEDIA_FELICIDADE,
+            ROUND(SUM(D.SOMA_ANSIEDADE) / SUM(D.TOTAL_REGISTROS), 1) AS MEDIA_ANSIEDADE,
+            ROUND(SUM(D.SOMA_MOTIVACAO) / SUM(D.TOTAL_REGISTROS), 1) AS MEDIA_MOTIVACAO,
+            SUM(D.TOTAL_REGISTROS) AS TOTAL_REGISTROS
+        FROM
+            DADOS D
+        JOIN
+            SETORES_WorkWell S ON D.SETOR_ID = S.ID
+        GROUP BY
+            S.NOME
+        ORDER BY
+            S.NOME
+    """,
+    
+    'estatisticas_resumo': """
+        WITH""" + _CTE_CORTE_RESUMO + """,
+            DADOS AS (
+                SELECT SOMA_ESTRESSE, SOMA_FELICIDADE, SOMA_ANSIEDADE, SOMA_MOTIVACAO, TOTAL_REGISTROS, COLABORADORES_SKETCH
+                FROM RESUMO_DIARIO_WorkWell
+                WHERE EMPRESA_ID = :empresa_id
+                  AND DIA >= TRUNC(SYSDATE) - :dias
+                  AND DIA < (SELECT DIA FROM CORTE)
+                UNION ALL
+                SELECT SUM(NIVEL_ESTRESSE), SUM(NIVEL_FELICIDADE), SUM(NIVEL_ANSIEDADE), SUM(NIVEL_MOTIVACAO), COUNT(*),
+                       APPROX_COUNT_DISTINCT_DETAIL(COLABORADOR_ID)
+                FROM REGISTROS_EMOCIONAIS_WorkWell
+                WHERE EMPRESA_ID = :empresa_id
+                  AND DATA_REGISTRO >= (SELECT DIA FROM CORTE)
+            )
+        SELECT
+            ROUND(SUM(SOMA_ESTRESSE) / NULLIF(SUM(TOTAL_REGISTROS), 0), 1) AS MEDIA_ESTRESSE,
+            ROUND(SUM(SOMA_FELICIDADE) / NULLIF(SUM(TOTAL_REGISTROS), 0), 1) AS MEDIA_FELICIDADE,
+            ROUND(SUM(SOMA_ANSIEDADE) / NULLIF(SUM(TOTAL_REGISTROS), 0), 1) AS MEDIA_ANSIEDADE,
+            ROUND(SUM(SOMA_MOTIVACAO) / NULLIF(SUM(TOTAL_REGISTROS), 0), 1) AS MEDIA_MOTIVACAO,
+            NVL(SUM(TOTAL_REGISTROS), 0) AS TOTAL_REGISTROS,
+            NVL(TO_APPROX_COUNT_DISTINCT(APPROX_COUNT_DISTINCT_AGG(COLABORADORES_SKETCH)), 0) AS TOTAL_COLABORADORES
+        FROM
+            DADOS
+    """,
+    
+    # Setores e total da empresa em uma única leitura: GROUPING(S.NOME) = 1 marca a linha da empresa
+    'dashboard': """
+        SELECT
+            GROUPING(S.NOME) AS TOTAL_EMPRESA,
+            S.NOME AS SETOR_NOME,
+            ROUND(AVG(R.NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
+            ROUND(AVG(R.NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
+            ROUND(AVG(R.NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
+            ROUND(AVG(R.NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
+            COUNT(R.ID) AS TOTAL_REGISTROS,
+            COUNT(DISTINCT R.COLABORADOR_ID) AS TOTAL_COLABORADORES,
+            COUNT(CASE WHEN R.NIVEL_ESTRESSE >= :limite_estresse THEN 1 END) AS CASOS_ESTRESSE_ALTO,
+            COUNT(CASE WHEN R.NIVEL_FELICIDADE <= :limite_felicidade THEN 1 END) AS CASOS_FELICIDADE_BAIXA,
+            MAX(R.DATA_REGISTRO) AS ULTIMO_REGISTRO
+        FROM
+            REGISTROS_EMOCIONAIS_WorkWell R
+        JOIN
+            SETORES_WorkWell S ON R.SETOR_ID = S.ID
+        WHERE
+            R.EMPRESA_ID = :empresa_id
+            AND R.DATA_REGISTRO >= SYSTIMESTAMP - NUMTODSINTERVAL(:dias, 'DAY')
+        GROUP BY GROUPING SETS ((S.NOME), ())
+        ORDER BY
+            TOTAL_EMPRESA, SETOR_NOME
+    """,
+    
+    # Mesmo formato de 'dashboard', lido do resumo diário com a janela e o corte
+    # de 'mapa_calor_resumo' (os casos usam os limites vigentes na compactação)
+    'dashboard_resumo': """
+        WITH""" + _CTE_CORTE_RESUMO + """,
+            DADOS AS (
+                SELECT SETOR_ID, SOMA_ESTRESSE, SOMA_FELICIDADE, SOMA_ANSIEDADE, SOMA_MOTIVACAO, TOTAL_REGISTROS,
+                       COLABORADORES_SKETCH, CASOS_ESTRESSE_ALTO, CASOS_FELICIDADE_BAIXA, ULTIMO_REGISTRO
+                FROM RESUMO_DIARIO_WorkWell
+                WHERE EMPRESA_ID = :empresa_id
+                  AND DIA >= TRUNC(SYSDATE) - :dias
+                  AND DIA < (SELECT DIA FROM CORTE)
+                UNION ALL
+                SELECT SETOR_ID, SUM(NIVEL_ESTRESSE), SUM(NIVEL_FELICIDADE), SUM(NIVEL_ANSIEDADE), SUM(NIVEL_MOTIVACAO), COUNT(*),
+                       APPROX_COUNT_DISTINCT_DETAIL(COLABORADOR_ID),
+                       COUNT(CASE WHEN NIVEL_ESTRESSE >= :limite_estresse THEN 1 END),
+                       COUNT(CASE WHEN NIVEL_FELICIDADE <= :limite_felicidade THEN 1 END),
+                       MAX(DATA_REGISTRO)
+                FROM REGISTROS_EMOCIONAIS_WorkWell
+                WHERE EMPRESA_ID = :empresa_id
+                  AND DATA_REGISTRO >= (SELECT DIA FROM CORTE)
+                GROUP BY SETOR_ID
+            )
+        SELECT
+            GROUPING(S.NOME) AS TOTAL_EMPRESA,
+            S.NOME AS SETOR_NOME,
+            ROUND(SUM(D.SOMA_ESTRESSE) / NULLIF(SUM(D.TOTAL_REGISTROS), 0), 1) AS MEDIA_ESTRESSE,
+            ROUND(SUM(D.SOMA_FELICIDADE) / NULLIF(SUM(D.TOTAL_REGISTROS), 0), 1) AS MEDIA_FELICIDADE,
+            ROUND(SUM(D.SOMA_ANSIEDADE) / NULLIF(SUM(D.TOTAL_REGISTROS), 0), 1) AS MEDIA_ANSIEDADE,
+            ROUND(SUM(D.SOMA_MOTIVACAO) / NULLIF(SUM(D.TOTAL_REGISTROS), 0), 1) AS MEDIA_MOTIVACAO,
+            NVL(SUM(D.TOTAL_REGISTROS), 0) AS TOTAL_REGISTROS,
+            NVL(TO_APPROX_COUNT_DISTINCT(APPROX_COUNT_DISTINCT_AGG(D.COLABORADORES_SKETCH)), 0) AS TOTAL_COLABORADORES,
+            NVL(SUM(D.CASOS_ESTRESSE_ALTO), 0) AS CASOS_ESTRESSE_ALTO,
+            NVL(SUM(D.CASOS_FELICIDADE_BAIXA), 0) AS CASOS_FELICIDADE_BAIXA,
+            MAX(D.ULTIMO_REGISTRO) AS ULTIMO_REGISTRO
+        FROM
+            DADOS D
+        JOIN
+            SETORES_WorkWell S ON D.SETOR_ID = S.ID
+        GROUP BY GROUPING SETS ((S.NOME), ())
+        ORDER BY
+            TOTAL_EMPRESA, SETOR_NOME
+    """,
+    
+    'compactar_resumo_diario': """
+        MERGE INTO RESUMO_DIARIO_WorkWell R
+        USING (
+            SELECT
+                EMPRESA_ID,
+                SETOR_ID,
+                TRUNC(DATA_REGISTRO) AS DIA,
+                SUM(NIVEL_ESTRESSE) AS SOMA_ESTRESSE,
+                SUM(NIVEL_FELICIDADE) AS SOMA_FELICIDADE,
+                SUM(NIVEL_ANSIEDADE) AS SOMA_ANSIEDADE,
+                SUM(NIVEL_MOTIVACAO) AS SOMA_MOTIVACAO,
+                COUNT(*) AS TOTAL_REGISTROS,
+                APPROX_COUNT_DISTINCT_DETAIL(COLABORADOR_ID) AS COLABORADORES_SKETCH,
+                COUNT(CASE WHEN NIVEL_ESTRESSE >= :limite_estresse THEN 1 END) AS CASOS_ESTRESSE_ALTO,
+                COUNT(CASE WHEN NIVEL_FELICIDADE <= :limite_felicidade THEN 1 END) AS CASOS_FELICIDADE_BAIXA,
+                MAX(DATA_REGISTRO) AS ULTIMO_REGISTRO
+            FROM REGISTROS_EMOCIONAIS_WorkWell
+            WHERE DATA_REGISTRO >= (
+                    SELECT LEAST(NVL(MAX(DIA) + 1, DATE '1900-01-01'), TRUNC(SYSDATE) - :dias_recompactar)
+                    FROM RESUMO_DIARIO_WorkWell
+                )
+              AND DATA_REGISTRO < TRUNC(SYSDATE)
+            GROUP BY EMPRESA_ID, SETOR_ID, TRUNC(DATA_REGISTRO)
+        ) N
+        ON (R.EMPRESA_ID = N.EMPRESA_ID AND R.SETOR_ID = N.SETOR_ID AND R.DIA = N.DIA)
+        WHEN MATCHED THEN UPDATE SET
+            R.SOMA_ESTRESSE = N.SOMA_ESTRESSE,
+            R.SOMA_FELICIDADE = N.SOMA_FELICIDADE,
+            R.SOMA_ANSIEDADE = N.SOMA_ANSIEDADE,
+            R.SOMA_MOTIVACAO = N.SOMA_MOTIVACAO,
+            R.TOTAL_REGISTROS = N.TOTAL_REGISTROS,
+            R.COLABORADORES_SKETCH = N.COLABORADORES_SKETCH,
+            R.CASOS_ESTRESSE_ALTO = N.CASOS_ESTRESSE_ALTO,
+            R.CASOS_FELICIDADE_BAIXA = N.CASOS_FELICIDADE_BAIXA,
+            R.ULTIMO_REGISTRO = N.ULTIMO_REGISTRO,
+            R.ATUALIZADO_EM = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN INSERT
+            (EMPRESA_ID, SETOR_ID, DIA, SOMA_ESTRESSE, SOMA_FELICIDADE, SOMA_ANSIEDADE, SOMA_MOTIVACAO,
+             TOTAL_REGISTROS, COLABORADORES_SKETCH, CASOS_ESTRESSE_ALTO, CASOS_FELICIDADE_BAIXA,
+             ULTIMO_REGISTRO, ATUALIZADO_EM)
+        VALUES
+            (N.EMPRESA_ID, N.SETOR_ID, N.DIA, N.SOMA_ESTRESSE, N.SOMA_FELICIDADE, N.SOMA_ANSIEDADE, N.SOMA_MOTIVACAO,
+             N.TOTAL_REGISTROS, N.COLABORADORES_SKETCH, N.CASOS_ESTRESSE_ALTO, N.CASOS_FELICIDADE_BAIXA,
+             N.ULTIMO_REGISTRO, SYSTIMESTAMP)
+    """,
+    
+    'exportar_registros': """
+        SELECT R.ID, R.DATA_REGISTRO, S.NOME AS SETOR, R.NIVEL_ESTRESSE, R.NIVEL_FELICIDADE,
+               R.NIVEL_ANSIEDADE, R.NIVEL_MOTIVACAO, R.SENTIMENTO_TEXTO, R.SCORE_SENTIMENTO
+        FROM REGISTROS_EMOCIONAIS_WorkWell R
+        JOIN SETORES_WorkWell S ON R.SETOR_ID = S.ID
+        WHERE R.EMPRESA_ID = :empresa_id
+          AND (:dias IS NULL OR R.DATA_REGISTRO >= SYSTIMESTAMP - NUMTODSINTERVAL(:dias, 'DAY'))
+        ORDER BY R.DATA_REGISTRO
+    """,
+    
+    # Usado tanto na inserção individual quanto na inserção em lote (executemany)
+    'inserir_registro': """
+        INSERT INTO REGISTROS_EMOCIONAIS_WorkWell
+        (COLABORADOR_ID, EMPRESA_ID, SETOR_ID, NIVEL_ESTRESSE, NIVEL_FELICIDADE,
+         NIVEL_ANSIEDADE, NIVEL_MOTIVACAO, COMENTARIO, ANONIMO, SENTIMENTO_TEXTO, SCORE_SENTIMENTO, DATA_REGISTRO)
+        VALUES
+        (:colaborador_id, 1, :setor_id, :estresse, :felicidade,
+         :ansiedade, :motivacao, :comentario, :anonimo, :sentimento, :score, SYSTIMESTAMP)
+        RETURNING ID INTO :registro_id
+    """,
+    
+    'atualizar_sentimento': """
+        UPDATE REGISTROS_EMOCIONAIS_WorkWell
+        SET SENTIMENTO_TEXTO = :sentimento,
+            SCORE_SENTIMENTO = :score
+        WHERE ID = :registro_id
+    """,
+    
+    'sentimento_registro': """
+        SELECT ID, SENTIMENTO_TEXTO, SCORE_SENTIMENTO,
+               CASE WHEN COMENTARIO IS NULL THEN 'N' ELSE 'S' END AS TEM_COMENTARIO
+        FROM REGISTROS_EMOCIONAIS_WorkWell
+        WHERE ID = :registro_id
+    """,
+    
+    'registros_sem_sentimento': """
+        SELECT ID, COMENTARIO
+        FROM REGISTROS_EMOCIONAIS_WorkWell
+        WHERE DATA_REGISTRO >= SYSTIMESTAMP - NUMTODSINTERVAL(:dias, 'DAY')
+          AND DATA_REGISTRO < SYSTIMESTAMP - NUMTODSINTERVAL(:espera, 'SECOND')
+          AND COMENTARIO IS NOT NULL
+          AND SENTIMENTO_TEXTO IS NULL
+          AND (SENTIMENTO_RESERVADO_EM IS NULL
+               OR SENTIMENTO_RESERVADO_EM < SYSTIMESTAMP - NUMTODSINTERVAL(:reserva, 'SECOND'))
+        ORDER BY DATA_REGISTRO
+        FETCH FIRST :limite ROWS ONLY
+    """,
+    
+    # Reserva de um registro pela varredura: só um processo consegue (rowcount 1)
+    # até a reserva vencer
+    'reservar_sentimento': """
+        UPDATE REGISTROS_EMOCIONAIS_WorkWell
+        SET SENTIMENTO_RESERVADO_EM = SYSTIMESTAMP
+        WHERE ID = :registro_id
+          AND SENTIMENTO_TEXTO IS NULL
+          AND (SENTIMENTO_RESERVADO_EM IS NULL
+               OR SENTIMENTO_RESERVADO_EM < SYSTIMESTAMP - NUMTODSINTERVAL(:reserva, 'SECOND'))
+    """
+}
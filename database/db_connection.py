@@ -5,6 +5,11 @@ import oracledb
 from config import Config
 import logging
 import os
+import time
+import threading
+from contextlib import contextmanager
+from database.backend import BancoDados, pa
+from database.consultas import RegistroConsultas, CONSULTAS_ORACLE
 
 # Inicializar Oracle Client de forma flexível
 # O oracledb pode funcionar em modo "thin" (sem Instant Client) ou "thick" (com Instant Client)
@@ -39,75 +44,285 @@ logger = logging.getLogger(__name__)
 from database.auto_create_tables import create_tables_if_not_exist
 
 
-class OracleDB:
-    """Gerenciador de conexão Oracle"""
+class OracleDB(BancoDados):
+    """
+    Gerenciador de conexão Oracle
+    
+    Usa um pool de sessões (oracledb.create_pool): cada operação adquire uma
+    sessão do pool e a devolve ao terminar, então requisições concorrentes do
+    Flask não ficam serializadas em uma única conexão. Sessões que caíram são
+    detectadas pelo ping do pool e substituídas automaticamente.
+    """
     
     def __init__(self):
         self.user = Config.ORACLE_USER
         self.password = Config.ORACLE_PASSWORD
         self.dsn = Config.ORACLE_DSN
-        self.connection = None
+        self.pool = None
+        self.consultas = RegistroConsultas(CONSULTAS_ORACLE)
+        
+        # Métricas de aquisição de sessões
+        self._lock_metricas = threading.Lock()
+        self.total_aquisicoes = 0
+        self.total_falhas_aquisicao = 0
+        self.tempo_espera_total = 0.0
+        self.tempo_espera_maximo = 0.0
+        
+        # Compactador do resumo diário
+        self._compactador = None
+        self._parar_compactador = threading.Event()
     
     def connect(self):
-        """Estabelece conexão com o banco"""
+        """Cria o pool de sessões com o banco"""
         try:
-            self.connection = oracledb.connect(
+            self.pool = oracledb.create_pool(
                 user=self.user,
                 password=self.password,
-                dsn=self.dsn
+                dsn=self.dsn,
+                min=Config.ORACLE_POOL_MIN,
+                max=Config.ORACLE_POOL_MAX,
+                increment=Config.ORACLE_POOL_INCREMENTO,
+                stmtcachesize=Config.ORACLE_STMT_CACHE,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=int(Config.ORACLE_POOL_TIMEOUT * 1000),
+                ping_interval=Config.ORACLE_POOL_PING
             )
-            logger.info("Conexao com Oracle estabelecida com sucesso!")
+            logger.info(f"Pool de conexoes Oracle criado com sucesso! "
+                        f"(min={Config.ORACLE_POOL_MIN}, max={Config.ORACLE_POOL_MAX}, "
+                        f"incremento={Config.ORACLE_POOL_INCREMENTO})")
             
             # Criação automática de tabelas
             try:
-                create_tables_if_not_exist(self.connection)
+                with self.conexao() as connection:
+                    create_tables_if_not_exist(connection)
                 logger.info("✅ Tabelas verificadas/criadas automaticamente")
             except Exception as e:
                 logger.warning(f"⚠️ Aviso ao criar tabelas (continuando): {e}")
             
-            return self.connection
+            return self.pool
         except oracledb.Error as error:
             logger.error(f"Erro ao conectar ao Oracle: {error}")
             raise
     
     def disconnect(self):
-        """Fecha a conexão com o banco"""
-        if self.connection:
-            self.connection.close()
+        """Fecha o pool e todas as sessões com o banco"""
+        self._parar_compactador.set()
+        if self.pool:
+            self.pool.close(force=True)
+            self.pool = None
             logger.info("Conexao com Oracle encerrada")
     
+    def esta_conectado(self):
+        """Indica se o pool de sessões foi criado"""
+        return self.pool is not None
+    
+    @contextmanager
+    def conexao(self):
+        """
+        Adquire uma sessão do pool e a devolve ao final do bloco
+        
+        Uso:
+            with db.conexao() as connection:
+                cursor = connection.cursor()
+        """
+        if self.pool is None:
+            raise RuntimeError("Pool Oracle não inicializado (chame db.connect())")
+        
+        inicio = time.perf_counter()
+        try:
+            connection = self.pool.acquire()
+        except oracledb.Error:
+            with self._lock_metricas:
+                self.total_falhas_aquisicao += 1
+            raise
+        espera = time.perf_counter() - inicio
+        
+        with self._lock_metricas:
+            self.total_aquisicoes += 1
+            self.tempo_espera_total += espera
+            self.tempo_espera_maximo = max(self.tempo_espera_maximo, espera)
+        
+        try:
+            yield connection
+        finally:
+            self.pool.release(connection)
+    
+    def estatisticas_pool(self):
+        """Retorna métricas de uso do pool de sessões"""
+        if self.pool is None:
+            return {'backend': 'oracle', 'conectado': False}
+        
+        with self._lock_metricas:
+            aquisicoes = self.total_aquisicoes
+            return {
+                'backend': 'oracle',
+                'conectado': True,
+                'min': self.pool.min,
+                'max': self.pool.max,
+                'incremento': self.pool.increment,
+                'abertas': self.pool.opened,
+                'em_uso': self.pool.busy,
+                'cache_statements': self.pool.stmtcachesize,
+                'aquisicoes': aquisicoes,
+                'falhas_aquisicao': self.total_falhas_aquisicao,
+                'espera_media_ms': round(self.tempo_espera_total / aquisicoes * 1000, 2) if aquisicoes else 0.0,
+                'espera_maxima_ms': round(self.tempo_espera_maximo * 1000, 2)
+            }
+    
     def execute_query(self, query, params=None):
         """Executa uma query SELECT e retorna resultados"""
         try:
-            cursor = self.connection.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            
-            columns = [col[0] for col in cursor.description]
-            results = []
-            for row in cursor:
-                results.append(dict(zip(columns, row)))
-            
-            cursor.close()
-            return results
+            with self.conexao() as connection:
+                cursor = connection.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                columns = [col[0] for col in cursor.description]
+                results = []
+                for row in cursor:
+                    results.append(dict(zip(columns, row)))
+                
+                cursor.close()
+                return results
         except oracledb.Error as error:
             logger.error(f"Erro ao executar query: {error}")
             raise
     
-    def execute_insert(self, query, params):
-        """Executa INSERT/UPDATE/DELETE"""
+    def iterar_query(self, query, params=None, arraysize=None, prefetchrows=None, como_dict=False):
+        """
+        Executa uma query SELECT e devolve as linhas sob demanda (generator)
+        
+        As linhas são buscadas em blocos de `arraysize` e a sessão fica presa
+        ao generator até ele terminar (ou ser fechado), então resultados
+        grandes nunca são montados inteiros em memória.
+        
+        Args:
+            query (str): SQL da consulta
+            params: Parâmetros de bind
+            arraysize (int): Linhas por ida ao banco (default: Config.ORACLE_ARRAYSIZE)
+            prefetchrows (int): Linhas trazidas já na execução (default: igual ao arraysize)
+            como_dict (bool): Gerar dicts (coluna -> valor) em vez de tuplas
+        
+        Yields:
+            tuple | dict: Uma linha por vez
+        """
+        arraysize = arraysize or Config.ORACLE_ARRAYSIZE
+        
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.arraysize = arraysize
+                cursor.prefetchrows = prefetchrows or arraysize
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                if como_dict:
+                    columns = [col[0] for col in cursor.description]
+                    cursor.rowfactory = lambda *row: dict(zip(columns, row))
+                
+                while True:
+                    linhas = cursor.fetchmany()
+                    if not linhas:
+                        break
+                    yield from linhas
+            except oracledb.Error as error:
+                logger.error(f"Erro ao executar query (streaming): {error}")
+                raise
+            finally:
+                cursor.close()
+    
+    def execute_query_colunar(self, query, params=None, formato='pandas', arraysize=None):
+        """
+        Executa uma query SELECT e retorna o resultado por colunas
+        
+        Com python-oracledb 3+ e pyarrow instalados, o próprio driver monta
+        as colunas (fetch_df_all, formato Arrow); caso contrário as linhas
+        são lidas em blocos e transpostas direto para arrays, sem criar um
+        dict por linha.
+        
+        Args:
+            query (str): SQL da consulta
+            params: Parâmetros de bind
+            formato (str): 'pandas' (DataFrame), 'numpy' (dict coluna -> ndarray) ou 'arrow' (pyarrow.Table)
+            arraysize (int): Linhas por ida ao banco (default: Config.ORACLE_ARRAYSIZE)
+        
+        Returns:
+            pd.DataFrame | dict | pyarrow.Table
+        """
+        self._validar_formato_colunar(formato)
+        
+        arraysize = arraysize or Config.ORACLE_ARRAYSIZE
+        
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            self.connection.commit()
-            cursor.close()
-            return True
+            with self.conexao() as connection:
+                if pa is not None and hasattr(connection, 'fetch_df_all'):
+                    tabela = pa.table(connection.fetch_df_all(query, params, arraysize=arraysize))
+                    if formato == 'arrow':
+                        return tabela
+                    if formato == 'pandas':
+                        return tabela.to_pandas()
+                    return {nome: tabela.column(nome).to_numpy() for nome in tabela.column_names}
+                
+                cursor = connection.cursor()
+                try:
+                    cursor.arraysize = arraysize
+                    cursor.prefetchrows = arraysize
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                    
+                    columns = [col[0] for col in cursor.description]
+                    valores = [[] for _ in columns]
+                    while True:
+                        linhas = cursor.fetchmany()
+                        if not linhas:
+                            break
+                        for coluna, bloco in zip(valores, zip(*linhas)):
+                            coluna.extend(bloco)
+                finally:
+                    cursor.close()
         except oracledb.Error as error:
-            logger.error(f"Erro ao executar INSERT: {error}")
-            self.connection.rollback()
+            logger.error(f"Erro ao executar query (colunar): {error}")
             raise
+        
+        return self._montar_colunar(columns, valores, formato)
+    
+    def iterar_registros_emocionais(self, empresa_id, dias=None):
+        """
+        Percorre os registros emocionais da empresa (exportações), um por vez
+        
+        Args:
+            empresa_id (int): ID da empresa
+            dias (int): Limitar aos últimos N dias (None = todo o histórico)
+        
+        Yields:
+            tuple: (ID, DATA_REGISTRO, SETOR, NIVEL_ESTRESSE, NIVEL_FELICIDADE,
+                    NIVEL_ANSIEDADE, NIVEL_MOTIVACAO, SENTIMENTO_TEXTO, SCORE_SENTIMENTO)
+        """
+        yield from self.consultas.medir_iteracao(
+            'exportar_registros',
+            lambda sql: self.iterar_query(sql, {'empresa_id': empresa_id, 'dias': dias})
+        )
+    
+    def execute_insert(self, query, params):
+        """Executa INSERT/UPDATE/DELETE"""
+        with self.conexao() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(query, params)
+                connection.commit()
+                cursor.close()
+                self._invalidar_agregados()
+                return True
+            except oracledb.Error as error:
+                logger.error(f"Erro ao executar INSERT: {error}")
+                connection.rollback()
+                raise
     
     def inserir_registro_emocional(self, colaborador_id, empresa_id, setor_id, nivel_estresse, nivel_felicidade, nivel_ansiedade, nivel_motivacao, comentario, sentimento_texto, score_sentimento):
         """Insere um novo registro emocional"""
@@ -121,139 +336,293 @@ class OracleDB:
     
     def obter_setores(self, empresa_id):
         """Retorna lista de setores da empresa"""
-        query = """
-            SELECT ID, NOME, DESCRICAO 
-            FROM SETORES_WorkWell 
-            WHERE EMPRESA_ID = :1
-            ORDER BY NOME
-        """
-        return self.execute_query(query, (empresa_id,))
+        return self.executar_consulta('setores', {'empresa_id': empresa_id})
     
-    def obter_dados_mapa_calor(self, empresa_id, dias=30):
+    def _consultar_dados_mapa_calor(self, empresa_id, dias):
         """Obtém dados para gerar mapa de calor"""
-        query = f"""
-        SELECT
-            S.NOME AS SETOR_NOME,
-            ROUND(AVG(R.NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
-            ROUND(AVG(R.NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
-            ROUND(AVG(R.NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
-            ROUND(AVG(R.NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
-            COUNT(R.ID) AS TOTAL_REGISTROS
-        FROM
-            REGISTROS_EMOCIONAIS_WorkWell R
-        JOIN
-            SETORES_WorkWell S ON R.SETOR_ID = S.ID
-        WHERE
-            R.EMPRESA_ID = :1
-            AND R.DATA_REGISTRO >= SYSTIMESTAMP - INTERVAL '{dias}' DAY
-        GROUP BY
-            S.NOME
-        ORDER BY
-            S.NOME
-        """
-        return self.execute_query(query, (empresa_id,))
+        if Config.RESUMO_DIARIO_ATIVO:
+            return self.executar_consulta('mapa_calor_resumo', self._params_resumo(empresa_id, dias))
+        return self.executar_consulta('mapa_calor', {'empresa_id': empresa_id, 'dias': dias})
     
-    def obter_estatisticas(self, empresa_id, dias=30):
+    def _consultar_estatisticas(self, empresa_id, dias):
         """Obtém estatísticas gerais da empresa"""
-        query = f"""
-        SELECT
-            ROUND(AVG(NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
-            ROUND(AVG(NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
-            ROUND(AVG(NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
-            ROUND(AVG(NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
-            COUNT(ID) AS TOTAL_REGISTROS,
-            COUNT(DISTINCT COLABORADOR_ID) AS TOTAL_COLABORADORES
-        FROM
-            REGISTROS_EMOCIONAIS_WorkWell
-        WHERE
-            EMPRESA_ID = :1
-            AND DATA_REGISTRO >= SYSTIMESTAMP - INTERVAL '{dias}' DAY
-        """
-        results = self.execute_query(query, (empresa_id,))
+        if Config.RESUMO_DIARIO_ATIVO:
+            results = self.executar_consulta('estatisticas_resumo', self._params_resumo(empresa_id, dias))
+        else:
+            results = self.executar_consulta('estatisticas', {'empresa_id': empresa_id, 'dias': dias})
         return results[0] if results else None
     
-    def obter_dashboard_rh(self, empresa_id):
-        """Retorna dados do dashboard RH"""
-        return self.obter_dados_mapa_calor(empresa_id, 30)
+    def _statement_dashboard(self, empresa_id, dias):
+        """Com o resumo diário ativo, o dashboard usa a mesma janela de 'mapa_calor_resumo'"""
+        nome, params = super()._statement_dashboard(empresa_id, dias)
+        if Config.RESUMO_DIARIO_ATIVO:
+            return 'dashboard_resumo', {**params, **self._params_resumo(empresa_id, dias)}
+        return nome, params
+    
+    @staticmethod
+    def _params_resumo(empresa_id, dias):
+        """Binds das consultas sobre o resumo diário (janela e dias ainda recalculados)"""
+        return {
+            'empresa_id': empresa_id,
+            'dias': dias,
+            'dias_recompactar': Config.RESUMO_DIARIO_DIAS_RECOMPACTAR
+        }
+    
+    # ==================== RESUMO DIÁRIO ====================
+    # RESUMO_DIARIO_WorkWell guarda somas, contagens, casos críticos, o último
+    # registro e um sketch de colaboradores distintos por (empresa, setor, dia)
+    # para os dias já compactados; hoje, os
+    # dias ainda não compactados e os que o compactador ainda recalcula
+    # (Config.RESUMO_DIARIO_DIAS_RECOMPACTAR) são lidos direto dos registros,
+    # então um registro aparece nas consultas assim que é inserido
+    # ('mapa_calor_resumo' / 'estatisticas_resumo' / 'dashboard_resumo' em
+    # consultas.py). Os casos críticos usam Config.LIMITE_ESTRESSE_ALTO e
+    # LIMITE_FELICIDADE_BAIXA vigentes na compactação de cada dia.
+    # O custo das consultas passa a depender de setores x dias, e não do número
+    # de registros.
+    
+    def compactar_resumo_diario(self, dias_recompactar=None):
+        """
+        Recalcula o resumo diário a partir dos registros
+        
+        Processa desde o dia seguinte ao último já resumido (todo o histórico na
+        primeira execução), sempre incluindo os últimos `dias_recompactar` dias
+        fechados para absorver registros que chegaram atrasados.
+        
+        Args:
+            dias_recompactar (int): Dias fechados recalculados em toda execução
+                (default: Config.RESUMO_DIARIO_DIAS_RECOMPACTAR)
+        
+        Returns:
+            int: Linhas do resumo inseridas/atualizadas
+        """
+        if dias_recompactar is None:
+            dias_recompactar = Config.RESUMO_DIARIO_DIAS_RECOMPACTAR
+        
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                with self.consultas.medir('compactar_resumo_diario') as sql:
+                    cursor.execute(sql, {
+                        'dias_recompactar': dias_recompactar,
+                        'limite_estresse': Config.LIMITE_ESTRESSE_ALTO,
+                        'limite_felicidade': Config.LIMITE_FELICIDADE_BAIXA
+                    })
+                linhas = cursor.rowcount
+                connection.commit()
+                logger.info(f"[OK] Resumo diário compactado ({linhas} linhas)")
+                return linhas
+            except oracledb.Error as e:
+                logger.error(f"[ERRO] Ao compactar resumo diário: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def iniciar_compactador(self, intervalo=None):
+        """
+        Compacta o resumo diário agora e depois periodicamente em uma thread daemon
+        
+        Args:
+            intervalo (float): Segundos entre compactações (default: Config.RESUMO_DIARIO_INTERVALO)
+        """
+        if self._compactador and self._compactador.is_alive():
+            return
+        
+        intervalo = Config.RESUMO_DIARIO_INTERVALO if intervalo is None else intervalo
+        
+        def _loop():
+            while True:
+                try:
+                    self.compactar_resumo_diario()
+                except Exception as e:
+                    logger.warning(f"⚠️ Compactação do resumo diário falhou (nova tentativa em {intervalo}s): {e}")
+                if self._parar_compactador.wait(intervalo):
+                    return
+        
+        self._parar_compactador.clear()
+        self._compactador = threading.Thread(target=_loop, name='compactador-resumo-diario', daemon=True)
+        self._compactador.start()
     
     def insert_registro_emocional(self, colaborador_id, setor_id, estresse, felicidade, ansiedade=5, motivacao=5, comentario='', anonimo='N'):
         """Insere um novo registro emocional no banco."""
-        try:
-            cursor = self.connection.cursor()
-            
-            # Variável de saída para capturar o ID gerado
-            registro_id_var = cursor.var(oracledb.NUMBER)
-            
-            # SQL de inserção com RETURNING para obter o ID gerado
-            sql = """
-                INSERT INTO REGISTROS_EMOCIONAIS_WorkWell 
-                (COLABORADOR_ID, EMPRESA_ID, SETOR_ID, NIVEL_ESTRESSE, NIVEL_FELICIDADE, 
-                 NIVEL_ANSIEDADE, NIVEL_MOTIVACAO, COMENTARIO, DATA_REGISTRO)
-                VALUES 
-                (:colaborador_id, 1, :setor_id, :estresse, :felicidade, 
-                 :ansiedade, :motivacao, :comentario, SYSTIMESTAMP)
-                RETURNING ID INTO :registro_id
-            """
-            
-            cursor.execute(sql, {
-                'colaborador_id': colaborador_id,
-                'setor_id': setor_id,
-                'estresse': estresse,
-                'felicidade': felicidade,
-                'ansiedade': ansiedade,
-                'motivacao': motivacao,
-                'comentario': comentario,
-                'registro_id': registro_id_var
-            })
-            
-            self.connection.commit()
-            
-            # Obter o ID gerado
-            registro_id = registro_id_var.getvalue()[0]
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                # Variável de saída para capturar o ID gerado
+                registro_id_var = cursor.var(oracledb.NUMBER)
+                
+                # Mesmo statement da inserção em lote, com RETURNING para obter o ID gerado
+                with self.consultas.medir('inserir_registro') as sql:
+                    cursor.execute(sql, {
+                        'colaborador_id': colaborador_id,
+                        'setor_id': setor_id,
+                        'estresse': estresse,
+                        'felicidade': felicidade,
+                        'ansiedade': ansiedade,
+                        'motivacao': motivacao,
+                        'comentario': comentario,
+                        'anonimo': anonimo,
+                        'sentimento': None,
+                        'score': None,
+                        'registro_id': registro_id_var
+                    })
+                
+                connection.commit()
+                self._invalidar_agregados(1)  # EMPRESA_ID fixo no INSERT
+                
+                # Obter o ID gerado
+                registro_id = registro_id_var.getvalue()[0]
+                
+                logger.info(f"[OK] Registro emocional inserido com sucesso (ID: {registro_id})")
+                return registro_id
             
-            logger.info(f"[OK] Registro emocional inserido com sucesso (ID: {registro_id})")
-            return registro_id
+            except oracledb.Error as e:
+                logger.error(f"[ERRO] Ao inserir registro emocional: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def insert_registros_emocionais_lote(self, registros):
+        """
+        Insere vários registros emocionais em uma única transação (array DML)
+        
+        Args:
+            registros (list): Dicts com colaborador_id, setor_id, estresse, felicidade,
+                ansiedade, motivacao, comentario e, opcionalmente, anonimo ('S'/'N'),
+                sentimento e score
+        
+        Returns:
+            list: IDs gerados, na mesma ordem dos registros
+        """
+        if not registros:
+            return []
+        
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                # Uma posição por registro; cada posição recebe a lista de IDs retornados
+                registro_id_var = cursor.var(oracledb.NUMBER, arraysize=len(registros))
+                
+                cursor.setinputsizes(registro_id=registro_id_var)
+                with self.consultas.medir('inserir_registro') as sql:
+                    cursor.executemany(sql, [{
+                        'colaborador_id': r['colaborador_id'],
+                        'setor_id': r['setor_id'],
+                        'estresse': r['estresse'],
+                        'felicidade': r['felicidade'],
+                        'ansiedade': r.get('ansiedade', 5),
+                        'motivacao': r.get('motivacao', 5),
+                        'comentario': r.get('comentario', ''),
+                        'anonimo': r.get('anonimo', 'N'),
+                        'sentimento': r.get('sentimento'),
+                        'score': r.get('score')
+                    } for r in registros])
+                
+                connection.commit()
+                self._invalidar_agregados(1)  # EMPRESA_ID fixo no INSERT
+                
+                registro_ids = [registro_id_var.getvalue(i)[0] for i in range(len(registros))]
+                
+                logger.info(f"[OK] {len(registro_ids)} registros emocionais inseridos em lote")
+                return registro_ids
             
-        except oracledb.Error as e:
-            logger.error(f"[ERRO] Ao inserir registro emocional: {e}")
-            self.connection.rollback()
-            raise
-        finally:
-            cursor.close()
+            except oracledb.Error as e:
+                logger.error(f"[ERRO] Ao inserir registros emocionais em lote: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
     
     def atualizar_sentimento(self, registro_id, sentimento, score):
         """Atualiza o sentimento e score de um registro emocional"""
-        try:
-            cursor = self.connection.cursor()
-            
-            sql = """
-                UPDATE REGISTROS_EMOCIONAIS_WorkWell
-                SET SENTIMENTO_TEXTO = :sentimento,
-                    SCORE_SENTIMENTO = :score
-                WHERE ID = :registro_id
-            """
-            
-            cursor.execute(sql, {
-                'sentimento': sentimento,
-                'score': score,
-                'registro_id': registro_id
-            })
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                with self.consultas.medir('atualizar_sentimento') as sql:
+                    cursor.execute(sql, {
+                        'sentimento': sentimento,
+                        'score': score,
+                        'registro_id': registro_id
+                    })
+                
+                connection.commit()
+                logger.info(f"[OK] Sentimento atualizado para registro {registro_id}")
             
-            self.connection.commit()
-            logger.info(f"[OK] Sentimento atualizado para registro {registro_id}")
+            except oracledb.Error as e:
+                logger.error(f"[ERRO] Ao atualizar sentimento: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def atualizar_sentimentos_lote(self, atualizacoes):
+        """
+        Atualiza sentimento e score de vários registros em uma única transação
+        
+        Args:
+            atualizacoes (list): Tuplas (registro_id, sentimento, score)
+        
+        Returns:
+            int: Quantidade de registros atualizados
+        """
+        if not atualizacoes:
+            return 0
+        
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                with self.consultas.medir('atualizar_sentimento') as sql:
+                    cursor.executemany(sql, [{
+                        'sentimento': sentimento,
+                        'score': score,
+                        'registro_id': registro_id
+                    } for registro_id, sentimento, score in atualizacoes])
+                
+                connection.commit()
+                logger.info(f"[OK] Sentimento atualizado para {len(atualizacoes)} registros")
+                return cursor.rowcount
             
-        except oracledb.Error as e:
-            logger.error(f"[ERRO] Ao atualizar sentimento: {e}")
-            self.connection.rollback()
-            raise
-        finally:
-            cursor.close()
+            except oracledb.Error as e:
+                logger.error(f"[ERRO] Ao atualizar sentimentos em lote: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def obter_sentimento_registro(self, registro_id):
+        """Retorna sentimento e score gravados para um registro (ou None se não existir)"""
+        results = self.executar_consulta('sentimento_registro', {'registro_id': registro_id})
+        return results[0] if results else None
+    
+    def reservar_registros_sentimento(self, registro_ids, reserva_segundos):
+        """Reserva os registros com um UPDATE em lote (contagem de linhas por registro)"""
+        if not registro_ids:
+            return []
+        
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                with self.consultas.medir('reservar_sentimento') as sql:
+                    cursor.executemany(sql, [
+                        {'registro_id': registro_id, 'reserva': reserva_segundos}
+                        for registro_id in registro_ids
+                    ], arraydmlrowcounts=True)
+                contagens = cursor.getarraydmlrowcounts()
+                connection.commit()
+                return [registro_id for registro_id, linhas in zip(registro_ids, contagens) if linhas]
+            except oracledb.Error as e:
+                logger.error(f"[ERRO] Ao reservar registros para enriquecimento: {e}")
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
 
 
-# Instância global
-db = OracleDB()
-try:
-    db.connect()
-except Exception as e:
-    logger.error(f"Erro ao conectar ao banco na inicializacao: {e}")
-    db.connection = None
+# Instância global (a conexão é aberta por quem inicializa a aplicação: app.py / run.sh)
+if Config.DB_BACKEND == 'sqlite':
+    from database.sqlite_db import SQLiteDB
+    db = SQLiteDB(Config.SQLITE_CAMINHO)
+else:
+    db = OracleDB()
@@ -0,0 +1,320 @@
+"""
+Work Well - Migrações versionadas do schema Oracle
+Cada migração é aplicada uma única vez e registrada em SCHEMA_MIGRACOES_WorkWell
+
+Execute: python -m database.migrations   (aplica as pendentes e lista o status)
+"""
+import oracledb
+from config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Erros que indicam que o objeto já existe (bancos criados antes das migrações)
+ERROS_JA_EXISTE = {
+    955,   # ORA-00955: nome já usado por um objeto existente
+    1408,  # ORA-01408: lista de colunas já indexada
+    1430,  # ORA-01430: coluna já existe na tabela
+    1442,  # ORA-01442: coluna já é NOT NULL
+    2260,  # ORA-02260: tabela só pode ter uma chave primária
+    2261,  # ORA-02261: chave única ou primária já existe
+    2275,  # ORA-02275: restrição referencial já existe
+}
+
+TABELA_CONTROLE = """CREATE TABLE SCHEMA_MIGRACOES_WorkWell (
+    VERSAO NUMBER PRIMARY KEY,
+    DESCRICAO VARCHAR2(255) NOT NULL,
+    APLICADA_EM TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+
+MIGRACOES = [
+    {
+        'versao': 1,
+        'descricao': 'Tabelas base (empresas, setores, colaboradores, registros, resumo diário)',
+        'sql': [
+            """CREATE TABLE EMPRESAS_WorkWell (
+                ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+                NOME VARCHAR2(255) NOT NULL,
+                CNPJ VARCHAR2(18) UNIQUE NOT NULL,
+                DATA_CADASTRO TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )""",
+            """CREATE TABLE SETORES_WorkWell (
+                ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+                EMPRESA_ID NUMBER NOT NULL,
+                NOME VARCHAR2(255) NOT NULL,
+                DESCRICAO VARCHAR2(500),
+                CONSTRAINT FK_SETOR_EMPRESA_WW FOREIGN KEY (EMPRESA_ID) REFERENCES EMPRESAS_WorkWell(ID)
+            )""",
+            """CREATE TABLE COLABORADORES_WorkWell (
+                ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+                EMPRESA_ID NUMBER NOT NULL,
+                SETOR_ID NUMBER,
+                CODIGO_ACESSO VARCHAR2(255) UNIQUE NOT NULL,
+                DATA_CADASTRO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT FK_COLAB_EMPRESA_WW FOREIGN KEY (EMPRESA_ID) REFERENCES EMPRESAS_WorkWell(ID),
+                CONSTRAINT FK_COLAB_SETOR_WW FOREIGN KEY (SETOR_ID) REFERENCES SETORES_WorkWell(ID)
+            )""",
+            """CREATE TABLE REGISTROS_EMOCIONAIS_WorkWell (
+                ID NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+                COLABORADOR_ID NUMBER,
+                EMPRESA_ID NUMBER NOT NULL,
+                SETOR_ID NUMBER NOT NULL,
+                NIVEL_ESTRESSE NUMBER(2) NOT NULL,
+                NIVEL_FELICIDADE NUMBER(2) NOT NULL,
+                NIVEL_ANSIEDADE NUMBER(2) DEFAULT 5 NOT NULL,
+                NIVEL_MOTIVACAO NUMBER(2) DEFAULT 5 NOT NULL,
+                COMENTARIO VARCHAR2(1000),
+                SENTIMENTO_TEXTO VARCHAR2(50),
+                SCORE_SENTIMENTO NUMBER(5,2),
+                DATA_REGISTRO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT CK_ESTRESSE CHECK (NIVEL_ESTRESSE BETWEEN 1 AND 10),
+                CONSTRAINT CK_FELICIDADE CHECK (NIVEL_FELICIDADE BETWEEN 1 AND 10),
+                CONSTRAINT CK_ANSIEDADE CHECK (NIVEL_ANSIEDADE BETWEEN 1 AND 10),
+                CONSTRAINT CK_MOTIVACAO CHECK (NIVEL_MOTIVACAO BETWEEN 1 AND 10),
+                CONSTRAINT FK_REG_COLAB_WW FOREIGN KEY (COLABORADOR_ID) REFERENCES COLABORADORES_WorkWell(ID),
+                CONSTRAINT FK_REG_EMPRESA_WW FOREIGN KEY (EMPRESA_ID) REFERENCES EMPRESAS_WorkWell(ID),
+                CONSTRAINT FK_REG_SETOR_WW FOREIGN KEY (SETOR_ID) REFERENCES SETORES_WorkWell(ID)
+            )""",
+            """CREATE TABLE RESUMO_DIARIO_WorkWell (
+                EMPRESA_ID NUMBER NOT NULL,
+                SETOR_ID NUMBER NOT NULL,
+                DIA DATE NOT NULL,
+                SOMA_ESTRESSE NUMBER NOT NULL,
+                SOMA_FELICIDADE NUMBER NOT NULL,
+                SOMA_ANSIEDADE NUMBER NOT NULL,
+                SOMA_MOTIVACAO NUMBER NOT NULL,
+                TOTAL_REGISTROS NUMBER NOT NULL,
+                COLABORADORES_SKETCH BLOB,
+                ATUALIZADO_EM TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT PK_RESUMO_DIARIO_WW PRIMARY KEY (EMPRESA_ID, DIA, SETOR_ID)
+            )"""
+        ]
+    },
+    {
+        'versao': 2,
+        'descricao': 'Índices de cobertura para as consultas agregadas por janela de tempo',
+        'sql': [
+            # Mapa de calor / estatísticas / leitura do dia corrente: filtro por empresa + data,
+            # com todas as colunas agregadas no próprio índice (sem acesso à tabela)
+            """CREATE INDEX IDX_REG_EMPRESA_DATA_WW ON REGISTROS_EMOCIONAIS_WorkWell
+                (EMPRESA_ID, DATA_REGISTRO, SETOR_ID, NIVEL_ESTRESSE, NIVEL_FELICIDADE,
+                 NIVEL_ANSIEDADE, NIVEL_MOTIVACAO, COLABORADOR_ID)""",
+            # Consultas por setor na janela
+            """CREATE INDEX IDX_REG_SETOR_DATA_WW ON REGISTROS_EMOCIONAIS_WorkWell
+                (SETOR_ID, DATA_REGISTRO, NIVEL_ESTRESSE, NIVEL_FELICIDADE)""",
+            # Compactação do resumo diário (varre por data, sem empresa)
+            """CREATE INDEX IDX_REG_DATA_WW ON REGISTROS_EMOCIONAIS_WorkWell (DATA_REGISTRO)""",
+            # Chaves estrangeiras (evita lock de tabela em DELETE/UPDATE do pai)
+            """CREATE INDEX IDX_REG_COLABORADOR_WW ON REGISTROS_EMOCIONAIS_WorkWell (COLABORADOR_ID)""",
+            """CREATE INDEX IDX_SETORES_EMPRESA_WW ON SETORES_WorkWell (EMPRESA_ID, NOME)""",
+            """CREATE INDEX IDX_COLAB_EMPRESA_WW ON COLABORADORES_WorkWell (EMPRESA_ID, SETOR_ID)"""
+        ]
+    },
+    {
+        'versao': 3,
+        'descricao': 'Unificação com o schema de referência (schema.sql)',
+        'sql': [
+            """ALTER TABLE EMPRESAS_WorkWell ADD (
+                ATIVO CHAR(1) DEFAULT 'S' NOT NULL CONSTRAINT CK_EMPRESA_ATIVO_WW CHECK (ATIVO IN ('S', 'N'))
+            )""",
+            """ALTER TABLE COLABORADORES_WorkWell ADD (
+                ATIVO CHAR(1) DEFAULT 'S' NOT NULL CONSTRAINT CK_COLAB_ATIVO_WW CHECK (ATIVO IN ('S', 'N'))
+            )""",
+            """ALTER TABLE REGISTROS_EMOCIONAIS_WorkWell ADD (
+                ANONIMO CHAR(1) DEFAULT 'N' NOT NULL CONSTRAINT CK_REG_ANONIMO_WW CHECK (ANONIMO IN ('S', 'N'))
+            )"""
+        ]
+    },
+    {
+        'versao': 4,
+        'descricao': 'Particionamento mensal (intervalo) de REGISTROS_EMOCIONAIS_WorkWell por DATA_REGISTRO',
+        # Requer Oracle 12.2+ com a opção de particionamento; só roda se habilitado
+        'habilitada': lambda: Config.MIGRACAO_PARTICIONAR_REGISTROS,
+        'sql': [
+            # A chave de partição não aceita NULL (ORA-14300), e DATA_REGISTRO foi
+            # criada anulável. Registros sem data nunca entraram em nenhuma janela
+            # (DATA_REGISTRO >= ...); com uma data anterior à partição inicial
+            # continuam fora delas
+            """UPDATE REGISTROS_EMOCIONAIS_WorkWell
+                SET DATA_REGISTRO = TIMESTAMP '2000-01-01 00:00:00'
+                WHERE DATA_REGISTRO IS NULL""",
+            """ALTER TABLE REGISTROS_EMOCIONAIS_WorkWell MODIFY (DATA_REGISTRO DEFAULT CURRENT_TIMESTAMP NOT NULL)""",
+            """ALTER TABLE REGISTROS_EMOCIONAIS_WorkWell MODIFY
+                PARTITION BY RANGE (DATA_REGISTRO) INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+                (PARTITION P_REGISTROS_INICIAL VALUES LESS THAN (TIMESTAMP '2024-01-01 00:00:00'))
+                ONLINE
+                UPDATE INDEXES (
+                    IDX_REG_EMPRESA_DATA_WW LOCAL,
+                    IDX_REG_SETOR_DATA_WW LOCAL,
+                    IDX_REG_DATA_WW LOCAL
+                )"""
+        ]
+    },
+    {
+        'versao': 5,
+        'descricao': 'Setor único por (EMPRESA_ID, NOME), unificando setores duplicados',
+        'sql': [
+            # Setores com o mesmo nome na empresa viram o de menor ID: registros e
+            # colaboradores são remapeados e o resumo diário dos setores envolvidos
+            # é refeito a partir dos registros (dias fechados; os demais são lidos
+            # dos registros e compactados depois)
+            """BEGIN
+                FOR D IN (
+                    SELECT ID, MANTIDO
+                    FROM (
+                        SELECT ID, MIN(ID) OVER (PARTITION BY EMPRESA_ID, NOME) AS MANTIDO
+                        FROM SETORES_WorkWell
+                    )
+                    WHERE ID <> MANTIDO
+                ) LOOP
+                    UPDATE REGISTROS_EMOCIONAIS_WorkWell SET SETOR_ID = D.MANTIDO WHERE SETOR_ID = D.ID;
+                    UPDATE COLABORADORES_WorkWell SET SETOR_ID = D.MANTIDO WHERE SETOR_ID = D.ID;
+                    DELETE FROM RESUMO_DIARIO_WorkWell WHERE SETOR_ID IN (D.ID, D.MANTIDO);
+                    INSERT INTO RESUMO_DIARIO_WorkWell
+                        (EMPRESA_ID, SETOR_ID, DIA, SOMA_ESTRESSE, SOMA_FELICIDADE, SOMA_ANSIEDADE, SOMA_MOTIVACAO,
+                         TOTAL_REGISTROS, COLABORADORES_SKETCH, ATUALIZADO_EM)
+                    SELECT EMPRESA_ID, SETOR_ID, TRUNC(DATA_REGISTRO), SUM(NIVEL_ESTRESSE), SUM(NIVEL_FELICIDADE),
+                           SUM(NIVEL_ANSIEDADE), SUM(NIVEL_MOTIVACAO), COUNT(*),
+                           APPROX_COUNT_DISTINCT_DETAIL(COLABORADOR_ID), SYSTIMESTAMP
+                    FROM REGISTROS_EMOCIONAIS_WorkWell
+                    WHERE SETOR_ID = D.MANTIDO
+                      AND DATA_REGISTRO < TRUNC(SYSDATE)
+                    GROUP BY EMPRESA_ID, SETOR_ID, TRUNC(DATA_REGISTRO);
+                    DELETE FROM SETORES_WorkWell WHERE ID = D.ID;
+                END LOOP;
+            END;""",
+            """ALTER TABLE SETORES_WorkWell ADD CONSTRAINT UK_SETOR_EMPRESA_WW UNIQUE (EMPRESA_ID, NOME)"""
+        ]
+    },
+    {
+        'versao': 6,
+        'descricao': 'Casos críticos e último registro no resumo diário (dashboard)',
+        'sql': [
+            """ALTER TABLE RESUMO_DIARIO_WorkWell ADD (
+                CASOS_ESTRESSE_ALTO NUMBER DEFAULT 0 NOT NULL,
+                CASOS_FELICIDADE_BAIXA NUMBER DEFAULT 0 NOT NULL,
+                ULTIMO_REGISTRO TIMESTAMP
+            )""",
+            # Os dias já compactados não têm as novas colunas: o resumo é esvaziado
+            # e o compactador o refaz inteiro (até lá, as consultas leem os registros)
+            """DELETE FROM RESUMO_DIARIO_WorkWell"""
+        ]
+    },
+    {
+        'versao': 7,
+        'descricao': 'Reserva de registros pela varredura de enriquecimento (vários processos)',
+        'sql': [
+            """ALTER TABLE REGISTROS_EMOCIONAIS_WorkWell ADD (SENTIMENTO_RESERVADO_EM TIMESTAMP)"""
+        ]
+    }
+]
+
+
+def _executar_tolerante(cursor, sql):
+    """Executa um DDL, ignorando erros de 'objeto já existe'"""
+    try:
+        cursor.execute(sql)
+    except oracledb.Error as e:
+        error_obj, = e.args
+        if error_obj.code not in ERROS_JA_EXISTE:
+            raise
+        logger.info(f"ℹ️ Objeto já existe (pulando): ORA-{error_obj.code:05d}")
+
+
+def versoes_aplicadas(connection):
+    """
+    Retorna as versões já aplicadas (cria a tabela de controle se necessário)
+    
+    Returns:
+        set: Números das versões registradas
+    """
+    cursor = connection.cursor()
+    try:
+        _executar_tolerante(cursor, TABELA_CONTROLE)
+        cursor.execute("SELECT VERSAO FROM SCHEMA_MIGRACOES_WorkWell")
+        return {int(versao) for versao, in cursor}
+    finally:
+        cursor.close()
+
+
+def aplicar_migracoes(connection):
+    """
+    Aplica, em ordem, as migrações ainda não registradas
+    
+    DDL no Oracle faz commit implícito; por isso cada comando tolera objetos
+    já existentes e a versão só é registrada depois que todos os comandos
+    dela passaram. Migrações desabilitadas ficam pendentes.
+    
+    Args:
+        connection: Conexão Oracle
+    
+    Returns:
+        list: Versões aplicadas nesta execução
+    
+    Raises:
+        RuntimeError: Uma migração falhou; as seguintes não são aplicadas e a
+            mensagem indica a versão e o erro do banco a corrigir
+    """
+    aplicadas = versoes_aplicadas(connection)
+    novas = []
+    cursor = connection.cursor()
+    
+    try:
+        for migracao in sorted(MIGRACOES, key=lambda m: m['versao']):
+            versao = migracao['versao']
+            if versao in aplicadas:
+                continue
+            
+            habilitada = migracao.get('habilitada')
+            if habilitada and not habilitada():
+                logger.info(f"ℹ️ Migração {versao} desabilitada (pendente): {migracao['descricao']}")
+                continue
+            
+            logger.info(f"🔄 Aplicando migração {versao}: {migracao['descricao']}")
+            try:
+                for sql in migracao['sql']:
+                    _executar_tolerante(cursor, sql)
+                cursor.execute(
+                    "INSERT INTO SCHEMA_MIGRACOES_WorkWell (VERSAO, DESCRICAO) VALUES (:1, :2)",
+                    (versao, migracao['descricao'])
+                )
+                connection.commit()
+            except oracledb.Error as e:
+                connection.rollback()
+                raise RuntimeError(
+                    f"Migração {versao} ({migracao['descricao']}) falhou: {e}. "
+                    f"As migrações seguintes não foram aplicadas; corrija o banco e execute "
+                    f"'python -m database.migrations'"
+                ) from e
+            
+            novas.append(versao)
+            logger.info(f"✅ Migração {versao} aplicada")
+    finally:
+        cursor.close()
+    
+    return novas
+
+
+def status_migracoes(connection):
+    """Lista todas as migrações com a indicação de aplicada ou pendente"""
+    aplicadas = versoes_aplicadas(connection)
+    return [
+        {'versao': m['versao'], 'descricao': m['descricao'], 'aplicada': m['versao'] in aplicadas}
+        for m in sorted(MIGRACOES, key=lambda m: m['versao'])
+    ]
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    from database.db_connection import OracleDB
+    
+    banco = OracleDB()
+    banco.connect()  # Aplica as migrações pendentes
+    try:
+        with banco.conexao() as connection:
+            for item in status_migracoes(connection):
+                marca = '✅' if item['aplicada'] else '⏳'
+                print(f"{marca} {item['versao']:>3}  {item['descricao']}")
+    finally:
+        banco.disconnect()
@@ -0,0 +1,573 @@
+"""
+Work Well - Backend SQLite (embutido)
+Mesma interface do OracleDB para testes de carga locais e instalações de um só nó
+"""
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from config import Config
+from database.backend import BancoDados
+from database.consultas import RegistroConsultas
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Mesmas tabelas e índices de migrations.py, no dialeto do SQLite
+TABELAS_SQL = [
+    """CREATE TABLE IF NOT EXISTS EMPRESAS_WorkWell (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        NOME TEXT NOT NULL,
+        CNPJ TEXT UNIQUE NOT NULL,
+        DATA_CADASTRO TEXT DEFAULT CURRENT_TIMESTAMP,
+        ATIVO TEXT DEFAULT 'S' NOT NULL CHECK (ATIVO IN ('S', 'N'))
+    )""",
+    """CREATE TABLE IF NOT EXISTS SETORES_WorkWell (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        EMPRESA_ID INTEGER NOT NULL REFERENCES EMPRESAS_WorkWell(ID),
+        NOME TEXT NOT NULL,
+        DESCRICAO TEXT,
+        UNIQUE (EMPRESA_ID, NOME)
+    )""",
+    """CREATE TABLE IF NOT EXISTS COLABORADORES_WorkWell (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        EMPRESA_ID INTEGER NOT NULL REFERENCES EMPRESAS_WorkWell(ID),
+        SETOR_ID INTEGER REFERENCES SETORES_WorkWell(ID),
+        CODIGO_ACESSO TEXT UNIQUE NOT NULL,
+        DATA_CADASTRO TEXT DEFAULT CURRENT_TIMESTAMP,
+        ATIVO TEXT DEFAULT 'S' NOT NULL CHECK (ATIVO IN ('S', 'N'))
+    )""",
+    """CREATE TABLE IF NOT EXISTS REGISTROS_EMOCIONAIS_WorkWell (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        COLABORADOR_ID INTEGER REFERENCES COLABORADORES_WorkWell(ID),
+        EMPRESA_ID INTEGER NOT NULL REFERENCES EMPRESAS_WorkWell(ID),
+        SETOR_ID INTEGER NOT NULL REFERENCES SETORES_WorkWell(ID),
+        NIVEL_ESTRESSE INTEGER NOT NULL CHECK (NIVEL_ESTRESSE BETWEEN 1 AND 10),
+        NIVEL_FELICIDADE INTEGER NOT NULL CHECK (NIVEL_FELICIDADE BETWEEN 1 AND 10),
+        NIVEL_ANSIEDADE INTEGER DEFAULT 5 NOT NULL CHECK (NIVEL_ANSIEDADE BETWEEN 1 AND 10),
+        NIVEL_MOTIVACAO INTEGER DEFAULT 5 NOT NULL CHECK (NIVEL_MOTIVACAO BETWEEN 1 AND 10),
+        COMENTARIO TEXT,
+        SENTIMENTO_TEXTO TEXT,
+        SCORE_SENTIMENTO REAL,
+        DATA_REGISTRO TEXT DEFAULT CURRENT_TIMESTAMP,
+        ANONIMO TEXT DEFAULT 'N' NOT NULL CHECK (ANONIMO IN ('S', 'N')),
+        SENTIMENTO_RESERVADO_EM TEXT
+    )""",
+    """CREATE INDEX IF NOT EXISTS IDX_REG_EMPRESA_DATA_WW ON REGISTROS_EMOCIONAIS_WorkWell
+        (EMPRESA_ID, DATA_REGISTRO, SETOR_ID, NIVEL_ESTRESSE, NIVEL_FELICIDADE,
+         NIVEL_ANSIEDADE, NIVEL_MOTIVACAO, COLABORADOR_ID)""",
+    """CREATE INDEX IF NOT EXISTS IDX_REG_SETOR_DATA_WW ON REGISTROS_EMOCIONAIS_WorkWell
+        (SETOR_ID, DATA_REGISTRO, NIVEL_ESTRESSE, NIVEL_FELICIDADE)""",
+    """CREATE INDEX IF NOT EXISTS IDX_REG_COLABORADOR_WW ON REGISTROS_EMOCIONAIS_WorkWell (COLABORADOR_ID)"""
+]
+
+# Colunas acrescentadas depois da criação das tabelas: (tabela, coluna, tipo),
+# adicionadas com ALTER TABLE em bancos criados antes delas
+COLUNAS_ADICIONADAS = [
+    ('REGISTROS_EMOCIONAIS_WorkWell', 'SENTIMENTO_RESERVADO_EM', 'TEXT')
+]
+
+# Mesmos dados iniciais de auto_create_tables.insert_initial_data()
+EMPRESA_INICIAL = ('FIAP Tecnologia S.A.', '12.345.678/0001-99')
+SETORES_INICIAIS = [
+    (1, 'Desenvolvimento', 'Equipe de desenvolvimento de software'),
+    (1, 'Recursos Humanos', 'Gestão de pessoas e cultura'),
+    (1, 'Marketing', 'Estratégias de comunicação'),
+    (1, 'Engenharia', 'Equipe de engenharia'),
+    (1, 'Financeiro', 'Contabilidade e Finanças')
+]
+COLABORADORES_INICIAIS = [
+    (1, 1, 'FIAPDEV001'),
+    (1, 1, 'FIAPDEV002'),
+    (1, 2, 'FIAPRH001'),
+    (1, 3, 'FIAPMKT001')
+]
+
+
+# Statements nomeados (ver database/consultas.py), no dialeto do SQLite
+CONSULTAS_SQLITE = {
+    'setores': """
+        SELECT ID, NOME, DESCRICAO
+        FROM SETORES_WorkWell
+        WHERE EMPRESA_ID = :empresa_id
+        ORDER BY NOME
+    """,
+    
+    'mapa_calor': """
+        SELECT
+            S.NOME AS SETOR_NOME,
+            ROUND(AVG(R.NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
+            ROUND(AVG(R.NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
+            ROUND(AVG(R.NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
+            ROUND(AVG(R.NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
+            COUNT(R.ID) AS TOTAL_REGISTROS
+        FROM
+            REGISTROS_EMOCIONAIS_WorkWell R
+        JOIN
+            SETORES_WorkWell S ON R.SETOR_ID = S.ID
+        WHERE
+            R.EMPRESA_ID = :empresa_id
+            AND R.DATA_REGISTRO >= datetime('now', '-' || :dias || ' days')
+        GROUP BY
+            S.NOME
+        ORDER BY
+            S.NOME
+    """,
+    
+    'estatisticas': """
+        SELECT
+            ROUND(AVG(NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
+            ROUND(AVG(NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
+            ROUND(AVG(NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
+            ROUND(AVG(NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
+            COUNT(ID) AS TOTAL_REGISTROS,
+            COUNT(DISTINCT COLABORADOR_ID) AS TOTAL_COLABORADORES
+        FROM
+            REGISTROS_EMOCIONAIS_WorkWell
+        WHERE
+            EMPRESA_ID = :empresa_id
+            AND DATA_REGISTRO >= datetime('now', '-' || :dias || ' days')
+    """,
+    
+    # Sem GROUPING SETS no SQLite: setores e total da empresa na mesma consulta com UNION ALL
+    'dashboard': """
+        WITH JANELA AS (
+            SELECT R.*, S.NOME AS SETOR_NOME
+            FROM REGISTROS_EMOCIONAIS_WorkWell R
+            JOIN SETORES_WorkWell S ON R.SETOR_ID = S.ID
+            WHERE R.EMPRESA_ID = :empresa_id
+              AND R.DATA_REGISTRO >= datetime('now', '-' || :dias || ' days')
+        )
+        SELECT * FROM (
+            SELECT
+                0 AS TOTAL_EMPRESA,
+                SETOR_NOME,
+                ROUND(AVG(NIVEL_ESTRESSE), 1) AS MEDIA_ESTRESSE,
+                ROUND(AVG(NIVEL_FELICIDADE), 1) AS MEDIA_FELICIDADE,
+                ROUND(AVG(NIVEL_ANSIEDADE), 1) AS MEDIA_ANSIEDADE,
+                ROUND(AVG(NIVEL_MOTIVACAO), 1) AS MEDIA_MOTIVACAO,
+                COUNT(ID) AS TOTAL_REGISTROS,
+                COUNT(DISTINCT COLABORADOR_ID) AS TOTAL_COLABORADORES,
+                COUNT(CASE WHEN NIVEL_ESTRESSE >= :limite_estresse THEN 1 END) AS CASOS_ESTRESSE_ALTO,
+                COUNT(CASE WHEN NIVEL_FELICIDADE <= :limite_felicidade THEN 1 END) AS CASOS_FELICIDADE_BAIXA,
+                MAX(DATA_REGISTRO) AS ULTIMO_REGISTRO
+            FROM JANELA
+            GROUP BY SETOR_NOME
+            UNION ALL
+            SELECT
+                1, NULL,
+                ROUND(AVG(NIVEL_ESTRESSE), 1),
+                ROUND(AVG(NIVEL_FELICIDADE), 1),
+                ROUND(AVG(NIVEL_ANSIEDADE), 1),
+                ROUND(AVG(NIVEL_MOTIVACAO), 1),
+                COUNT(ID),
+                COUNT(DISTINCT COLABORADOR_ID),
+                COUNT(CASE WHEN NIVEL_ESTRESSE >= :limite_estresse THEN 1 END),
+                COUNT(CASE WHEN NIVEL_FELICIDADE <= :limite_felicidade THEN 1 END),
+                MAX(DATA_REGISTRO)
+            FROM JANELA
+        )
+        ORDER BY TOTAL_EMPRESA, SETOR_NOME
+    """,
+    
+    'exportar_registros': """
+        SELECT R.ID, R.DATA_REGISTRO, S.NOME AS SETOR, R.NIVEL_ESTRESSE, R.NIVEL_FELICIDADE,
+               R.NIVEL_ANSIEDADE, R.NIVEL_MOTIVACAO, R.SENTIMENTO_TEXTO, R.SCORE_SENTIMENTO
+        FROM REGISTROS_EMOCIONAIS_WorkWell R
+        JOIN SETORES_WorkWell S ON R.SETOR_ID = S.ID
+        WHERE R.EMPRESA_ID = :empresa_id
+          AND (:dias IS NULL OR R.DATA_REGISTRO >= datetime('now', '-' || :dias || ' days'))
+        ORDER BY R.DATA_REGISTRO
+    """,
+    
+    'inserir_registro': """
+        INSERT INTO REGISTROS_EMOCIONAIS_WorkWell
+        (COLABORADOR_ID, EMPRESA_ID, SETOR_ID, NIVEL_ESTRESSE, NIVEL_FELICIDADE,
+         NIVEL_ANSIEDADE, NIVEL_MOTIVACAO, COMENTARIO, ANONIMO, SENTIMENTO_TEXTO, SCORE_SENTIMENTO, DATA_REGISTRO)
+        VALUES
+        (:colaborador_id, 1, :setor_id, :estresse, :felicidade,
+         :ansiedade, :motivacao, :comentario, :anonimo, :sentimento, :score, CURRENT_TIMESTAMP)
+    """,
+    
+    'atualizar_sentimento': """
+        UPDATE REGISTROS_EMOCIONAIS_WorkWell
+        SET SENTIMENTO_TEXTO = :sentimento,
+            SCORE_SENTIMENTO = :score
+        WHERE ID = :registro_id
+    """,
+    
+    'sentimento_registro': """
+        SELECT ID, SENTIMENTO_TEXTO, SCORE_SENTIMENTO,
+               CASE WHEN COALESCE(COMENTARIO, '') = '' THEN 'N' ELSE 'S' END AS TEM_COMENTARIO
+        FROM REGISTROS_EMOCIONAIS_WorkWell
+        WHERE ID = :registro_id
+    """,
+    
+    'registros_sem_sentimento': """
+        SELECT ID, COMENTARIO
+        FROM REGISTROS_EMOCIONAIS_WorkWell
+        WHERE DATA_REGISTRO >= datetime('now', '-' || :dias || ' days')
+          AND DATA_REGISTRO < datetime('now', '-' || :espera || ' seconds')
+          AND COALESCE(COMENTARIO, '') <> ''
+          AND SENTIMENTO_TEXTO IS NULL
+          AND (SENTIMENTO_RESERVADO_EM IS NULL
+               OR SENTIMENTO_RESERVADO_EM < datetime('now', '-' || :reserva || ' seconds'))
+        ORDER BY DATA_REGISTRO
+        LIMIT :limite
+    """,
+    
+    'reservar_sentimento': """
+        UPDATE REGISTROS_EMOCIONAIS_WorkWell
+        SET SENTIMENTO_RESERVADO_EM = CURRENT_TIMESTAMP
+        WHERE ID = :registro_id
+          AND SENTIMENTO_TEXTO IS NULL
+          AND (SENTIMENTO_RESERVADO_EM IS NULL
+               OR SENTIMENTO_RESERVADO_EM < datetime('now', '-' || :reserva || ' seconds'))
+    """
+}
+
+
+class SQLiteDB(BancoDados):
+    """
+    Backend SQLite com a mesma interface do OracleDB
+    
+    Cada thread usa a sua própria conexão (o módulo sqlite3 não compartilha
+    conexões entre threads); o arquivo é aberto em modo WAL para que leituras
+    não bloqueiem a escrita. Datas são gravadas em UTC (CURRENT_TIMESTAMP).
+    """
+    
+    def __init__(self, caminho=None):
+        """
+        Args:
+            caminho (str): Arquivo do banco (':memory:' para um banco só em memória)
+        """
+        self.caminho = caminho or Config.SQLITE_CAMINHO
+        self._local = threading.local()
+        self._conexoes = []
+        self._lock = threading.Lock()
+        self._ancora = None  # Mantém o banco em memória vivo enquanto o backend estiver conectado
+        self.conectado = False
+        self.consultas = RegistroConsultas(CONSULTAS_SQLITE)
+        
+        if self.caminho == ':memory:':
+            # Cache compartilhado: todas as threads enxergam o mesmo banco em memória
+            self._uri = f"file:workwell_{id(self)}?mode=memory&cache=shared"
+        else:
+            self._uri = None
+    
+    def _abrir_conexao(self):
+        """Abre uma nova conexão configurada"""
+        if self._uri:
+            connection = sqlite3.connect(self._uri, uri=True, timeout=Config.SQLITE_TIMEOUT, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.caminho, timeout=Config.SQLITE_TIMEOUT, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        
+        with self._lock:
+            self._conexoes.append(connection)
+        return connection
+    
+    def connect(self):
+        """Abre o banco e cria as tabelas (e os dados iniciais) se necessário"""
+        try:
+            if self._uri is None:
+                diretorio = os.path.dirname(os.path.abspath(self.caminho))
+                os.makedirs(diretorio, exist_ok=True)
+            
+            self._ancora = self._abrir_conexao()
+            self.conectado = True
+            logger.info(f"Banco SQLite aberto com sucesso: {self.caminho}")
+            
+            try:
+                with self.conexao() as connection:
+                    self._criar_tabelas(connection)
+                logger.info("✅ Tabelas verificadas/criadas automaticamente")
+            except Exception as e:
+                logger.warning(f"⚠️ Aviso ao criar tabelas (continuando): {e}")
+            
+            return self._ancora
+        except sqlite3.Error as error:
+            logger.error(f"Erro ao abrir o SQLite: {error}")
+            raise
+    
+    def _criar_tabelas(self, connection):
+        """Cria as tabelas e insere os dados iniciais de exemplo"""
+        for sql in TABELAS_SQL:
+            connection.execute(sql)
+        for tabela, coluna, tipo in COLUNAS_ADICIONADAS:
+            colunas = {linha[1] for linha in connection.execute(f"PRAGMA table_info({tabela})")}
+            if coluna not in colunas:
+                connection.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+        
+        existe = connection.execute("SELECT COUNT(*) FROM EMPRESAS_WorkWell WHERE ID = 1").fetchone()[0] > 0
+        if existe:
+            logger.info("ℹ️ Dados iniciais já existem (pulando)")
+        else:
+            connection.execute("INSERT INTO EMPRESAS_WorkWell (NOME, CNPJ) VALUES (?, ?)", EMPRESA_INICIAL)
+            connection.executemany("INSERT INTO SETORES_WorkWell (EMPRESA_ID, NOME, DESCRICAO) VALUES (?, ?, ?)", SETORES_INICIAIS)
+            connection.executemany(
+                "INSERT INTO COLABORADORES_WorkWell (EMPRESA_ID, SETOR_ID, CODIGO_ACESSO) VALUES (?, ?, ?)",
+                COLABORADORES_INICIAIS
+            )
+            logger.info("✅ Dados iniciais inseridos com sucesso!")
+        
+        connection.commit()
+    
+    def disconnect(self):
+        """Fecha todas as conexões abertas pelas threads"""
+        with self._lock:
+            conexoes, self._conexoes = self._conexoes, []
+        for connection in conexoes:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+        self._ancora = None
+        if self.conectado:
+            self.conectado = False
+            logger.info("Banco SQLite fechado")
+    
+    def esta_conectado(self):
+        """Indica se o banco foi aberto"""
+        return self.conectado
+    
+    @contextmanager
+    def conexao(self):
+        """Fornece a conexão da thread atual (aberta na primeira utilização)"""
+        if not self.conectado:
+            raise RuntimeError("Banco SQLite não inicializado (chame db.connect())")
+        
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._abrir_conexao()
+            self._local.connection = connection
+        yield connection
+    
+    def estatisticas_pool(self):
+        """Retorna métricas das conexões"""
+        return {
+            'backend': 'sqlite',
+            'conectado': self.conectado,
+            'caminho': self.caminho,
+            'conexoes_abertas': len(self._conexoes)
+        }
+    
+    # ==================== CONSULTAS GENÉRICAS ====================
+    
+    def execute_query(self, query, params=None):
+        """Executa uma query SELECT e retorna resultados"""
+        try:
+            with self.conexao() as connection:
+                cursor = connection.execute(query, params or ())
+                columns = [col[0] for col in cursor.description]
+                results = [dict(zip(columns, row)) for row in cursor]
+                cursor.close()
+                return results
+        except sqlite3.Error as error:
+            logger.error(f"Erro ao executar query: {error}")
+            raise
+    
+    def iterar_query(self, query, params=None, arraysize=None, prefetchrows=None, como_dict=False):
+        """Executa uma query SELECT e devolve as linhas sob demanda (generator)"""
+        arraysize = arraysize or Config.ORACLE_ARRAYSIZE
+        
+        with self.conexao() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.arraysize = arraysize
+                cursor.execute(query, params or ())
+                columns = [col[0] for col in cursor.description]
+                
+                while True:
+                    linhas = cursor.fetchmany()
+                    if not linhas:
+                        break
+                    if como_dict:
+                        yield from (dict(zip(columns, linha)) for linha in linhas)
+                    else:
+                        yield from linhas
+            except sqlite3.Error as error:
+                logger.error(f"Erro ao executar query (streaming): {error}")
+                raise
+            finally:
+                cursor.close()
+    
+    def execute_query_colunar(self, query, params=None, formato='pandas', arraysize=None):
+        """Executa uma query SELECT e retorna o resultado por colunas"""
+        self._validar_formato_colunar(formato)
+        arraysize = arraysize or Config.ORACLE_ARRAYSIZE
+        
+        try:
+            with self.conexao() as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.arraysize = arraysize
+                    cursor.execute(query, params or ())
+                    columns = [col[0] for col in cursor.description]
+                    valores = [[] for _ in columns]
+                    while True:
+                        linhas = cursor.fetchmany()
+                        if not linhas:
+                            break
+                        for coluna, bloco in zip(valores, zip(*linhas)):
+                            coluna.extend(bloco)
+                finally:
+                    cursor.close()
+        except sqlite3.Error as error:
+            logger.error(f"Erro ao executar query (colunar): {error}")
+            raise
+        
+        return self._montar_colunar(columns, valores, formato)
+    
+    def execute_insert(self, query, params):
+        """Executa INSERT/UPDATE/DELETE"""
+        with self.conexao() as connection:
+            try:
+                connection.execute(query, params)
+                connection.commit()
+                self._invalidar_agregados()
+                return True
+            except sqlite3.Error as error:
+                logger.error(f"Erro ao executar INSERT: {error}")
+                connection.rollback()
+                raise
+    
+    # ==================== REGISTROS EMOCIONAIS ====================
+    
+    def insert_registro_emocional(self, colaborador_id, setor_id, estresse, felicidade, ansiedade=5, motivacao=5, comentario='', anonimo='N'):
+        """Insere um novo registro emocional no banco."""
+        with self.conexao() as connection:
+            try:
+                with self.consultas.medir('inserir_registro') as sql:
+                    cursor = connection.execute(sql, {
+                        'colaborador_id': colaborador_id,
+                        'setor_id': setor_id,
+                        'estresse': estresse,
+                        'felicidade': felicidade,
+                        'ansiedade': ansiedade,
+                        'motivacao': motivacao,
+                        'comentario': comentario,
+                        'anonimo': anonimo,
+                        'sentimento': None,
+                        'score': None
+                    })
+                connection.commit()
+                self._invalidar_agregados(1)  # EMPRESA_ID fixo no INSERT
+                
+                registro_id = cursor.lastrowid
+                logger.info(f"[OK] Registro emocional inserido com sucesso (ID: {registro_id})")
+                return registro_id
+            except sqlite3.Error as e:
+                logger.error(f"[ERRO] Ao inserir registro emocional: {e}")
+                connection.rollback()
+                raise
+    
+    def insert_registros_emocionais_lote(self, registros):
+        """Insere vários registros emocionais em uma única transação"""
+        if not registros:
+            return []
+        
+        with self.conexao() as connection:
+            try:
+                registro_ids = []
+                # Uma instrução por registro (sem ida à rede), para obter cada ID gerado
+                with self.consultas.medir('inserir_registro') as sql:
+                    for r in registros:
+                        cursor = connection.execute(sql, {
+                            'colaborador_id': r['colaborador_id'],
+                            'setor_id': r['setor_id'],
+                            'estresse': r['estresse'],
+                            'felicidade': r['felicidade'],
+                            'ansiedade': r.get('ansiedade', 5),
+                            'motivacao': r.get('motivacao', 5),
+                            'comentario': r.get('comentario', ''),
+                            'anonimo': r.get('anonimo', 'N'),
+                            'sentimento': r.get('sentimento'),
+                            'score': r.get('score')
+                        })
+                        registro_ids.append(cursor.lastrowid)
+                connection.commit()
+                self._invalidar_agregados(1)  # EMPRESA_ID fixo no INSERT
+                
+                logger.info(f"[OK] {len(registro_ids)} registros emocionais inseridos em lote")
+                return registro_ids
+            except sqlite3.Error as e:
+                logger.error(f"[ERRO] Ao inserir registros emocionais em lote: {e}")
+                connection.rollback()
+                raise
+    
+    def atualizar_sentimento(self, registro_id, sentimento, score):
+        """Atualiza o sentimento e score de um registro emocional"""
+        self.atualizar_sentimentos_lote([(registro_id, sentimento, score)])
+        logger.info(f"[OK] Sentimento atualizado para registro {registro_id}")
+    
+    def atualizar_sentimentos_lote(self, atualizacoes):
+        """Atualiza sentimento e score de vários registros em uma única transação"""
+        if not atualizacoes:
+            return 0
+        
+        with self.conexao() as connection:
+            try:
+                with self.consultas.medir('atualizar_sentimento') as sql:
+                    cursor = connection.executemany(sql, [{
+                        'sentimento': sentimento,
+                        'score': score,
+                        'registro_id': registro_id
+                    } for registro_id, sentimento, score in atualizacoes])
+                connection.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                logger.error(f"[ERRO] Ao atualizar sentimentos em lote: {e}")
+                connection.rollback()
+                raise
+    
+    def obter_sentimento_registro(self, registro_id):
+        """Retorna sentimento e score gravados para um registro (ou None se não existir)"""
+        results = self.executar_consulta('sentimento_registro', {'registro_id': registro_id})
+        return results[0] if results else None
+    
+    def reservar_registros_sentimento(self, registro_ids, reserva_segundos):
+        """Reserva os registros em uma transação (um UPDATE por registro, para saber quais pegou)"""
+        if not registro_ids:
+            return []
+        
+        with self.conexao() as connection:
+            try:
+                reservados = []
+                with self.consultas.medir('reservar_sentimento') as sql:
+                    for registro_id in registro_ids:
+                        cursor = connection.execute(sql, {'registro_id': registro_id, 'reserva': reserva_segundos})
+                        if cursor.rowcount:
+                            reservados.append(registro_id)
+                connection.commit()
+                return reservados
+            except sqlite3.Error as e:
+                logger.error(f"[ERRO] Ao reservar registros para enriquecimento: {e}")
+                connection.rollback()
+                raise
+    
+    def iterar_registros_emocionais(self, empresa_id, dias=None):
+        """Percorre os registros emocionais da empresa (exportações), um por vez"""
+        yield from self.consultas.medir_iteracao(
+            'exportar_registros',
+            lambda sql: self.iterar_query(sql, {'empresa_id': empresa_id, 'dias': dias})
+        )
+    
+    # ==================== AGREGADOS ====================
+    
+    def obter_setores(self, empresa_id):
+        """Retorna lista de setores da empresa"""
+        return self.executar_consulta('setores', {'empresa_id': empresa_id})
+    
+    def _consultar_dados_mapa_calor(self, empresa_id, dias):
+        """Obtém dados para gerar mapa de calor"""
+        return self.executar_consulta('mapa_calor', {'empresa_id': empresa_id, 'dias': dias})
+    
+    def _consultar_estatisticas(self, empresa_id, dias):
+        """Obtém estatísticas gerais da empresa"""
+        results = self.executar_consulta('estatisticas', {'empresa_id': empresa_id, 'dias': dias})
+        return results[0] if results else None
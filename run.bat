@@ -10,11 +10,11 @@ call venv\Scripts\activate
 
 REM Verificar conexao com banco
 echo.
-echo [2/3] Verificando conexao com Oracle...
+echo [2/3] Verificando conexao com o banco (DB_BACKEND)...
 python -c "from database.db_connection import db; db.connect(); print('   Conexao OK!')" 2>nul
 if errorlevel 1 (
-    echo    ERRO: Nao foi possivel conectar ao Oracle!
-    echo    Verifique se o banco esta rodando e as credenciais no .env
+    echo    ERRO: Nao foi possivel conectar ao banco!
+    echo    Verifique se o banco esta rodando e as credenciais no .env (ou use DB_BACKEND=sqlite)
     pause
     exit /b 1
 )
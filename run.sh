@@ -11,11 +11,11 @@ source venv/bin/activate
 
 # Verificar conexão com banco
 echo ""
-echo "[2/3] Verificando conexão com Oracle..."
+echo "[2/3] Verificando conexão com o banco (DB_BACKEND)..."
 python3 -c "from database.db_connection import db; db.connect(); print('✅ Conexão OK!')" 2>/dev/null
 if [ $? -ne 0 ]; then
-    echo "❌ ERRO: Não foi possível conectar ao Oracle!"
-    echo "Verifique se o banco está rodando e as credenciais no .env"
+    echo "❌ ERRO: Não foi possível conectar ao banco!"
+    echo "Verifique se o banco está rodando e as credenciais no .env (ou use DB_BACKEND=sqlite)"
     exit 1
 fi
 
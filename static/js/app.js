@@ -410,14 +410,14 @@ async function carregarDashboard() {
   try {
     mostrarLoading(true);
 
-    // Carregar estatísticas
-    const statsResponse = await fetch(
-      `${API_BASE_URL}/estatisticas/${EMPRESA_ID}`
+    // Carregar dashboard completo (estatísticas da empresa vêm na mesma resposta)
+    const dashResponse = await fetch(
+      `${API_BASE_URL}/dashboard/${EMPRESA_ID}?formato=dados`
     );
-    const statsData = await statsResponse.json();
+    const dashData = await dashResponse.json();
 
-    if (statsData.success) {
-      const stats = statsData.estatisticas;
+    if (dashData.success) {
+      const stats = dashData.estatisticas;
       document.getElementById("statColaboradores").textContent =
         stats.total_colaboradores || 0;
       document.getElementById("statRegistros").textContent =
@@ -428,13 +428,7 @@ async function carregarDashboard() {
       document.getElementById("statFelicidade").textContent = (
         stats.media_felicidade || 0
       ).toFixed(1);
-    }
 
-    // Carregar dashboard completo
-    const dashResponse = await fetch(`${API_BASE_URL}/dashboard/${EMPRESA_ID}`);
-    const dashData = await dashResponse.json();
-
-    if (dashData.success) {
       renderizarTabelaDashboard(dashData.dashboard_rh);
     }
   } catch (error) {
@@ -512,18 +506,15 @@ async function gerarMapaCalor() {
   try {
     mostrarLoading(true);
 
+    // formato=dados: o servidor devolve a especificação e o gráfico é desenhado aqui
     const response = await fetch(
-      `${API_BASE_URL}/mapa-calor/${EMPRESA_ID}?metrica=${metrica}&dias=${dias}`
+      `${API_BASE_URL}/mapa-calor/${EMPRESA_ID}?metrica=${metrica}&dias=${dias}&formato=dados`
     );
     const data = await response.json();
 
-    if (data.success && data.mapa_base64) {
+    if (data.success && data.grafico) {
       const container = document.getElementById("mapaContainer");
-      // O backend já retorna com o prefixo data:image/png;base64, então usar diretamente
-      const imagemSrc = data.mapa_base64.startsWith("data:")
-        ? data.mapa_base64
-        : `data:image/png;base64,${data.mapa_base64}`;
-      container.innerHTML = `<img src="${imagemSrc}" alt="Mapa de Calor - ${metrica}" style="max-width: 100%; height: auto;">`;
+      container.innerHTML = renderizarGrafico(data.grafico);
       mostrarNotificacao("✅ Mapa de calor gerado com sucesso!", "success");
     } else {
       mostrarNotificacao(
@@ -540,6 +531,82 @@ async function gerarMapaCalor() {
   }
 }
 
+// =====================================================
+// Gráficos (desenhados a partir das especificações da API)
+// =====================================================
+
+function corNaEscala(valor, escala) {
+  if (valor === null || valor === undefined) return "#eeeeee";
+
+  // Posição do valor entre min e max, interpolada entre as paradas de cor
+  const cores = escala.cores;
+  const t = Math.min(
+    Math.max((valor - escala.min) / (escala.max - escala.min), 0),
+    1
+  );
+  const posicao = t * (cores.length - 1);
+  const i = Math.min(Math.floor(posicao), cores.length - 2);
+  const f = posicao - i;
+
+  const rgb = (hex) => [1, 3, 5].map((k) => parseInt(hex.slice(k, k + 2), 16));
+  const [a, b] = [rgb(cores[i]), rgb(cores[i + 1])];
+  const mistura = a.map((c, k) => Math.round(c + (b[k] - c) * f));
+  return `rgb(${mistura.join(",")})`;
+}
+
+function renderizarGrafico(spec) {
+  if (spec.tipo === "mapa_calor") {
+    let html = `<div class="grafico"><p class="grafico-titulo">${spec.titulo}</p>
+        <table class="grafico-mapa"><thead><tr><th></th>`;
+    spec.colunas.forEach((coluna) => (html += `<th>${coluna}</th>`));
+    html += "</tr></thead><tbody>";
+
+    spec.linhas.forEach((linha, i) => {
+      html += `<tr><th>${linha}</th>`;
+      spec.valores[i].forEach((valor) => {
+        html += `<td style="background: ${corNaEscala(valor, spec.escala)}">${
+          valor === null ? "-" : valor.toFixed(1)
+        }</td>`;
+      });
+      html += "</tr>";
+    });
+
+    html += "</tbody></table>";
+    if (spec.total_registros !== undefined) {
+      html += `<p class="grafico-rodape">Total de registros: ${spec.total_registros} · Setores analisados: ${spec.total_setores}</p>`;
+    }
+    return html + "</div>";
+  }
+
+  if (spec.tipo === "barras") {
+    const largura = (v) =>
+      ((Math.min(Math.max(v || 0, spec.eixo.min), spec.eixo.max) - spec.eixo.min) /
+        (spec.eixo.max - spec.eixo.min)) *
+      100;
+
+    let html = `<div class="grafico"><p class="grafico-titulo">${spec.titulo}</p>`;
+    spec.series.forEach((serie) => {
+      html += `<div class="grafico-serie"><p><strong>${serie.nome}</strong></p>`;
+      spec.categorias.forEach((categoria, i) => {
+        const valor = serie.valores[i];
+        html += `
+            <div class="grafico-barra-linha">
+                <span class="grafico-barra-rotulo">${categoria}</span>
+                <div class="grafico-barra-trilho">
+                    <div class="grafico-barra" style="width: ${largura(valor)}%; background: ${serie.cores[i]}"></div>
+                    <div class="grafico-linha-critica" style="left: ${largura(serie.linha_critica)}%" title="Nível Crítico"></div>
+                </div>
+                <span class="grafico-barra-valor">${valor === null ? "-" : valor.toFixed(1)}</span>
+            </div>`;
+      });
+      html += `<p class="grafico-rodape">${serie.rotulo} (linha tracejada: nível crítico ${serie.linha_critica})</p></div>`;
+    });
+    return html + "</div>";
+  }
+
+  return "";
+}
+
 async function gerarDashboardCompleto() {
   const dias = document.getElementById("diasAnalise").value;
 
@@ -547,51 +614,33 @@ async function gerarDashboardCompleto() {
     mostrarLoading(true);
 
     const response = await fetch(
-      `${API_BASE_URL}/dashboard/${EMPRESA_ID}?dias=${dias}`
+      `${API_BASE_URL}/dashboard/${EMPRESA_ID}?dias=${dias}&formato=dados`
     );
     const data = await response.json();
 
-    if (data.success && data.visualizacoes) {
+    if (data.success && data.graficos) {
       const container = document.getElementById("visualizacoesCompletas");
-      const visualizacoes = data.visualizacoes;
-
-      let html = "";
-
-      if (visualizacoes.mapa_estresse) {
-        html += `
-                    <div class="visualizacao-item">
-                        <h4>Mapa de Calor - Estresse</h4>
-                        <img src="${visualizacoes.mapa_estresse}" alt="Mapa Estresse">
-                    </div>
-                `;
-      }
+      const graficos = data.graficos;
 
-      if (visualizacoes.mapa_felicidade) {
-        html += `
-                    <div class="visualizacao-item">
-                        <h4>Mapa de Calor - Felicidade</h4>
-                        <img src="${visualizacoes.mapa_felicidade}" alt="Mapa Felicidade">
-                    </div>
-                `;
-      }
+      const titulos = {
+        mapa_estresse: "Mapa de Calor - Estresse",
+        mapa_felicidade: "Mapa de Calor - Felicidade",
+        comparativo: "Comparativo de Métricas",
+        barras: "Análise por Setor",
+      };
 
-      if (visualizacoes.comparativo) {
-        html += `
-                    <div class="visualizacao-item">
-                        <h4>Comparativo de Métricas</h4>
-                        <img src="${visualizacoes.comparativo}" alt="Comparativo">
-                    </div>
-                `;
-      }
+      let html = "";
 
-      if (visualizacoes.barras) {
-        html += `
+      Object.entries(titulos).forEach(([nome, titulo]) => {
+        if (graficos[nome]) {
+          html += `
                     <div class="visualizacao-item">
-                        <h4>Análise por Setor</h4>
-                        <img src="${visualizacoes.barras}" alt="Gráfico de Barras">
+                        <h4>${titulo}</h4>
+                        ${renderizarGrafico(graficos[nome])}
                     </div>
                 `;
-      }
+        }
+      });
 
       container.innerHTML = html;
       mostrarNotificacao("✅ Dashboard completo gerado!", "success");
@@ -2,10 +2,22 @@
 Script de teste da API Work Well
 Execute: python test_api.py
 """
+import time
 import requests
 import json
 
 API_BASE = "http://localhost:5000/api"
+SERVIDOR = API_BASE.rsplit("/api", 1)[0]  # Base das URLs relativas devolvidas pela API
+
+REGISTRO_BASE = {
+    "colaborador_id": 1,
+    "setor_id": 1,
+    "nivel_estresse": 6,
+    "nivel_felicidade": 7,
+    "nivel_ansiedade": 5,
+    "nivel_motivacao": 8,
+    "anonimo": "N"
+}
 
 def test_health():
     """Testa health check"""
@@ -67,6 +79,153 @@ def test_registro():
     
     return response.status_code == 200
 
+def test_readiness():
+    """Testa readiness: 503 enquanto o modelo carrega, 200 quando está pronto"""
+    print("\n🚦 Testando Readiness...")
+    limite = time.time() + 180
+    vistos = []
+    
+    while True:
+        response = requests.get(f"{API_BASE}/health/ready")
+        data = response.json()
+        if not vistos or vistos[-1] != response.status_code:
+            print(f"   Status: {response.status_code} (modelo: {data.get('ai_model_state')})")
+        vistos.append(response.status_code)
+        
+        # O status HTTP tem que bater com o campo ready
+        if (response.status_code == 200) != bool(data.get('ready')):
+            print(f"   ❌ Status {response.status_code} com ready={data.get('ready')}")
+            return False
+        
+        if response.status_code == 200:
+            break
+        if response.status_code != 503:
+            print("   ❌ Esperado 503 enquanto o modelo não está pronto")
+            return False
+        if data.get('ai_model_state') == 'fallback':
+            print("   ❌ Carregamento do modelo falhou (fallback): readiness fica em 503")
+            return False
+        if time.time() > limite:
+            print("   ❌ Modelo não ficou pronto em 180 s")
+            return False
+        time.sleep(2)
+    
+    if 503 in vistos:
+        print("   ✅ Transição 503 -> 200 observada")
+    else:
+        print("   ℹ️ Modelo já estava pronto (transição 503 -> 200 não observada)")
+    return True
+
+def test_registro_assincrono():
+    """Testa registro com análise assíncrona: 202 + status_url até 'concluido'"""
+    print("\n⏳ Testando Registro Assíncrono...")
+    
+    response = requests.post(
+        f"{API_BASE}/registro-emocional",
+        json={**REGISTRO_BASE, "comentario": "Teste automático - Estou cansado mas feliz", "assincrono": "talvez"}
+    )
+    print(f"   Flag inválida: {response.status_code}")
+    if response.status_code != 400:
+        print("   ❌ Esperado 400 para assincrono inválido")
+        return False
+    
+    response = requests.post(
+        f"{API_BASE}/registro-emocional",
+        json={**REGISTRO_BASE, "comentario": "Teste automático - Estou cansado mas feliz", "assincrono": True}
+    )
+    print(f"   Status: {response.status_code}")
+    data = response.json()
+    if response.status_code != 202 or data.get('status_sentimento') != 'pendente' or not data.get('status_url'):
+        print(f"   ❌ Esperado 202 com status_url: {data}")
+        return False
+    print(f"   ✅ Registro {data['registro_id']} aceito, status em {data['status_url']}")
+    
+    limite = time.time() + 30
+    while time.time() < limite:
+        status = requests.get(f"{SERVIDOR}{data['status_url']}").json()
+        if status.get('status') == 'concluido':
+            sent = status['analise_sentimento']
+            print(f"   ✅ Análise concluída: {sent['sentimento']} (score: {sent['score']})")
+            return True
+        if status.get('status') != 'pendente':
+            print(f"   ❌ Status inesperado: {status}")
+            return False
+        time.sleep(0.5)
+    
+    print("   ❌ Análise não concluiu em 30 s")
+    return False
+
+def test_registro_lote():
+    """Testa inserção em lote: sucesso e lote com registro inválido (nada é inserido)"""
+    print("\n📦 Testando Registro em Lote...")
+    
+    response = requests.post(
+        f"{API_BASE}/registros-emocionais/lote",
+        json={"registros": [
+            {**REGISTRO_BASE, "comentario": "Teste automático - lote ótimo"},
+            {**REGISTRO_BASE, "nivel_estresse": 3, "anonimo": "S"}
+        ]}
+    )
+    print(f"   Status: {response.status_code}")
+    data = response.json()
+    if response.status_code != 200 or len(data.get('registro_ids', [])) != 2:
+        print(f"   ❌ Esperado 200 com 2 IDs: {data}")
+        return False
+    print(f"   ✅ IDs criados: {data['registro_ids']}")
+    
+    # Um registro inválido rejeita o lote inteiro, indicando o índice com erro
+    response = requests.post(
+        f"{API_BASE}/registros-emocionais/lote",
+        json={"registros": [
+            {**REGISTRO_BASE},
+            {campo: valor for campo, valor in REGISTRO_BASE.items() if campo != "nivel_felicidade"}
+        ]}
+    )
+    print(f"   Lote com inválido: {response.status_code}")
+    data = response.json()
+    indices = [erro.get('indice') for erro in data.get('erros', [])]
+    if response.status_code != 400 or data.get('success') or indices != [1]:
+        print(f"   ❌ Esperado 400 com erro no índice 1: {data}")
+        return False
+    print(f"   ✅ Lote rejeitado: {data['erros'][0]['error']}")
+    
+    # "anonimo" fora de 'S'/'N' também rejeita o lote (em vez de virar 'N')
+    response = requests.post(
+        f"{API_BASE}/registros-emocionais/lote",
+        json={"registros": [{**REGISTRO_BASE, "anonimo": "sim"}]}
+    )
+    print(f"   Lote com anonimo inválido: {response.status_code}")
+    if response.status_code != 400:
+        print(f"   ❌ Esperado 400: {response.json()}")
+        return False
+    print("   ✅ Anonimo inválido rejeitado")
+    return True
+
+def test_grafico_etag():
+    """Testa PNG de /api/graficos com ETag: repetir com If-None-Match devolve 304"""
+    print("\n🖼️ Testando Gráfico PNG com ETag...")
+    
+    response = requests.get(f"{API_BASE}/dashboard/1?formato=url")
+    url = (response.json().get('visualizacoes') or {}).get('mapa_estresse')
+    if not url:
+        print(f"   ❌ Dashboard sem URL do mapa de estresse (status {response.status_code})")
+        return False
+    
+    response = requests.get(f"{SERVIDOR}{url}")
+    etag = response.headers.get('ETag')
+    print(f"   Status: {response.status_code} ({response.headers.get('Content-Type')}, {len(response.content)} bytes)")
+    if response.status_code != 200 or response.headers.get('Content-Type') != 'image/png' or not etag:
+        print("   ❌ Esperado PNG com ETag")
+        return False
+    
+    response = requests.get(f"{SERVIDOR}{url}", headers={"If-None-Match": etag})
+    print(f"   Com If-None-Match: {response.status_code}")
+    if response.status_code != 304 or response.content:
+        print("   ❌ Esperado 304 sem corpo")
+        return False
+    print("   ✅ Imagem não reenviada (304)")
+    return True
+
 def test_mapa_calor():
     """Testa geração de mapa de calor"""
     print("\n🔥 Testando Geração de Mapa de Calor...")
@@ -172,13 +331,17 @@ def main():
     
     try:
         results.append(("Health Check", test_health()))
+        results.append(("Readiness", test_readiness()))
         results.append(("Listagem Setores", test_setores()))
         results.append(("Criar Registro", test_registro()))
+        results.append(("Registro Assíncrono", test_registro_assincrono()))
+        results.append(("Registro em Lote", test_registro_lote()))
+        results.append(("Gráfico PNG com ETag", test_grafico_etag()))
         results.append(("Mapa de Calor", test_mapa_calor()))
         results.append(("Estatísticas", test_estatisticas()))
         results.append(("🤖 Coach Virtual IA", test_coach_virtual()))
         results.append(("🎯 Recomendações IA", test_recomendacoes_ia()))
-        
+    
     except requests.exceptions.ConnectionError:
         print("\n❌ ERRO: Não foi possível conectar ao servidor!")
         print("   Verifique se o servidor Flask está rodando (python app.py)")
@@ -59,6 +59,9 @@ try:
     from ai.sentiment_analyzer import analyzer
     print("✅ Importação bem-sucedida!")
     
+    # O modelo carrega em background; aguardar até estar aquecido
+    analyzer.aguardar_pronto()
+    
     print("\n[2/3] Verificando status do modelo...")
     print(f"   📦 Modelo configurado: {analyzer.model_name}")
     print(f"   🔄 Modelo carregado: {'✅ SIM' if analyzer.modelo_carregado else '❌ NÃO'}")
@@ -122,7 +125,7 @@ try:
     print_test(3, 4, "Texto Muito Longo (mais de 512 tokens)")
     texto_longo = "Estou me sentindo " + "muito bem " * 100 + "hoje!"
     resultado = analisar_e_exibir(analyzer, texto_longo, None)
-    print(f"   ✅ Texto truncado automaticamente para 512 tokens")
+    print(f"   ✅ Texto dividido em janelas de tokens e agregado automaticamente")
     
     print_test(4, 4, "Texto com Caracteres Especiais")
     resultado = analisar_e_exibir(analyzer, "Estou bem! 😊👍🎉 Tudo ótimo!!!", "positivo")
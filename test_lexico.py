@@ -0,0 +1,90 @@
+"""
+Teste do léxico de sentimento (análise básica), sem servidor nem modelo
+Execute: python test_lexico.py
+"""
+import sys
+
+from ai.lexicon_matcher import LexiconMatcher
+
+# Léxico mínimo: só os termos usados nos casos abaixo. Com janela de 4, todos
+# os termos depois de uma fronteira ainda estariam dentro da janela da negação
+matcher = LexiconMatcher(
+    {'bem': 1.0, 'feliz': 1.0, 'ruim': -1.0, 'mal': -1.0, 'cansado': -1.0},
+    negacoes=['não', 'nunca'],
+    janela_negacao=4
+)
+
+CASOS = [
+    # (texto, (soma_positiva, soma_negativa), descrição)
+    ("Estou bem", (1.0, 0.0), "Termo positivo sem negação"),
+    ("Não estou bem", (0.0, 1.0), "Negação inverte o termo seguinte"),
+    ("Não estou muito bem", (0.0, 1.0), "Negação vale dentro da janela"),
+    ("Não estou muito mesmo assim bem", (1.0, 0.0), "Negação não passa da janela"),
+    ("Não é ruim", (1.0, 0.0), "Negação de termo negativo"),
+    ("Não gostei. Estou feliz", (1.0, 0.0), "Negação para no fim da frase"),
+    ("Não dormi, estou bem", (1.0, 0.0), "Negação para na vírgula"),
+    ("Não é ruim mas cansado", (1.0, 1.0), "Negação para em \"mas\""),
+    ("Nunca estou feliz! Hoje estou mal", (0.0, 2.0), "Cada frase com sua própria negação"),
+    ("Tudo normal, também", (0.0, 0.0), "Termos só casam como palavras inteiras"),
+]
+
+
+def test_negacao():
+    """Confere as somas do léxico com negação, janela e fronteiras"""
+    print("\n🔤 Testando Negação do Léxico...")
+    falhas = 0
+    
+    for texto, esperado, descricao in CASOS:
+        positiva, negativa, _ = matcher.pontuar(texto)
+        obtido = (positiva, negativa)
+        if obtido == esperado:
+            print(f"   ✅ {descricao}: \"{texto}\" -> {obtido}")
+        else:
+            falhas += 1
+            print(f"   ❌ {descricao}: \"{texto}\" -> {obtido} (esperado {esperado})")
+    
+    return falhas == 0
+
+
+def test_contagem_palavras():
+    """Confere a contagem de palavras (negações, termos e "mas" contam; pontuação não)"""
+    print("\n🔢 Testando Contagem de Palavras...")
+    casos = [
+        ("Não gostei. Estou feliz", 4),
+        ("Não é ruim, mas cansa", 5),
+        ("", 0),
+    ]
+    
+    ok = True
+    for texto, esperado in casos:
+        total = matcher.pontuar(texto)[2]
+        if total == esperado:
+            print(f"   ✅ \"{texto}\" -> {total} palavras")
+        else:
+            ok = False
+            print(f"   ❌ \"{texto}\" -> {total} palavras (esperado {esperado})")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("  🧠 Work Well - Teste do Léxico de Sentimento")
+    print("=" * 60)
+    
+    results = [
+        ("Negação do Léxico", test_negacao()),
+        ("Contagem de Palavras", test_contagem_palavras()),
+    ]
+    
+    print("\n" + "=" * 60)
+    for nome, sucesso in results:
+        status = "✅ PASSOU" if sucesso else "❌ FALHOU"
+        print(f"   {status}: {nome}")
+    print("=" * 60)
+    
+    if not all(sucesso for _, sucesso in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()